@@ -18,20 +18,53 @@ Usage: Configure in .claude/settings.json:
     }]
   }
 }
+
+For lower hook latency on long sessions, start the optional resident daemon
+(python3 hooks/token-monitor-daemon.py). The hook forwards its input to the
+daemon over a Unix socket and falls back to the in-process check if the
+daemon is not running.
 """
 
 import json
 import sys
 import os
+import re
+import time
+from contextlib import contextmanager
 from pathlib import Path
 
-# Configuration
+try:
+    import fcntl
+except ImportError:
+    # No advisory locking on this platform - writes are still atomic
+    fcntl = None
+
+# Configuration (defaults - override per model in .agent/.nav-config.json)
 TOKEN_LIMIT = 180000  # Claude's context window
 WARN_THRESHOLD = 0.70  # 70% - suggest planning compact
 CRITICAL_THRESHOLD = 0.85  # 85% - recommend compact now
 
-# State file to avoid repeated warnings
-STATE_FILE = Path.home() / '.claude' / '.nav-token-state.json'
+# Project config with optional "token_monitor" section:
+# {"token_monitor": {"context_limits": {"default": 180000, "claude-sonnet-4-5": 1000000},
+#                    "warn_threshold": 0.70, "critical_threshold": 0.85}}
+NAV_CONFIG = Path('.agent') / '.nav-config.json'
+
+# Growth prediction: also alert on projected exhaustion, not just fixed ratios
+GROWTH_WINDOW = 8  # recent (timestamp, tokens) samples kept per session
+MIN_GROWTH_SAMPLES = 3  # need a few tool calls before trusting the rate
+PREDICT_WARN_CALLS = 10  # ~10 tool calls left - plan compact
+PREDICT_CRITICAL_CALLS = 3  # ~3 tool calls left - compact now
+
+CLAUDE_DIR = Path.home() / '.claude'
+
+# Per-session state (alert level + transcript read checkpoint), one file each
+# so concurrent sessions never clobber each other
+SESSIONS_DIR = CLAUDE_DIR / '.nav-token-sessions'
+SESSION_TTL = 7 * 24 * 3600  # evict state untouched for a week
+
+# Optional resident daemon (hooks/token-monitor-daemon.py)
+DAEMON_SOCKET = CLAUDE_DIR / '.nav-token-monitor.sock'
+DAEMON_TIMEOUT = 0.5  # seconds before falling back to in-process check
 
 
 def read_hook_data():
@@ -42,92 +75,408 @@ def read_hook_data():
         return {}
 
 
-def estimate_tokens_from_transcript(transcript_path):
-    """Estimate token count from conversation transcript"""
-    try:
-        if not transcript_path or not Path(transcript_path).exists():
-            return 0
+def new_checkpoint(transcript_path, inode=None):
+    """Empty read checkpoint for transcript"""
+    return {
+        'transcript_path': str(transcript_path),
+        'inode': inode,
+        'offset': 0,
+        'chars': 0,
+        'usage_tokens': None,
+        'model': None,
+    }
 
-        with open(transcript_path, 'r') as f:
-            content = f.read()
 
-        # Rough estimate: ~4 characters per token
-        # This is conservative - actual tokenization varies
-        estimated_tokens = len(content) // 4
-        return estimated_tokens
-    except Exception:
-        return 0
+def session_file(session_id):
+    """State file path for session (session id sanitized for filesystem)"""
+    safe_id = re.sub(r'[^A-Za-z0-9_.-]', '_', str(session_id or 'default'))
+    return SESSIONS_DIR / f"{safe_id}.json"
+
 
+@contextmanager
+def session_lock(session_id):
+    """Exclusive lock around a session's read-modify-write cycle"""
+    SESSIONS_DIR.mkdir(parents=True, exist_ok=True)
+    lock_path = session_file(session_id).with_suffix('.lock')
 
-def get_state():
-    """Load previous alert state"""
+    with open(lock_path, 'a') as lock_file:
+        if fcntl:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            if fcntl:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+
+def load_session(session_id):
+    """Load session state (fresh state for a new session)"""
     try:
-        if STATE_FILE.exists():
-            with open(STATE_FILE, 'r') as f:
-                return json.load(f)
+        with open(session_file(session_id), 'r') as f:
+            return json.load(f)
+    except FileNotFoundError:
+        # First time we see this session - good moment to sweep old ones
+        evict_stale_sessions()
     except:
         pass
-    return {'last_warning_level': 0, 'session_id': None}
+    return {'session_id': session_id, 'last_warning_level': 0, 'checkpoint': None}
 
 
-def save_state(state):
-    """Persist alert state"""
+def save_session(session):
+    """Persist session state atomically (write temp file, then rename)"""
     try:
-        STATE_FILE.parent.mkdir(exist_ok=True)
-        with open(STATE_FILE, 'w') as f:
-            json.dump(state, f)
+        path = session_file(session.get('session_id'))
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_suffix(f'.{os.getpid()}.tmp')
+        with open(tmp_path, 'w') as f:
+            json.dump(session, f)
+        os.replace(tmp_path, path)
     except:
         pass
 
 
+def evict_stale_sessions(ttl=SESSION_TTL):
+    """Remove state and lock files of sessions untouched for longer than ttl"""
+    cutoff = time.time() - ttl
+    try:
+        for path in SESSIONS_DIR.glob('*.json'):
+            try:
+                if path.stat().st_mtime < cutoff:
+                    path.unlink()
+                    path.with_suffix('.lock').unlink(missing_ok=True)
+            except OSError:
+                pass
+    except OSError:
+        pass
+
+
+def usage_from_entry(line):
+    """
+    Context occupancy and model reported by an assistant transcript entry.
+
+    Each assistant turn carries the API `usage` for the request that produced
+    it; input + cache read + cache creation is the prompt the model actually
+    saw, and output is what was appended to it.
+
+    Returns:
+        (tokens, model) or None for any other line (user turns, tool results,
+        sidechain/subagent turns, bad JSON)
+    """
+    try:
+        entry = json.loads(line)
+    except (json.JSONDecodeError, UnicodeDecodeError):
+        return None
+
+    if not isinstance(entry, dict) or entry.get('type') != 'assistant' or entry.get('isSidechain'):
+        return None
+
+    message = entry.get('message')
+    usage = message.get('usage') if isinstance(message, dict) else None
+    if not isinstance(usage, dict):
+        return None
+
+    tokens = (
+        usage.get('input_tokens', 0)
+        + usage.get('cache_read_input_tokens', 0)
+        + usage.get('cache_creation_input_tokens', 0)
+        + usage.get('output_tokens', 0)
+    )
+
+    # Locally generated entries use placeholder models like "<synthetic>"
+    model = message.get('model')
+    if not isinstance(model, str) or model.startswith('<'):
+        model = None
+
+    return tokens, model
+
+
+def read_transcript_delta(path, checkpoint):
+    """
+    Advance checkpoint over lines appended to transcript since last read.
+
+    Streams each new JSONL line, keeping the `usage` and model of the latest
+    assistant turn and a running character count for the fallback estimate.
+
+    Returns:
+        Updated checkpoint (a fresh one if transcript was replaced/truncated)
+    """
+    stat = path.stat()
+
+    # Transcript replaced or truncated - start counting from scratch
+    if checkpoint.get('inode') != stat.st_ino or stat.st_size < checkpoint.get('offset', 0):
+        checkpoint = new_checkpoint(path, stat.st_ino)
+
+    if stat.st_size > checkpoint['offset']:
+        with open(path, 'rb') as f:
+            f.seek(checkpoint['offset'])
+            delta = f.read(stat.st_size - checkpoint['offset'])
+
+        # Only consume complete lines so multi-byte characters are never split;
+        # a partially written line is picked up on the next run
+        end = delta.rfind(b'\n') + 1
+        if end:
+            for line in delta[:end].splitlines():
+                checkpoint['chars'] += len(line.decode('utf-8', errors='replace')) + 1
+                usage = usage_from_entry(line)
+                if usage:
+                    checkpoint['usage_tokens'] = usage[0]
+                    checkpoint['model'] = usage[1] or checkpoint.get('model')
+            checkpoint['offset'] += end
+
+    return checkpoint
+
+
+def tokens_from_checkpoint(checkpoint):
+    """Context size from checkpoint: real usage if seen, else char estimate"""
+    if checkpoint.get('usage_tokens') is not None:
+        return checkpoint['usage_tokens']
+
+    # Fallback: ~4 characters per token over raw transcript
+    # This is conservative - actual tokenization varies
+    return checkpoint['chars'] // 4
+
+
+def load_monitor_config(project_dir):
+    """Read "token_monitor" section of project's .nav-config.json ({} if absent)"""
+    try:
+        with open(Path(project_dir) / NAV_CONFIG, 'r') as f:
+            config = json.load(f).get('token_monitor', {})
+        return config if isinstance(config, dict) else {}
+    except:
+        return {}
+
+
+def context_limits(model, config):
+    """
+    Context limit and alert thresholds (in tokens) for model.
+
+    "context_limits" keys are model-name prefixes; the longest matching
+    prefix wins, then "default", then TOKEN_LIMIT. So "claude-sonnet-4-5"
+    covers dated ids like "claude-sonnet-4-5-20250929".
+
+    Returns:
+        {'limit': int, 'warn': int, 'critical': int}
+    """
+    table = config.get('context_limits') or {}
+    limit = table.get('default', TOKEN_LIMIT)
+
+    if model:
+        matches = [prefix for prefix in table if prefix != 'default' and model.startswith(prefix)]
+        if matches:
+            limit = table[max(matches, key=len)]
+
+    limit = int(limit)
+    return {
+        'limit': limit,
+        'warn': int(limit * config.get('warn_threshold', WARN_THRESHOLD)),
+        'critical': int(limit * config.get('critical_threshold', CRITICAL_THRESHOLD)),
+    }
+
+
+def project_dir_for(hook_data):
+    """Project root the hook runs for"""
+    return os.environ.get('CLAUDE_PROJECT_DIR') or hook_data.get('cwd') or os.getcwd()
+
+
+def record_sample(state, tokens):
+    """
+    Append (timestamp, tokens) to the session's rolling window.
+
+    Returns:
+        True if usage dropped since the previous sample (compact/clear)
+    """
+    samples = state.get('samples') or []
+    dropped = bool(samples) and tokens < samples[-1][1]
+
+    # Growth before a compact says nothing about growth after it
+    if dropped:
+        samples = []
+
+    samples.append([round(time.time(), 3), tokens])
+    state['samples'] = samples[-GROWTH_WINDOW:]
+    return dropped
+
+
+def predict_exhaustion(state, tokens, limit):
+    """
+    Project when context runs out at the recent average growth rate.
+
+    Returns:
+        (tool calls left, seconds left) or None if too few samples / not growing
+    """
+    samples = state.get('samples') or []
+    if len(samples) < MIN_GROWTH_SAMPLES:
+        return None
+
+    intervals = len(samples) - 1
+    growth_per_call = (samples[-1][1] - samples[0][1]) / intervals
+    if growth_per_call <= 0:
+        return None
+
+    calls_left = max(0, int((limit - tokens) / growth_per_call))
+    seconds_per_call = (samples[-1][0] - samples[0][0]) / intervals
+    return calls_left, int(calls_left * seconds_per_call)
+
+
+def format_prediction(prediction):
+    """Human-readable projection, e.g. '~4 tool calls (~2 min) until limit'"""
+    calls_left, seconds_left = prediction
+    eta = f" (~{max(1, seconds_left // 60)} min)" if seconds_left >= 60 else ""
+    return f"~{calls_left} tool calls{eta} until limit at current rate"
+
+
+def evaluate_usage(tokens, state, limits=None):
+    """
+    Update alert state for current token count.
+
+    limits comes from context_limits() for the session's model; defaults to
+    TOKEN_LIMIT with the default thresholds.
+
+    Warning level is the higher of the fixed-ratio level and the level implied
+    by projected exhaustion, so fast-growing sessions get told to compact
+    while there is still room to do it.
+
+    Returns:
+        (alert text to show or '', whether warning level changed)
+    """
+    limits = limits or context_limits(None, {})
+    usage_percent = tokens / limits['limit']
+    dropped = record_sample(state, tokens)
+    prediction = predict_exhaustion(state, tokens, limits['limit'])
+
+    # Determine warning level
+    if tokens >= limits['critical']:
+        warning_level = 2
+    elif tokens >= limits['warn']:
+        warning_level = 1
+    else:
+        warning_level = 0
+
+    if prediction:
+        calls_left = prediction[0]
+        if calls_left <= PREDICT_CRITICAL_CALLS:
+            warning_level = 2
+        elif calls_left <= PREDICT_WARN_CALLS:
+            warning_level = max(warning_level, 1)
+
+    # Only alert when crossing a new threshold
+    if warning_level > state['last_warning_level']:
+        percent_display = int(usage_percent * 100)
+        alert = ''
+
+        if warning_level == 2:
+            lines = [
+                f"\n{'='*50}",
+                f"  CONTEXT CRITICAL: {percent_display}% used",
+                f"  {tokens:,} / {limits['limit']:,} tokens",
+            ]
+            if prediction:
+                lines.append(f"  {format_prediction(prediction)}")
+            lines += [
+                f"",
+                f"  Run: 'Clear context and preserve markers'",
+                f"  Or:  /nav:compact",
+                f"{'='*50}\n",
+            ]
+            alert = '\n'.join(lines)
+        elif warning_level == 1:
+            if prediction and prediction[0] <= PREDICT_WARN_CALLS:
+                alert = (f"\n  Context at {percent_display}% - {format_prediction(prediction)}"
+                         f" - plan to compact after current task\n")
+            else:
+                alert = f"\n  Context at {percent_display}% - plan to compact after current task\n"
+
+        state['last_warning_level'] = warning_level
+        return alert, True
+
+    # Reset warning level once usage drops (after compact); a slower growth
+    # rate alone doesn't reset it, otherwise predicted alerts would flap
+    if dropped and warning_level < state['last_warning_level']:
+        state['last_warning_level'] = warning_level
+        return '', True
+
+    return '', False
+
+
+def check_session(hook_data):
+    """In-process check: read transcript delta and update session state on disk"""
+    transcript_path = hook_data.get('transcript_path')
+    session_id = hook_data.get('session_id')
+
+    if not transcript_path or not Path(transcript_path).exists():
+        return ''
+
+    path = Path(transcript_path)
+    with session_lock(session_id):
+        session = load_session(session_id)
+
+        checkpoint = session.get('checkpoint')
+        if not checkpoint or checkpoint.get('transcript_path') != str(path):
+            checkpoint = new_checkpoint(path)
+
+        # Current token usage from bytes appended since last run
+        session['checkpoint'] = read_transcript_delta(path, checkpoint)
+        tokens = tokens_from_checkpoint(session['checkpoint'])
+        limits = context_limits(
+            session['checkpoint'].get('model'),
+            load_monitor_config(project_dir_for(hook_data)),
+        )
+
+        # Sample window changes on every call, so always persist
+        alert, _ = evaluate_usage(tokens, session, limits)
+        save_session(session)
+
+    return alert
+
+
+def query_daemon(hook_data):
+    """
+    Forward hook data to resident token-monitor daemon.
+
+    Returns:
+        Alert text from daemon, or None if daemon is not running/responding
+    """
+    if not DAEMON_SOCKET.exists():
+        return None
+
+    try:
+        import socket
+
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+            client.settimeout(DAEMON_TIMEOUT)
+            client.connect(str(DAEMON_SOCKET))
+            # Daemon's own CLAUDE_PROJECT_DIR/cwd belong to whichever session started it
+            request = dict(hook_data, project_dir=project_dir_for(hook_data))
+            client.sendall(json.dumps(request).encode('utf-8') + b'\n')
+            client.shutdown(socket.SHUT_WR)
+
+            chunks = []
+            while True:
+                chunk = client.recv(4096)
+                if not chunk:
+                    break
+                chunks.append(chunk)
+
+        response = json.loads(b''.join(chunks))
+        return response['alert']
+    except Exception:
+        return None
+
+
 def main():
     try:
         hook_data = read_hook_data()
-        transcript_path = hook_data.get('transcript_path')
-        session_id = hook_data.get('session_id')
 
-        if not transcript_path:
+        if not hook_data.get('transcript_path'):
             sys.exit(0)
 
-        # Estimate current token usage
-        tokens = estimate_tokens_from_transcript(transcript_path)
-        usage_percent = tokens / TOKEN_LIMIT
+        # Resident daemon keeps state in memory; fall back if it isn't running
+        alert = query_daemon(hook_data)
+        if alert is None:
+            alert = check_session(hook_data)
 
-        # Load state (reset if new session)
-        state = get_state()
-        if state.get('session_id') != session_id:
-            state = {'last_warning_level': 0, 'session_id': session_id}
-
-        # Determine warning level
-        if usage_percent >= CRITICAL_THRESHOLD:
-            warning_level = 2
-        elif usage_percent >= WARN_THRESHOLD:
-            warning_level = 1
-        else:
-            warning_level = 0
-
-        # Only alert when crossing a new threshold
-        if warning_level > state['last_warning_level']:
-            percent_display = int(usage_percent * 100)
-
-            if warning_level == 2:
-                print(f"\n{'='*50}")
-                print(f"  CONTEXT CRITICAL: {percent_display}% used")
-                print(f"  {tokens:,} / {TOKEN_LIMIT:,} tokens")
-                print(f"")
-                print(f"  Run: 'Clear context and preserve markers'")
-                print(f"  Or:  /nav:compact")
-                print(f"{'='*50}\n")
-            elif warning_level == 1:
-                print(f"\n  Context at {percent_display}% - plan to compact after current task\n")
-
-            state['last_warning_level'] = warning_level
-            save_state(state)
-
-        # Reset warning level if usage drops (after compact)
-        elif warning_level < state['last_warning_level']:
-            state['last_warning_level'] = warning_level
-            save_state(state)
+        if alert:
+            print(alert)
 
         sys.exit(0)
 
@@ -0,0 +1,253 @@
+#!/usr/bin/env python3
+"""
+Navigator Token Monitor Daemon
+
+Optional resident companion to monitor-tokens.py. Keeps per-session transcript
+checkpoints and alert state in memory and polls known transcripts in the
+background, so each PostToolUse hook only forwards its input over a Unix
+socket instead of loading state and reading the transcript itself.
+
+The hook falls back to its in-process check whenever the daemon is not
+running, so starting it is purely an optimization.
+
+Usage:
+    python3 hooks/token-monitor-daemon.py &
+    python3 hooks/token-monitor-daemon.py --interval 0.5 --idle-timeout 7200
+"""
+
+import argparse
+import importlib.util
+import json
+import os
+import signal
+import socket
+import socketserver
+import sys
+import threading
+import time
+from pathlib import Path
+
+
+def load_monitor():
+    """Import monitor-tokens.py (hyphenated name, so not importable directly)"""
+    spec = importlib.util.spec_from_file_location(
+        'monitor_tokens', Path(__file__).with_name('monitor-tokens.py')
+    )
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+monitor = load_monitor()
+
+
+def disk_version(session_id):
+    """Identity of the session file as last written (saves replace it, so the inode changes)"""
+    try:
+        stat = monitor.session_file(session_id).stat()
+    except OSError:
+        return None
+    return (stat.st_ino, stat.st_mtime_ns)
+
+
+def request_project_dir(hook_data):
+    """Project root of the hook that sent the request (never the daemon's own)"""
+    return hook_data.get('project_dir') or hook_data.get('cwd') or os.getcwd()
+
+
+class SessionRegistry:
+    """In-memory session state (alert level + transcript checkpoint)"""
+
+    def __init__(self, idle_timeout):
+        self.idle_timeout = idle_timeout
+        self.sessions = {}
+        self.versions = {}  # session_id -> disk_version() we last loaded or saved
+        self.last_seen = {}
+        self.configs = {}
+        self.lock = threading.Lock()
+
+    def _config(self, project_dir):
+        """Project's token_monitor config, re-read when .nav-config.json changes"""
+        try:
+            mtime = (Path(project_dir) / monitor.NAV_CONFIG).stat().st_mtime
+        except OSError:
+            mtime = None
+
+        cached = self.configs.get(project_dir)
+        if cached is None or cached[0] != mtime:
+            cached = (mtime, monitor.load_monitor_config(project_dir))
+            self.configs[project_dir] = cached
+        return cached[1]
+
+    def _session(self, session_id, transcript_path):
+        """Cached session, reloaded if someone else wrote it (caller holds session_lock)"""
+        session = self.sessions.get(session_id)
+        version = disk_version(session_id)
+        if session is None or version != self.versions.get(session_id):
+            # First sight, or a hook that timed out on us fell back to the
+            # in-process check and saved newer state - pick up where it left off
+            session = monitor.load_session(session_id)
+            self.sessions[session_id] = session
+            self.versions[session_id] = version
+
+        checkpoint = session.get('checkpoint')
+        if not checkpoint or checkpoint.get('transcript_path') != str(transcript_path):
+            session['checkpoint'] = monitor.new_checkpoint(transcript_path)
+        return session
+
+    def _save(self, session):
+        """Write session state (caller holds session_lock)"""
+        monitor.save_session(session)
+        self.versions[session.get('session_id')] = disk_version(session.get('session_id'))
+
+    def _persist(self, session):
+        """Write session state unless the file changed since we last synced it"""
+        session_id = session.get('session_id')
+        with monitor.session_lock(session_id):
+            if disk_version(session_id) == self.versions.get(session_id):
+                self._save(session)
+
+    def check(self, hook_data):
+        """Handle one hook invocation; returns alert text (or '')"""
+        transcript_path = hook_data.get('transcript_path')
+        if not transcript_path or not Path(transcript_path).exists():
+            return ''
+
+        path = Path(transcript_path)
+        session_id = hook_data.get('session_id')
+        # Same read-modify-write cycle under session_lock as the in-process check
+        with self.lock, monitor.session_lock(session_id):
+            session = self._session(session_id, path)
+            self.last_seen[session_id] = time.time()
+            session['checkpoint'] = monitor.read_transcript_delta(path, session['checkpoint'])
+
+            tokens = monitor.tokens_from_checkpoint(session['checkpoint'])
+            limits = monitor.context_limits(
+                session['checkpoint'].get('model'),
+                self._config(request_project_dir(hook_data)),
+            )
+            alert, _ = monitor.evaluate_usage(tokens, session, limits)
+
+            # Persist every evaluated event, not just level changes: a hook that
+            # times out falls back to the on-disk state, which must match ours
+            # or the same alert fires twice
+            self._save(session)
+            return alert
+
+    def poll(self):
+        """Catch up on appended transcript bytes and drop idle sessions"""
+        now = time.time()
+        with self.lock:
+            for session_id, session in list(self.sessions.items()):
+                if now - self.last_seen.get(session_id, 0) > self.idle_timeout:
+                    self._persist(session)
+                    self._forget(session_id)
+                    continue
+                try:
+                    path = Path(session['checkpoint']['transcript_path'])
+                    session['checkpoint'] = monitor.read_transcript_delta(path, session['checkpoint'])
+                except OSError:
+                    # Transcript gone - session ended
+                    self._forget(session_id)
+
+    def flush(self):
+        """Write all sessions to disk (on shutdown)"""
+        with self.lock:
+            for session in self.sessions.values():
+                self._persist(session)
+
+    def _forget(self, session_id):
+        self.sessions.pop(session_id, None)
+        self.versions.pop(session_id, None)
+        self.last_seen.pop(session_id, None)
+
+
+class HookRequestHandler(socketserver.StreamRequestHandler):
+    """One JSON line of hook data in, {"alert": ...} out"""
+
+    def handle(self):
+        line = self.rfile.readline()
+        if not line:
+            # Liveness probe (see daemon_running) - nothing to answer
+            return
+
+        try:
+            hook_data = json.loads(line)
+            response = {'alert': self.server.registry.check(hook_data)}
+        except Exception as e:
+            # No "alert" key - client falls back to in-process check
+            response = {'error': str(e)}
+
+        try:
+            self.wfile.write(json.dumps(response).encode('utf-8'))
+        except BrokenPipeError:
+            # Hook gave up waiting and fell back to in-process check
+            pass
+
+
+def watch_transcripts(registry, interval):
+    """Background polling loop"""
+    while True:
+        time.sleep(interval)
+        try:
+            registry.poll()
+        except Exception as e:
+            print(f"Poll failed: {e}", file=sys.stderr)
+
+
+def daemon_running(socket_path):
+    """Check whether another daemon is already listening on socket_path"""
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as probe:
+            probe.settimeout(0.5)
+            probe.connect(str(socket_path))
+        return True
+    except OSError:
+        return False
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Resident token monitor for monitor-tokens.py hook")
+    parser.add_argument("--interval", type=float, default=1.0, help="Transcript poll interval in seconds")
+    parser.add_argument("--idle-timeout", type=int, default=3600, help="Forget sessions idle for this many seconds")
+
+    args = parser.parse_args()
+    socket_path = monitor.DAEMON_SOCKET
+
+    if socket_path.exists():
+        if daemon_running(socket_path):
+            print(f"Token monitor daemon already running: {socket_path}", file=sys.stderr)
+            return 1
+        # Stale socket left by a crashed daemon
+        socket_path.unlink()
+
+    socket_path.parent.mkdir(parents=True, exist_ok=True)
+    registry = SessionRegistry(args.idle_timeout)
+
+    server = socketserver.UnixStreamServer(str(socket_path), HookRequestHandler)
+    server.registry = registry
+    os.chmod(socket_path, 0o600)
+
+    # SIGTERM -> SystemExit so the socket file is removed below
+    signal.signal(signal.SIGTERM, lambda signum, frame: sys.exit(0))
+
+    watcher = threading.Thread(target=watch_transcripts, args=(registry, args.interval), daemon=True)
+    watcher.start()
+
+    print(f"Token monitor daemon listening on {socket_path}", file=sys.stderr)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        registry.flush()
+        server.server_close()
+        try:
+            socket_path.unlink()
+        except OSError:
+            pass
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
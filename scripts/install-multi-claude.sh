@@ -43,6 +43,14 @@ else
   echo -e "${GREEN}✅ git found${NC}"
 fi
 
+# Check for python3 (runs the phase orchestrator)
+if ! command -v python3 &> /dev/null; then
+  echo -e "${RED}❌ python3 not found${NC}"
+  exit 1
+else
+  echo -e "${GREEN}✅ python3 found${NC}"
+fi
+
 # Check for jq
 if ! command -v jq &> /dev/null; then
   echo -e "${YELLOW}⚠️  jq not found (optional)${NC}"
@@ -75,29 +83,36 @@ echo ""
 # Create scripts directory if it doesn't exist
 mkdir -p scripts
 
-# Check if script already exists locally
-if [ -f "scripts/navigator-multi-claude.sh" ]; then
-  echo -e "${GREEN}✅ Multi-Claude script already present${NC}"
-else
+# Workflow script plus the Python phase orchestrator and marker watcher it calls
+SCRIPTS=(navigator-multi-claude.sh multi_claude_orchestrator.py marker_watcher.py multi_claude_batch.py phase_cache.py run_telemetry.py)
+BASE_URL="https://raw.githubusercontent.com/alekspetrov/navigator/main/scripts"
+
+for script in "${SCRIPTS[@]}"; do
+  # Check if script already exists locally
+  if [ -f "scripts/$script" ]; then
+    echo -e "${GREEN}✅ $script already present${NC}"
+    continue
+  fi
+
   # Try to download from GitHub
-  SCRIPT_URL="https://raw.githubusercontent.com/alekspetrov/navigator/main/scripts/navigator-multi-claude.sh"
+  SCRIPT_URL="$BASE_URL/$script"
 
   if command -v curl &> /dev/null; then
-    echo "Downloading navigator-multi-claude.sh..."
-    if curl -fsSL "$SCRIPT_URL" -o scripts/navigator-multi-claude.sh 2>/dev/null; then
+    echo "Downloading $script..."
+    if curl -fsSL "$SCRIPT_URL" -o "scripts/$script" 2>/dev/null; then
       echo -e "${GREEN}✅ Script downloaded${NC}"
     else
       echo -e "${YELLOW}⚠️  Could not download from GitHub${NC}"
-      echo "Please manually copy scripts/navigator-multi-claude.sh to this directory"
+      echo "Please manually copy scripts/$script to this directory"
       exit 1
     fi
   elif command -v wget &> /dev/null; then
-    echo "Downloading navigator-multi-claude.sh..."
-    if wget -q "$SCRIPT_URL" -O scripts/navigator-multi-claude.sh 2>/dev/null; then
+    echo "Downloading $script..."
+    if wget -q "$SCRIPT_URL" -O "scripts/$script" 2>/dev/null; then
       echo -e "${GREEN}✅ Script downloaded${NC}"
     else
       echo -e "${YELLOW}⚠️  Could not download from GitHub${NC}"
-      echo "Please manually copy scripts/navigator-multi-claude.sh to this directory"
+      echo "Please manually copy scripts/$script to this directory"
       exit 1
     fi
   else
@@ -105,10 +120,10 @@ else
     echo "Please install curl or wget and try again"
     exit 1
   fi
-fi
+done
 
-# Make script executable
-chmod +x scripts/navigator-multi-claude.sh
+# Make scripts executable
+chmod +x scripts/navigator-multi-claude.sh scripts/multi_claude_orchestrator.py scripts/marker_watcher.py scripts/multi_claude_batch.py scripts/phase_cache.py
 
 # Create .agent directory structure if it doesn't exist
 echo ""
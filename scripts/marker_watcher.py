@@ -0,0 +1,338 @@
+#!/usr/bin/env python3
+"""
+Navigator Marker Watcher
+
+Blocks until completion markers (or their <marker>.failed counterparts)
+appear, waking as soon as the file is created instead of on the next
+poll. One watcher serves any number of markers, so parallel phases share
+a single process and a single inotify descriptor.
+
+On Linux the watcher uses inotify (via ctypes, no dependencies) on each
+marker's directory; elsewhere, or for directories that can't be watched,
+it falls back to one polling loop over all pending markers. Process exit
+(--pid) is detected with pidfd_open where available, polling otherwise.
+
+Used by scripts/multi_claude_orchestrator.py and
+scripts/sub-claude-monitor.sh.
+
+Usage:
+    python3 scripts/marker_watcher.py wait --timeout 180 .agent/tasks/s1-done
+    python3 scripts/marker_watcher.py wait --any --pid 4242 MARKER [MARKER...]
+
+Exit codes: 0 all markers done, 1 a failure marker appeared, 2 timeout,
+3 the --pid process exited first.
+"""
+
+import argparse
+import asyncio
+import ctypes
+import ctypes.util
+import os
+import struct
+import sys
+from typing import Dict, Iterable, List, Optional
+
+POLL_INTERVAL = 0.25  # seconds, polling fallback only
+
+DONE = 'done'
+FAILED = 'failed'
+TIMEOUT = 'timeout'
+EXITED = 'exited'
+
+EXIT_CODES = {DONE: 0, FAILED: 1, TIMEOUT: 2, EXITED: 3}
+
+# inotify(7)
+IN_ATTRIB = 0x00000004
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_Q_OVERFLOW = 0x00004000
+WATCH_MASK = IN_ATTRIB | IN_CLOSE_WRITE | IN_MOVED_TO | IN_CREATE
+EVENT_HEADER = struct.Struct('iIII')
+
+
+def marker_status(marker: str) -> Optional[str]:
+    """DONE/FAILED if the marker or its failure marker exists, else None."""
+    if os.path.exists(f"{marker}.failed"):
+        return FAILED
+    if os.path.exists(marker):
+        return DONE
+    return None
+
+
+def _load_inotify():
+    if not sys.platform.startswith('linux'):
+        return None
+    try:
+        libc = ctypes.CDLL(ctypes.util.find_library('c') or 'libc.so.6', use_errno=True)
+        libc.inotify_init1
+        libc.inotify_add_watch
+    except (OSError, AttributeError):
+        return None
+    return libc
+
+
+class MarkerWatcher:
+    """
+    Shared watcher for completion markers.
+
+    Must be used from a running asyncio loop; call close() when done.
+
+    Args:
+        poll_interval: Seconds between checks for markers that can't use inotify
+        use_inotify: Set False to force polling
+    """
+
+    def __init__(self, poll_interval: float = POLL_INTERVAL, use_inotify: bool = True):
+        self.poll_interval = poll_interval
+        self._libc = _load_inotify() if use_inotify else None
+        self._fd: Optional[int] = None
+        self._watches: Dict[int, str] = {}       # wd -> directory
+        self._watched_dirs: Dict[str, int] = {}  # directory -> wd
+        self._waiters: Dict[str, List[asyncio.Future]] = {}
+        self._polled: set = set()
+        self._poll_task: Optional[asyncio.Task] = None
+
+    # inotify ------------------------------------------------------------
+
+    def _ensure_inotify(self) -> bool:
+        if self._fd is not None:
+            return True
+        if self._libc is None:
+            return False
+        fd = self._libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if fd < 0:
+            self._libc = None
+            return False
+        self._fd = fd
+        asyncio.get_running_loop().add_reader(fd, self._on_events)
+        return True
+
+    def _watch_directory(self, directory: str) -> bool:
+        if directory in self._watched_dirs:
+            return True
+        if not self._ensure_inotify():
+            return False
+        wd = self._libc.inotify_add_watch(self._fd, os.fsencode(directory), WATCH_MASK)
+        if wd < 0:
+            return False
+        self._watches[wd] = directory
+        self._watched_dirs[directory] = wd
+        return True
+
+    def _on_events(self):
+        try:
+            data = os.read(self._fd, 65536)
+        except BlockingIOError:
+            return
+
+        directories = set()
+        offset = 0
+        while offset + EVENT_HEADER.size <= len(data):
+            wd, mask, _, length = EVENT_HEADER.unpack_from(data, offset)
+            offset += EVENT_HEADER.size + length
+            if mask & IN_Q_OVERFLOW:
+                directories = None
+                break
+            if wd in self._watches:
+                directories.add(self._watches[wd])
+
+        self._check(directories)
+
+    # polling ------------------------------------------------------------
+
+    async def _poll(self):
+        while self._polled:
+            await asyncio.sleep(self.poll_interval)
+            for marker in list(self._polled):
+                self._resolve(marker)
+
+    # waiters ------------------------------------------------------------
+
+    def _resolve(self, marker: str):
+        status = marker_status(marker)
+        if status is None:
+            return
+        for future in self._waiters.pop(marker, []):
+            if not future.done():
+                future.set_result(status)
+        self._polled.discard(marker)
+
+    def _check(self, directories: Optional[Iterable[str]] = None):
+        """Re-check pending markers (all, or those in the given directories)."""
+        for marker in list(self._waiters):
+            if directories is None or os.path.dirname(marker) in directories:
+                self._resolve(marker)
+
+    async def wait(self, marker: str, timeout: Optional[float] = None) -> str:
+        """
+        Wait for a marker or its failure marker.
+
+        Args:
+            marker: Marker file path
+            timeout: Seconds to wait (None = forever)
+
+        Returns:
+            DONE, FAILED or TIMEOUT
+        """
+        marker = os.path.abspath(marker)
+        future = asyncio.get_running_loop().create_future()
+        self._waiters.setdefault(marker, []).append(future)
+
+        # Watch first, then check, so a marker created in between isn't missed
+        if not self._watch_directory(os.path.dirname(marker)):
+            self._polled.add(marker)
+            if self._poll_task is None or self._poll_task.done():
+                self._poll_task = asyncio.ensure_future(self._poll())
+        self._resolve(marker)
+
+        try:
+            return await asyncio.wait_for(future, timeout)
+        except asyncio.TimeoutError:
+            return TIMEOUT
+        finally:
+            waiters = self._waiters.get(marker)
+            if waiters and future in waiters:
+                waiters.remove(future)
+                if not waiters:
+                    del self._waiters[marker]
+                    self._polled.discard(marker)
+
+    async def wait_all(self, markers: Iterable[str], timeout: Optional[float] = None,
+                       any_marker: bool = False) -> Dict[str, str]:
+        """
+        Wait for several markers at once.
+
+        Args:
+            markers: Marker file paths
+            timeout: Seconds to wait overall
+            any_marker: Return as soon as one marker resolves
+
+        Returns:
+            Mapping of marker -> DONE/FAILED/TIMEOUT (a FAILED marker ends
+            the wait for the rest)
+        """
+        tasks = {asyncio.ensure_future(self.wait(marker, timeout)): marker for marker in markers}
+        results = {marker: TIMEOUT for marker in tasks.values()}
+        pending = set(tasks)
+
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                results[tasks[task]] = task.result()
+            if any_marker or any(results[tasks[task]] == FAILED for task in done):
+                break
+
+        for task in pending:
+            task.cancel()
+        await asyncio.gather(*pending, return_exceptions=True)
+        return results
+
+    async def wait_process(self, pid: int):
+        """Return when a (not necessarily child) process exits."""
+        try:
+            pidfd = os.pidfd_open(pid)
+        except (AttributeError, OSError):
+            pidfd = None
+
+        if pidfd is None:
+            while True:
+                try:
+                    os.kill(pid, 0)
+                except ProcessLookupError:
+                    return
+                except PermissionError:
+                    pass
+                await asyncio.sleep(self.poll_interval)
+
+        loop = asyncio.get_running_loop()
+        exited = loop.create_future()
+        loop.add_reader(pidfd, lambda: exited.done() or exited.set_result(None))
+        try:
+            await exited
+        finally:
+            loop.remove_reader(pidfd)
+            os.close(pidfd)
+
+    def close(self):
+        if self._fd is not None:
+            try:
+                asyncio.get_running_loop().remove_reader(self._fd)
+            except RuntimeError:
+                pass
+            os.close(self._fd)
+            self._fd = None
+        if self._poll_task is not None:
+            self._poll_task.cancel()
+
+
+async def wait_markers(markers: List[str], timeout: Optional[float] = None,
+                       pid: Optional[int] = None, any_marker: bool = False,
+                       poll: bool = False) -> Dict[str, str]:
+    """
+    Wait for markers from a one-off watcher, optionally racing a process.
+
+    Set poll to skip inotify (it misses writes made by other hosts on
+    network filesystems).
+
+    Returns:
+        Mapping of marker -> status, plus 'pid' -> EXITED if the process
+        exited before the markers resolved
+    """
+    watcher = MarkerWatcher(use_inotify=not poll)
+    try:
+        markers_task = asyncio.ensure_future(watcher.wait_all(markers, timeout, any_marker))
+        if pid is None:
+            return await markers_task
+
+        process_task = asyncio.ensure_future(watcher.wait_process(pid))
+        await asyncio.wait({markers_task, process_task}, return_when=asyncio.FIRST_COMPLETED)
+        if markers_task.done():
+            process_task.cancel()
+            return markers_task.result()
+
+        markers_task.cancel()
+        await asyncio.gather(markers_task, return_exceptions=True)
+        results = {marker: marker_status(marker) or TIMEOUT for marker in markers}
+        if not all(status == DONE for status in results.values()):
+            results['pid'] = EXITED
+        return results
+    finally:
+        watcher.close()
+
+
+def overall_status(results: Dict[str, str], any_marker: bool = False) -> str:
+    """Single status for a wait: FAILED > EXITED > TIMEOUT > DONE."""
+    statuses = set(results.values())
+    if FAILED in statuses:
+        return FAILED
+    if any_marker and DONE in statuses:
+        return DONE
+    for status in (EXITED, TIMEOUT):
+        if status in statuses:
+            return status
+    return DONE
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Wait for Navigator completion markers")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    wait_parser = subparsers.add_parser("wait", help="Block until markers appear")
+    wait_parser.add_argument("markers", nargs="+", help="Marker files")
+    wait_parser.add_argument("--timeout", type=float, default=None, help="Seconds to wait")
+    wait_parser.add_argument("--pid", type=int, help="Stop waiting if this process exits")
+    wait_parser.add_argument("--any", action="store_true", help="Return on the first marker")
+    wait_parser.add_argument("--poll", action="store_true",
+                             help="Poll instead of using inotify (network filesystems)")
+
+    args = parser.parse_args()
+
+    results = asyncio.run(wait_markers(args.markers, args.timeout, args.pid, args.any, args.poll))
+    for marker, status in results.items():
+        print(f"{status} {marker}")
+    return EXIT_CODES[overall_status(results, args.any)]
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,292 @@
+#!/usr/bin/env python3
+"""
+Navigator Multi-Claude Batch Mode
+
+Runs the multi-Claude workflow for several tickets at once. Each ticket
+gets its own git worktree on its own feature branch, so pipelines never
+share a checkout, and runs scripts/navigator-multi-claude.sh there.
+
+- --max-pipelines caps how many tickets run concurrently
+- --token-budget stops new tickets from starting once the batch has used
+  that many tokens (read live from each pipeline's state file); tickets
+  already running are allowed to finish
+
+A summary table is printed at the end and saved to
+.agent/tasks/batch-<timestamp>.json.
+
+Usage:
+    python3 scripts/multi_claude_batch.py TASK-21 TASK-22 TASK-23 --max-pipelines 3
+    python3 scripts/multi_claude_batch.py --tickets-file backlog.txt --token-budget 20000000
+    ./scripts/navigator-multi-claude.sh --batch TASK-21 TASK-22
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import shutil
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from multi_claude_orchestrator import TASKS_DIR, log_error, log_info, log_success, session_paths
+
+SCRIPT_DIR = Path(__file__).resolve().parent
+WORKFLOW_SCRIPT = SCRIPT_DIR / 'navigator-multi-claude.sh'
+
+DEFAULT_MAX_PIPELINES = 2
+
+
+def read_tickets(ticket_args: List[str], tickets_file: Optional[str]) -> List[str]:
+    """Ticket IDs from arguments and/or a file (one per line, # comments)."""
+    tickets = list(ticket_args)
+    if tickets_file:
+        with open(tickets_file, 'r') as f:
+            for line in f:
+                line = line.split('#', 1)[0].strip()
+                if line:
+                    tickets.append(line)
+
+    seen = set()
+    return [t for t in tickets if not (t in seen or seen.add(t))]
+
+
+def branch_name(task_id: str) -> str:
+    """Feature branch for a ticket (same naming as navigator-multi-claude.sh)."""
+    return f"feature/{task_id.lower()}"
+
+
+def default_worktree_root(repo_root: Path) -> Path:
+    """Sibling directory holding batch worktrees: ../<repo>-worktrees."""
+    return repo_root.parent / f"{repo_root.name}-worktrees"
+
+
+async def git(*args: str, cwd: Path) -> str:
+    """Run git, returning stdout; raises RuntimeError on failure."""
+    process = await asyncio.create_subprocess_exec(
+        'git', *args, cwd=str(cwd),
+        stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.PIPE,
+    )
+    stdout, stderr = await process.communicate()
+    if process.returncode != 0:
+        raise RuntimeError(stderr.decode(errors='replace').strip() or f"git {args[0]} failed")
+    return stdout.decode(errors='replace').strip()
+
+
+class Batch:
+    """
+    Concurrent multi-Claude pipelines, one worktree per ticket.
+
+    Args:
+        repo_root: Main checkout (task files are read from here)
+        tickets: Ticket IDs, in start order
+        max_pipelines: Max tickets running at once
+        token_budget: Stop starting tickets past this many tokens (None = no limit)
+        worktree_root: Directory for worktrees
+        base: Commit/branch new feature branches start from
+    """
+
+    def __init__(self, repo_root: Path, tickets: List[str], max_pipelines: int = DEFAULT_MAX_PIPELINES,
+                 token_budget: Optional[int] = None, worktree_root: Optional[Path] = None,
+                 base: str = 'HEAD'):
+        self.repo_root = repo_root
+        self.max_pipelines = max(1, max_pipelines)
+        self.token_budget = token_budget
+        self.worktree_root = worktree_root or default_worktree_root(repo_root)
+        self.base = base
+        self.batch_id = f"batch-{int(time.time())}"
+        self.log_dir = repo_root / TASKS_DIR / self.batch_id
+        self.results: Dict[str, Dict] = {
+            ticket: {'ticket': ticket, 'status': 'pending', 'branch': branch_name(ticket)}
+            for ticket in tickets
+        }
+        self._git_lock = asyncio.Lock()
+
+    def tokens_used(self) -> int:
+        """Tokens used so far by every started pipeline (live, from state files)."""
+        total = 0
+        for result in self.results.values():
+            state = self._read_state(result)
+            if state:
+                total += int(state.get('usage', {}).get('tokens', 0))
+        return total
+
+    @staticmethod
+    def _read_state(result: Dict) -> Optional[Dict]:
+        if 'worktree' not in result or 'session_id' not in result:
+            return None
+        state_file = Path(result['worktree']) / session_paths(result['session_id'])['state']
+        try:
+            with open(state_file, 'r') as f:
+                return json.load(f)
+        except (OSError, json.JSONDecodeError):
+            return None
+
+    async def prepare_worktree(self, ticket: str) -> Path:
+        """Create (or reuse) the ticket's worktree and make its task file available."""
+        worktree = self.worktree_root / ticket.lower()
+        branch = branch_name(ticket)
+
+        # git serializes worktree bookkeeping on the main repo - one at a time
+        async with self._git_lock:
+            if not (worktree / '.git').exists():
+                self.worktree_root.mkdir(parents=True, exist_ok=True)
+                try:
+                    await git('rev-parse', '--verify', '--quiet', branch, cwd=self.repo_root)
+                    await git('worktree', 'add', str(worktree), branch, cwd=self.repo_root)
+                except RuntimeError:
+                    await git('worktree', 'add', '-b', branch, str(worktree), self.base,
+                              cwd=self.repo_root)
+
+        # Task files are often uncommitted - copy from the main checkout
+        task_file = TASKS_DIR / f"{ticket}.md"
+        if not (worktree / task_file).exists() and (self.repo_root / task_file).exists():
+            (worktree / task_file).parent.mkdir(parents=True, exist_ok=True)
+            shutil.copy2(self.repo_root / task_file, worktree / task_file)
+        return worktree
+
+    async def run_ticket(self, ticket: str, semaphore: asyncio.Semaphore):
+        result = self.results[ticket]
+        async with semaphore:
+            if self.token_budget is not None and self.tokens_used() >= self.token_budget:
+                result['status'] = 'skipped'
+                result['reason'] = 'token budget reached'
+                log_info(f"{ticket}: skipped (token budget of {self.token_budget:,} reached)")
+                return
+
+            if not (self.repo_root / TASKS_DIR / f"{ticket}.md").exists():
+                result['status'] = 'failed'
+                result['reason'] = 'task file not found'
+                log_error(f"{ticket}: task file not found: {TASKS_DIR / f'{ticket}.md'}")
+                return
+
+            try:
+                worktree = await self.prepare_worktree(ticket)
+            except RuntimeError as e:
+                result['status'] = 'failed'
+                result['reason'] = f"worktree: {e}"
+                log_error(f"{ticket}: could not create worktree: {e}")
+                return
+
+            session_id = f"{ticket.lower()}-{int(time.time())}"
+            log_path = self.log_dir / f"{ticket}.log"
+            result.update(worktree=str(worktree), session_id=session_id, log=str(log_path),
+                          status='running')
+            log_info(f"{ticket}: started in {worktree} (log: {log_path})")
+
+            started = time.monotonic()
+            env = dict(os.environ, NAV_SESSION_ID=session_id)
+            with open(log_path, 'wb') as log:
+                process = await asyncio.create_subprocess_exec(
+                    'bash', str(WORKFLOW_SCRIPT), ticket,
+                    cwd=str(worktree), env=env,
+                    stdin=asyncio.subprocess.DEVNULL, stdout=log, stderr=asyncio.subprocess.STDOUT,
+                )
+                try:
+                    returncode = await process.wait()
+                except asyncio.CancelledError:
+                    process.terminate()
+                    await process.wait()
+                    raise
+
+            result['duration_s'] = round(time.monotonic() - started, 1)
+            state = self._read_state(result) or {}
+            result['tokens'] = int(state.get('usage', {}).get('tokens', 0))
+            result['cost_usd'] = round(float(state.get('usage', {}).get('cost_usd', 0.0)), 4)
+            pr_file = worktree / TASKS_DIR / f"{session_id}-pr-url.txt"
+            if pr_file.exists():
+                result['pr_url'] = pr_file.read_text().strip()
+
+            if returncode == 0:
+                result['status'] = 'complete'
+                log_success(f"{ticket}: complete ({result['duration_s']}s, {result['tokens']:,} tokens)")
+            else:
+                result['status'] = 'failed'
+                result['reason'] = state.get('current_phase') or f"exit code {returncode}"
+                log_error(f"{ticket}: failed ({result['reason']}) - see {log_path}")
+
+    async def run(self) -> bool:
+        """Run all tickets; True if every one completed."""
+        self.log_dir.mkdir(parents=True, exist_ok=True)
+        semaphore = asyncio.Semaphore(self.max_pipelines)
+        log_info(f"Batch {self.batch_id}: {len(self.results)} tickets, "
+                 f"{self.max_pipelines} at a time"
+                 + (f", token budget {self.token_budget:,}" if self.token_budget else ""))
+
+        await asyncio.gather(*(self.run_ticket(ticket, semaphore) for ticket in self.results))
+        return all(result['status'] == 'complete' for result in self.results.values())
+
+    def summary(self) -> Dict:
+        results = list(self.results.values())
+        return {
+            'batch_id': self.batch_id,
+            'created': datetime.now().isoformat(timespec='seconds'),
+            'max_pipelines': self.max_pipelines,
+            'token_budget': self.token_budget,
+            'tokens': sum(r.get('tokens', 0) for r in results),
+            'cost_usd': round(sum(r.get('cost_usd', 0.0) for r in results), 4),
+            'tickets': results,
+        }
+
+
+def format_duration(seconds: Optional[float]) -> str:
+    if seconds is None:
+        return '-'
+    minutes, secs = divmod(int(seconds), 60)
+    return f"{minutes}m {secs:02d}s" if minutes else f"{secs}s"
+
+
+def print_summary(summary: Dict):
+    print()
+    print(f"{'TICKET':<20} {'STATUS':<10} {'TIME':>9} {'TOKENS':>13}  BRANCH / NOTE")
+    for result in summary['tickets']:
+        note = result.get('pr_url') or result['branch']
+        if result.get('reason'):
+            note += f"  ({result['reason']})"
+        print(f"{result['ticket']:<20} {result['status']:<10} "
+              f"{format_duration(result.get('duration_s')):>9} {result.get('tokens', 0):>13,}  {note}")
+    print(f"{'TOTAL':<20} {'':<10} {'':>9} {summary['tokens']:>13,}  ${summary['cost_usd']:.2f}")
+    print()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run multi-Claude pipelines for several tickets")
+    parser.add_argument("tickets", nargs="*", help="Ticket IDs (e.g. TASK-21)")
+    parser.add_argument("--tickets-file", help="File with one ticket ID per line")
+    parser.add_argument("--max-pipelines", type=int, default=DEFAULT_MAX_PIPELINES,
+                        help=f"Tickets running at once (default: {DEFAULT_MAX_PIPELINES})")
+    parser.add_argument("--token-budget", type=int, help="Don't start tickets past this many tokens")
+    parser.add_argument("--worktree-root", help="Worktree directory (default: ../<repo>-worktrees)")
+    parser.add_argument("--base", default="HEAD", help="Base for new feature branches (default: HEAD)")
+
+    args = parser.parse_args()
+
+    tickets = read_tickets(args.tickets, args.tickets_file)
+    if not tickets:
+        parser.error("no tickets given")
+
+    try:
+        repo_root = Path(asyncio.run(git('rev-parse', '--show-toplevel', cwd=Path.cwd())))
+    except RuntimeError:
+        log_error("Must run inside a git repository")
+        return 1
+
+    batch = Batch(repo_root, tickets, args.max_pipelines, args.token_budget,
+                  Path(args.worktree_root).resolve() if args.worktree_root else None, args.base)
+    succeeded = asyncio.run(batch.run())
+
+    summary = batch.summary()
+    summary_path = repo_root / TASKS_DIR / f"{batch.batch_id}.json"
+    with open(summary_path, 'w') as f:
+        json.dump(summary, f, indent=2)
+
+    print_summary(summary)
+    log_info(f"Summary saved to: {summary_path}")
+    log_info(f"Remove a worktree when done: git worktree remove {batch.worktree_root}/<ticket>")
+    return 0 if succeeded else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
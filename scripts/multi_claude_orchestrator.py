@@ -0,0 +1,792 @@
+#!/usr/bin/env python3
+"""
+Navigator Multi-Claude Phase Orchestrator
+
+Runs the multi-Claude pipeline - plan → implement → (test ∥ docs) →
+review - as a DAG of phases. Each phase spawns a headless `claude -p`
+sub-Claude; the orchestrator awaits the process directly (no polling),
+checks the phase's completion marker the moment it exits, and starts
+dependent phases straight away. Independent phases run concurrently up to
+--max-parallel. Markers are watched through one shared MarkerWatcher
+(inotify, polling fallback), so a sub-Claude that writes its marker but
+never exits is stopped promptly instead of holding the phase until timeout.
+
+Phase progress is persisted to .agent/tasks/<session>-state.json after
+every transition (same fields scripts/resume-workflow.sh reads, plus
+per-phase detail), so `resume` re-runs only phases that didn't complete.
+Completed phases are also stored in the phase cache (scripts/phase_cache.py):
+a later run of the same task from the same base commit restores unchanged
+phases instead of re-running them (--no-cache to disable). Phases with the
+same dependencies run in one working tree at the same time, so they are
+cached - and restored - as one group.
+
+Every phase attempt is logged with timing, exit status and token usage to
+.agent/tasks/<session>-run.jsonl (scripts/run_telemetry.py); `report`
+summarizes it, including the critical path through the DAG.
+
+Called by scripts/navigator-multi-claude.sh for phases 1-5; the shell
+script keeps task loading, review approval, commit, PR and PM steps.
+
+Usage:
+    python3 scripts/multi_claude_orchestrator.py run TASK-19 \\
+        --task-file .agent/tasks/TASK-19.md --session-id task-19-1730561234
+    python3 scripts/multi_claude_orchestrator.py resume task-19-1730561234
+    python3 scripts/multi_claude_orchestrator.py report task-19-1730561234
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import re
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from marker_watcher import DONE, FAILED, MarkerWatcher
+from phase_cache import PhaseCache, head_commit, phase_key
+from run_telemetry import RunLog, analyze_run, format_report, load_runs
+
+TASKS_DIR = Path('.agent') / 'tasks'
+
+DEFAULT_MAX_PARALLEL = 2
+DEFAULT_TIMEOUT = 1800  # seconds per phase attempt
+DEFAULT_RETRIES = 1
+KILL_GRACE = 5  # seconds between SIGTERM and SIGKILL
+MARKER_EXIT_GRACE = 30  # seconds a sub-Claude may keep running after its marker
+
+# Token counters in `claude -p --output-format json` results
+USAGE_KEYS = ('input_tokens', 'output_tokens', 'cache_creation_input_tokens', 'cache_read_input_tokens')
+
+# Colors (match navigator-multi-claude.sh)
+GREEN = '\033[0;32m'
+BLUE = '\033[0;34m'
+RED = '\033[0;31m'
+NC = '\033[0m'
+
+
+def _now() -> str:
+    return datetime.now().strftime('%H:%M:%S')
+
+
+def _utc_timestamp() -> str:
+    return datetime.now(timezone.utc).strftime('%Y-%m-%dT%H:%M:%SZ')
+
+
+def log_info(message: str):
+    print(f"{BLUE}[{_now()}]{NC} {message}", flush=True)
+
+
+def log_success(message: str):
+    print(f"{GREEN}[{_now()}] ✅{NC} {message}", flush=True)
+
+
+def log_error(message: str):
+    print(f"{RED}[{_now()}] ❌{NC} {message}", flush=True)
+
+
+def error_handling_instructions(done_file: str) -> str:
+    """Failure-marker instructions appended to every sub-Claude prompt."""
+    return f"""
+CRITICAL: If you encounter ANY error or cannot complete this task:
+1. Create failure marker: {done_file}.failed
+2. Write error details to the file (error message, what went wrong)
+3. Exit immediately
+
+Only create {done_file} on success."""
+
+
+def marker_instructions(done_file: str, steps: Tuple[str, str]) -> str:
+    """Completion-marker steps: the phase's two work steps, then touch the marker."""
+    return f"""CRITICAL: You MUST create a completion marker when done.
+
+Steps:
+1. {steps[0]}
+2. {steps[1]}
+3. Create completion marker using Bash tool:
+
+   touch {done_file}
+
+Marker file: {done_file}
+This is REQUIRED for orchestrator to proceed.
+"""
+
+
+def parse_usage(output: bytes) -> Dict[str, float]:
+    """
+    Token usage and cost from a sub-Claude's JSON result.
+
+    Args:
+        output: Captured `claude -p --output-format json` output
+
+    Returns:
+        Dict of USAGE_KEYS counts, 'tokens' (their sum) and 'cost_usd';
+        zeros if the output holds no result object
+    """
+    usage = {key: 0 for key in USAGE_KEYS}
+    usage.update(tokens=0, cost_usd=0.0)
+
+    result = None
+    for line in reversed(output.decode(errors='replace').splitlines()):
+        line = line.strip()
+        if line.startswith('{'):
+            try:
+                result = json.loads(line)
+                break
+            except json.JSONDecodeError:
+                continue
+    if not isinstance(result, dict):
+        return usage
+
+    counts = result.get('usage') or {}
+    for key in USAGE_KEYS:
+        usage[key] = int(counts.get(key) or 0)
+    usage['tokens'] = sum(usage[key] for key in USAGE_KEYS)
+    usage['cost_usd'] = float(result.get('total_cost_usd') or result.get('cost_usd') or 0.0)
+    return usage
+
+
+def add_usage(total: Dict, usage: Dict):
+    """Accumulate usage counters into total (in place)."""
+    for key, value in usage.items():
+        total[key] = total.get(key, 0) + value
+
+
+class Phase:
+    """
+    One pipeline phase: a sub-Claude prompt plus its completion marker.
+
+    Artifacts are the files (besides working-tree changes) the phase
+    produces, kept in the phase cache.
+    """
+
+    def __init__(self, name: str, label: str, marker: str, prompt: str,
+                 deps: Tuple[str, ...] = (), artifacts: Tuple[str, ...] = ()):
+        self.name = name
+        self.label = label
+        self.marker = marker
+        self.prompt = prompt + '\n' + error_handling_instructions(marker)
+        self.deps = deps
+        self.artifacts = artifacts
+
+
+def session_paths(session_id: str) -> Dict[str, str]:
+    """Files a session's phases read and write (relative to project root)."""
+    prefix = str(TASKS_DIR / session_id)
+    return {
+        'state': f"{prefix}-state.json",
+        'plan': f"{prefix}-plan.md",
+        'implementation': f"{prefix}-done",
+        'testing': f"{prefix}-tests-done",
+        'documentation': f"{prefix}-docs-done",
+        'review': f"{prefix}-review-done",
+        'review_report': f"{prefix}-review-report.md",
+        'run_log': f"{prefix}-run.jsonl",
+    }
+
+
+def build_phases(task_file: str, session_id: str) -> List[Phase]:
+    """
+    The pipeline DAG, in a valid execution order.
+
+    Args:
+        task_file: Task markdown file
+        session_id: Session identifier (prefix for all phase files)
+
+    Returns:
+        List of phases; each lists the phases it depends on
+    """
+    paths = session_paths(session_id)
+    plan_file = paths['plan']
+
+    return [
+        Phase('planning', 'Planning', plan_file, f"""You are the Planning Claude in a multi-Claude workflow.
+
+TASK: Read task from {task_file}. Create implementation plan and save to {plan_file}.
+
+EFFICIENCY TIPS:
+- Use Task agent (subagent_type=Explore) for codebase exploration instead of manual file reading
+- Task agents return summaries, saving 60-80% tokens
+- For unfamiliar codebases: Launch Explore agent with 'medium' thoroughness
+
+PLAN REQUIREMENTS:
+1) Feature description
+2) Implementation steps (detailed, actionable)
+3) Files to create/modify
+4) Expected outcome
+5) Test strategy
+
+CRITICAL: You MUST create a completion marker when done.
+
+After saving the plan to {plan_file}:
+1. Verify file was written successfully
+2. The plan file itself serves as the completion marker
+
+The orchestrator will wait for {plan_file} to exist before proceeding.
+""", artifacts=(plan_file,)),
+        Phase('implementation', 'Implementation', paths['implementation'], f"""You are the Implementation Claude in a multi-Claude workflow.
+
+TASK: Read the plan from {plan_file}. Implement the feature following the plan.
+
+EFFICIENCY TIPS:
+- For multi-file searches: Use Task agent (subagent_type=Explore) instead of manual Grep/Glob
+- For understanding existing patterns: Launch Explore agent to analyze similar code
+- Task agents save 60-80% tokens on exploration tasks
+
+IMPLEMENTATION RULES:
+- Follow the plan exactly
+- Write clean, well-documented code
+- Use project conventions (check existing files for patterns)
+
+{marker_instructions(paths['implementation'], ('Implement all features from the plan', 'Test your changes work correctly'))}""", deps=('planning',)),
+        Phase('testing', 'Testing', paths['testing'], f"""You are the Testing Claude in a multi-Claude workflow.
+
+TASK: Read the plan from {plan_file}. Review implementation and generate comprehensive tests. Run tests to validate.
+
+EFFICIENCY TIPS:
+- Use Task agent (subagent_type=Explore) to find existing test patterns
+- Analyze similar test files to match project conventions
+
+TEST REQUIREMENTS:
+- Unit tests for all functions
+- Edge cases and error handling
+- Run tests and verify they pass
+
+{marker_instructions(paths['testing'], ('Generate comprehensive tests', 'Run tests and verify they pass'))}""", deps=('implementation',)),
+        Phase('documentation', 'Documentation', paths['documentation'], f"""You are the Documentation Claude in a multi-Claude workflow.
+
+TASK: Read the plan from {plan_file}. Review implementation and generate comprehensive documentation.
+
+EFFICIENCY TIPS:
+- Use Task agent (subagent_type=Explore) to find existing documentation patterns
+- Match project documentation style
+
+DOCUMENTATION REQUIREMENTS:
+- README sections (installation, usage, examples)
+- JSDoc/TSDoc for all public APIs
+- Usage examples with code snippets
+
+{marker_instructions(paths['documentation'], ('Generate comprehensive documentation', 'Verify documentation is complete'))}""", deps=('implementation',)),
+        Phase('review', 'Review', paths['review'], f"""You are the Review Claude in a multi-Claude workflow.
+
+TASK: Read the plan from {plan_file}. Review all implementation changes using git diff. Analyze code quality, test coverage, documentation. Generate review report and save to {paths['review_report']}.
+
+EFFICIENCY TIPS:
+- Use Task agent (subagent_type=Explore) to analyze patterns across multiple files
+- For large changesets: Use Task agent to summarize changes before detailed review
+
+REVIEW REQUIREMENTS:
+Include in {paths['review_report']}:
+1) Quality score (1-10)
+2) Strengths
+3) Issues found
+4) Suggestions for improvement
+5) Approval decision (APPROVED/NEEDS_WORK)
+
+{marker_instructions(paths['review'], ('Review all changes thoroughly', f"Save review report to {paths['review_report']}"))}""", deps=('testing', 'documentation'),
+              artifacts=(paths['review_report'],)),
+    ]
+
+
+def phase_groups(phases: List[Phase]) -> Dict[str, List[Phase]]:
+    """
+    Cache group of each phase: phases with the same dependencies.
+
+    Grouped phases may run at the same time in one working tree, so their
+    changes can't be told apart and are cached as one result.
+    """
+    by_deps: Dict[Tuple[str, ...], List[Phase]] = {}
+    for phase in phases:
+        by_deps.setdefault(tuple(sorted(phase.deps)), []).append(phase)
+    return {phase.name: group for group in by_deps.values() for phase in group}
+
+
+def update_task_status(task_file: str, status: str):
+    """Rewrite the task's **Status** line (backing up the original once)."""
+    path = Path(task_file)
+    try:
+        text = path.read_text()
+    except OSError:
+        return
+
+    backup = Path(f"{task_file}.bak")
+    if not backup.exists():
+        backup.write_text(text)
+
+    updated = re.sub(r'^\*\*Status\*\*:.*$', f"**Status**: {status}", text, flags=re.MULTILINE)
+    if updated != text:
+        path.write_text(updated)
+    log_info(f"Task status updated: {status}")
+
+
+class Pipeline:
+    """
+    Runs a session's phases as a DAG and persists progress.
+
+    Args:
+        task_id: Task identifier (e.g. TASK-19)
+        task_file: Task markdown file
+        session_id: Session identifier
+        max_parallel: Max phases running at once
+        timeout: Seconds per phase attempt
+        retries: Extra attempts after a timeout or missing marker
+        claude: Claude CLI executable
+        cache: Restore/store phase results through the phase cache
+    """
+
+    def __init__(self, task_id: str, task_file: str, session_id: str,
+                 max_parallel: int = DEFAULT_MAX_PARALLEL, timeout: int = DEFAULT_TIMEOUT,
+                 retries: int = DEFAULT_RETRIES, claude: str = 'claude', cache: bool = True):
+        self.task_id = task_id
+        self.task_file = task_file
+        self.session_id = session_id
+        self.max_parallel = max(1, max_parallel)
+        self.timeout = timeout
+        self.retries = retries
+        self.claude = claude
+        self.use_cache = cache
+        self.cache: Optional[PhaseCache] = None
+        self.paths = session_paths(session_id)
+        self.phases = build_phases(task_file, session_id)
+        self.groups = phase_groups(self.phases)
+        self.restored: Dict[str, Optional[Dict]] = {}
+        self.ran: List[str] = []
+        self._restore_lock = asyncio.Lock()
+        self.state = self._load_state()
+        self.running: List[str] = []
+        self.watcher: Optional[MarkerWatcher] = None
+        self.run_log = RunLog(self.paths['run_log'])
+        self.run_usage: Dict = {}
+
+    def _load_state(self) -> Dict:
+        try:
+            with open(self.paths['state'], 'r') as f:
+                state = json.load(f)
+            if isinstance(state.get('phases'), dict):
+                return state
+        except (OSError, json.JSONDecodeError):
+            pass
+        return {
+            'session_id': self.session_id,
+            'task': self.task_id,
+            'task_file': self.task_file,
+            'phases_completed': [],
+            'current_phase': None,
+            'phase_attempts': {},
+            'phases': {},
+            'usage': {},
+            'status': 'pending',
+            'last_update': _utc_timestamp(),
+        }
+
+    def save_state(self):
+        """Atomically write the state file."""
+        self.state['last_update'] = _utc_timestamp()
+        self.state['phases_completed'] = [
+            phase.name for phase in self.phases
+            if self.state['phases'].get(phase.name, {}).get('status') == 'complete'
+        ]
+        self.state['phase_attempts'] = {
+            name: info.get('attempts', 0) for name, info in self.state['phases'].items()
+        }
+
+        path = Path(self.paths['state'])
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=path.parent, prefix='.state-')
+        with os.fdopen(fd, 'w') as f:
+            json.dump(self.state, f, indent=2)
+        os.replace(tmp_path, path)
+
+    def record(self, phase: Phase, status: str, **fields):
+        """Update one phase's state and persist it."""
+        info = self.state['phases'].setdefault(phase.name, {})
+        info['status'] = status
+        info.update(fields)
+        self.state['current_phase'] = phase.name
+        self.save_state()
+
+    def is_complete(self, phase: Phase) -> bool:
+        """Completed in an earlier run and its marker is still there."""
+        info = self.state['phases'].get(phase.name, {})
+        return info.get('status') == 'complete' and os.path.exists(phase.marker)
+
+    def group_name(self, phase: Phase) -> str:
+        return '+'.join(member.name for member in self.groups[phase.name])
+
+    def cache_key(self, phase: Phase) -> Optional[str]:
+        """Cache key of the phase's group, or None if caching is off or an input is unknown."""
+        base_commit = self.state.get('base_commit')
+        if self.cache is None or not base_commit:
+            return None
+        digests = [self.state['phases'].get(dep, {}).get('digest') for dep in phase.deps]
+        if not all(digests):
+            return None
+        try:
+            task_text = Path(self.task_file).read_text()
+        except OSError:
+            return None
+        prompts = [member.prompt for member in self.groups[phase.name]]
+        return phase_key(self.group_name(phase), prompts, self.session_id, task_text,
+                         base_commit, digests)
+
+    async def _restore_group(self, phase: Phase) -> Optional[Dict]:
+        key = self.cache_key(phase)
+        entry = self.cache.lookup(key) if key else None
+        if entry is None:
+            return None
+        if not await self.cache.restore(entry, self.session_id):
+            log_info(f"{phase.label}: cached result no longer applies, running it")
+            return None
+        return entry
+
+    async def restore_cached(self, phase: Phase) -> bool:
+        """Complete a phase from the cache; False on a miss. A group is restored all at once."""
+        group = self.group_name(phase)
+        async with self._restore_lock:
+            if group not in self.restored:
+                self.restored[group] = await self._restore_group(phase)
+        entry = self.restored[group]
+        if entry is None:
+            return False
+
+        Path(phase.marker).touch()
+        saved = entry.get('phase_usage', {}).get(phase.name, {})
+        log_success(f"{phase.label} restored from cache ({entry['key'][:12]}, "
+                    f"saved {saved.get('tokens', 0):,} tokens)")
+        self.record(phase, 'complete', cached=entry['key'], digest=entry['digest'],
+                    saved_usage=saved, finished=_utc_timestamp())
+        self.run_log.write('phase_cached', phase=phase.name, key=entry['key'], saved_usage=saved)
+        return True
+
+    async def store_cached(self, phase: Phase):
+        """
+        Store the phase's group once all its phases completed in this run.
+
+        Every phase in the group gets the group's result digest. A group
+        partly completed in an earlier run isn't stored - its snapshot
+        wouldn't cover the earlier phases' changes.
+        """
+        self.ran.append(phase.name)
+        group = self.groups[phase.name]
+        if not all(member.name in self.ran for member in group):
+            return
+        key = self.cache_key(phase)
+        if key is None:
+            return
+        usage = {member.name: self.state['phases'][member.name].get('usage', {}) for member in group}
+        artifacts = [path for member in group for path in member.artifacts]
+        digest = await self.cache.record(key, self.group_name(phase), self.session_id, artifacts, usage)
+        for member in group:
+            self.state['phases'][member.name]['digest'] = digest
+        self.save_state()
+
+    def _status_label(self) -> str:
+        labels = [phase.label for phase in self.phases if phase.name in self.running]
+        return ' & '.join(labels)
+
+    async def spawn(self, phase: Phase) -> Tuple[Optional[int], bytes, bool]:
+        """
+        Run the phase's sub-Claude until it exits or its marker appears.
+
+        A sub-Claude that writes its marker (or failure marker) but doesn't
+        exit gets MARKER_EXIT_GRACE seconds before it is stopped, so a hung
+        process can't hold the pipeline until the timeout.
+
+        Returns:
+            tuple: (exit code, or None on timeout; combined output;
+                    whether the marker appeared before the process exited)
+        """
+        process = await asyncio.create_subprocess_exec(
+            self.claude, '-p', phase.prompt,
+            '--output-format', 'json',
+            '--dangerously-skip-permissions',
+            stdin=asyncio.subprocess.DEVNULL,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.STDOUT,
+        )
+        communicate = asyncio.ensure_future(process.communicate())
+        marker_wait = asyncio.ensure_future(self.watcher.wait(phase.marker, self.timeout))
+        try:
+            done, _ = await asyncio.wait({communicate, marker_wait}, timeout=self.timeout,
+                                         return_when=asyncio.FIRST_COMPLETED)
+            marker_first = (communicate not in done and marker_wait in done
+                            and marker_wait.result() in (DONE, FAILED))
+
+            if marker_first:
+                try:
+                    await asyncio.wait_for(asyncio.shield(communicate), MARKER_EXIT_GRACE)
+                except asyncio.TimeoutError:
+                    log_info(f"{phase.label}: marker written but process still running - stopping it")
+                    await self._terminate(process)
+            elif communicate not in done:
+                await self._terminate(process)
+                await communicate
+                return None, b'', False
+
+            output, _ = await communicate
+            return process.returncode, output, marker_first
+        except asyncio.CancelledError:
+            await self._terminate(process)
+            raise
+        finally:
+            marker_wait.cancel()
+
+    @staticmethod
+    async def _terminate(process):
+        if process.returncode is not None:
+            return
+        process.terminate()
+        try:
+            await asyncio.wait_for(process.wait(), KILL_GRACE)
+        except asyncio.TimeoutError:
+            process.kill()
+            await process.wait()
+
+    async def run_phase(self, phase: Phase) -> bool:
+        """Run one phase with retries; True once its marker exists."""
+        failure_marker = Path(f"{phase.marker}.failed")
+        failure_marker.unlink(missing_ok=True)
+
+        for attempt in range(1, self.retries + 2):
+            if attempt > 1:
+                log_info(f"⚠️  Retry attempt {attempt} of {self.retries + 1} for phase: {phase.name}")
+            else:
+                log_info(f"{phase.label}: starting")
+
+            if self.cache is not None:
+                await self.cache.begin(self.group_name(phase))
+            self.running.append(phase.name)
+            update_task_status(self.task_file, f"🚧 In Progress ({self._status_label()})")
+            self.record(phase, 'running', attempts=attempt, started=_utc_timestamp())
+            self.run_log.write('phase_start', phase=phase.name, attempt=attempt)
+            started = time.monotonic()
+
+            def log_end(status: str, returncode: Optional[int] = None,
+                        usage: Optional[Dict] = None, reason: Optional[str] = None):
+                self.run_log.write('phase_end', phase=phase.name, attempt=attempt, status=status,
+                                   exit_code=returncode, reason=reason, usage=usage or {},
+                                   duration_s=round(time.monotonic() - started, 3))
+
+            try:
+                returncode, output, marker_first = await self.spawn(phase)
+            except OSError as e:
+                log_error(f"Could not start {self.claude}: {e}")
+                self.record(phase, 'failed', finished=_utc_timestamp(), error=str(e))
+                log_end('failed', reason=str(e))
+                return False
+            except asyncio.CancelledError:
+                log_end('cancelled', reason='another phase failed')
+                raise
+            finally:
+                self.running.remove(phase.name)
+
+            usage = parse_usage(output)
+            add_usage(self.state['phases'][phase.name].setdefault('usage', {}), usage)
+            add_usage(self.state.setdefault('usage', {}), usage)
+            add_usage(self.run_usage, usage)
+
+            if failure_marker.exists():
+                log_error(f"Sub-Claude reported failure ({phase.name}):")
+                print(failure_marker.read_text(errors='replace'), file=sys.stderr)
+                self.record(phase, 'failed', finished=_utc_timestamp(), error='failure marker')
+                log_end('failed', returncode, usage, 'failure marker')
+                return False
+
+            if os.path.exists(phase.marker) and (returncode == 0 or marker_first):
+                log_success(f"{phase.label} complete ({phase.marker})")
+                log_end('complete', returncode, usage)
+                self.record(phase, 'complete', finished=_utc_timestamp(), digest=None)
+                if self.cache is not None:
+                    await self.store_cached(phase)
+                return True
+
+            if returncode is None:
+                reason = f"timeout after {self.timeout}s"
+            elif returncode != 0:
+                reason = f"claude exited with code {returncode}"
+                sys.stdout.write(output.decode(errors='replace')[-2000:] + '\n')
+            else:
+                reason = f"no completion marker: {phase.marker}"
+            log_error(f"{phase.label}: {reason}")
+            status = 'retry' if attempt <= self.retries else 'failed'
+            self.record(phase, status, finished=_utc_timestamp(), error=reason)
+            log_end(status, returncode, usage, reason)
+
+        log_error(f"Phase failed after {self.retries + 1} attempts: {phase.name}")
+        return False
+
+    async def run(self) -> bool:
+        """
+        Run all phases, each as soon as its dependencies complete.
+
+        A failed phase cancels everything still running.
+
+        Returns:
+            True if every phase completed
+        """
+        started = time.monotonic()
+        self.run_log.write('pipeline_start', session_id=self.session_id, task=self.task_id,
+                           phases={phase.name: list(phase.deps) for phase in self.phases},
+                           options={'max_parallel': self.max_parallel, 'timeout': self.timeout,
+                                    'retries': self.retries, 'cache': self.use_cache})
+        self.run_usage = {}
+
+        semaphore = asyncio.Semaphore(self.max_parallel)
+        tasks: Dict[str, asyncio.Task] = {}
+        self.watcher = MarkerWatcher()
+        if self.use_cache:
+            # Keep the original base commit across resumes so keys stay stable
+            self.state.setdefault('base_commit', await head_commit())
+            self.cache = await PhaseCache.open()
+
+        async def run_when_ready(phase: Phase) -> bool:
+            for dep in phase.deps:
+                if not await tasks[dep]:
+                    return False
+            if self.is_complete(phase):
+                log_info(f"{phase.label}: already complete, skipping")
+                self.run_log.write('phase_skipped', phase=phase.name)
+                return True
+            async with semaphore:
+                if self.cache is not None and await self.restore_cached(phase):
+                    return True
+                return await self.run_phase(phase)
+
+        for phase in self.phases:
+            tasks[phase.name] = asyncio.ensure_future(run_when_ready(phase))
+
+        self.state['status'] = 'running'
+        self.save_state()
+
+        pending = set(tasks.values())
+        succeeded = True
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            if not all(task.result() for task in done):
+                succeeded = False
+                for task in pending:
+                    task.cancel()
+                await asyncio.gather(*pending, return_exceptions=True)
+                break
+
+        self.watcher.close()
+        self.state['status'] = 'complete' if succeeded else 'failed'
+        self.save_state()
+        self.run_log.write('pipeline_end', status=self.state['status'], usage=self.run_usage,
+                           duration_s=round(time.monotonic() - started, 3))
+
+        if not succeeded:
+            failed = [name for name, info in self.state['phases'].items() if info.get('status') == 'failed']
+            label = next((phase.label for phase in self.phases if phase.name in failed), 'Pipeline')
+            update_task_status(self.task_file, f"❌ Failed ({label})")
+        return succeeded
+
+
+def run_pipeline(pipeline: Pipeline) -> int:
+    """Run a pipeline and report where its state lives."""
+    succeeded = asyncio.run(pipeline.run())
+    log_info(f"📊 Run report: python3 {sys.argv[0]} report {pipeline.session_id}")
+    if succeeded:
+        log_success("All phases complete")
+        return 0
+
+    log_info(f"💾 Workflow state saved to: {pipeline.paths['state']}")
+    log_info(f"Resume with: python3 {sys.argv[0]} resume {pipeline.session_id}")
+    return 1
+
+
+def report(session_id: str, as_json: bool = False, last: bool = False) -> int:
+    """Print timing/token analysis of a session's runs from its run log."""
+    run_log = session_paths(session_id)['run_log']
+    try:
+        runs = [analyze_run(events) for events in load_runs(run_log) if events]
+    except OSError:
+        log_error(f"Run log not found: {run_log}")
+        return 1
+    if not runs:
+        log_error(f"Run log is empty: {run_log}")
+        return 1
+    if last:
+        runs = runs[-1:]
+
+    if as_json:
+        print(json.dumps({'session_id': session_id, 'runs': runs}, indent=2))
+    else:
+        print(format_report(session_id, runs))
+    return 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Navigator multi-Claude phase orchestrator")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    def add_run_options(sub):
+        sub.add_argument("--max-parallel", type=int, default=None,
+                         help=f"Max phases running at once (default: {DEFAULT_MAX_PARALLEL})")
+        sub.add_argument("--timeout", type=int, default=None,
+                         help=f"Seconds per phase attempt (default: {DEFAULT_TIMEOUT})")
+        sub.add_argument("--retries", type=int, default=None,
+                         help=f"Retries after timeout/missing marker (default: {DEFAULT_RETRIES})")
+        sub.add_argument("--claude", default=os.environ.get("NAV_CLAUDE_BIN", "claude"),
+                         help="Claude CLI executable")
+        sub.add_argument("--no-cache", action="store_true",
+                         help="Don't restore or store phase results in the phase cache")
+
+    run_parser = subparsers.add_parser("run", help="Run the pipeline for a task")
+    run_parser.add_argument("task_id", help="Task ID (e.g. TASK-19)")
+    run_parser.add_argument("--task-file", help="Task file (default: .agent/tasks/<task_id>.md)")
+    run_parser.add_argument("--session-id", help="Session ID (default: <task-id>-<timestamp>)")
+    add_run_options(run_parser)
+
+    resume_parser = subparsers.add_parser("resume", help="Re-run phases that didn't complete")
+    resume_parser.add_argument("session_id", help="Session ID (from <session>-state.json)")
+    add_run_options(resume_parser)
+
+    report_parser = subparsers.add_parser("report", help="Phase timing, tokens and critical path")
+    report_parser.add_argument("session_id", help="Session ID (from <session>-run.jsonl)")
+    report_parser.add_argument("--json", action="store_true", help="Print the analysis as JSON")
+    report_parser.add_argument("--last", action="store_true", help="Only the most recent run")
+
+    args = parser.parse_args()
+
+    if args.command == "report":
+        return report(args.session_id, args.json, args.last)
+
+    if args.command == "resume":
+        state_file = session_paths(args.session_id)['state']
+        try:
+            with open(state_file, 'r') as f:
+                state = json.load(f)
+        except (OSError, json.JSONDecodeError):
+            log_error(f"State file not found: {state_file}")
+            return 1
+        task_id = state.get('task')
+        task_file = state.get('task_file') or str(TASKS_DIR / f"{task_id}.md")
+        session_id = args.session_id
+        options = state.get('options', {})
+    else:
+        task_id = args.task_id
+        task_file = args.task_file or str(TASKS_DIR / f"{task_id}.md")
+        session_id = args.session_id or f"{task_id.lower()}-{int(datetime.now().timestamp())}"
+        options = {}
+
+    if not os.path.exists(task_file):
+        log_error(f"Task file not found: {task_file}")
+        return 1
+
+    for key, default in (('max_parallel', DEFAULT_MAX_PARALLEL), ('timeout', DEFAULT_TIMEOUT),
+                         ('retries', DEFAULT_RETRIES)):
+        value = getattr(args, key)
+        options[key] = value if value is not None else options.get(key, default)
+    options['cache'] = options.get('cache', True) and not args.no_cache
+
+    pipeline = Pipeline(task_id, task_file, session_id, claude=args.claude, **options)
+    pipeline.state['options'] = options
+    return run_pipeline(pipeline)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
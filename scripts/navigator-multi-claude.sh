@@ -11,6 +11,8 @@ YELLOW='\033[1;33m'
 RED='\033[0;31m'
 NC='\033[0m' # No Color
 
+SCRIPT_DIR="$(cd "$(dirname "${BASH_SOURCE[0]}")" && pwd)"
+
 # Logging helpers
 log_info() {
   echo -e "${BLUE}[$(date '+%H:%M:%S')]${NC} $1"
@@ -32,116 +34,6 @@ log_phase() {
   echo ""
 }
 
-# Generate error handling instructions for sub-Claude
-error_handling_instructions() {
-  local done_file="$1"
-  cat <<EOF
-
-CRITICAL: If you encounter ANY error or cannot complete this task:
-1. Create failure marker: ${done_file}.failed
-2. Write error details to the file (error message, what went wrong)
-3. Exit immediately
-
-Only create ${done_file} on success.
-EOF
-}
-
-# Wait for file to appear
-wait_for_file() {
-  local file_path="$1"
-  local timeout=300  # 5 minutes (increased for review phase)
-  local elapsed=0
-  local failure_marker="${file_path}.failed"
-
-  log_info "Waiting for file: $file_path"
-
-  while [ ! -f "$file_path" ]; do
-    # Check for failure marker
-    if [ -f "$failure_marker" ]; then
-      log_error "Sub-Claude reported failure:"
-      cat "$failure_marker" >&2
-      return 1
-    fi
-
-    if [ $elapsed -ge $timeout ]; then
-      log_error "Timeout waiting for file: $file_path"
-      return 1
-    fi
-    sleep 1
-    ((elapsed++))
-  done
-
-  log_success "File created: $file_path"
-  return 0
-}
-
-# Wait for marker with retry capability
-wait_for_marker_with_retry() {
-  local marker_file="$1"
-  local phase_name="$2"
-  local max_retries="${3:-1}"
-  local timeout="${4:-180}"
-  local attempt=1
-
-  for attempt in $(seq 1 $((max_retries + 1))); do
-    if [ $attempt -gt 1 ]; then
-      log_info "⚠️  Retry attempt $attempt of $((max_retries + 1)) for phase: $phase_name"
-    fi
-
-    if wait_for_file "$marker_file" "$timeout"; then
-      # Verify marker is valid (non-empty or exists)
-      if [ -s "$marker_file" ] || [ -f "$marker_file" ]; then
-        log_success "✅ Marker verified: $marker_file"
-        return 0
-      else
-        log_error "❌ Marker exists but is invalid"
-      fi
-    fi
-
-    if [ $attempt -le $max_retries ]; then
-      log_info "⚠️  Timeout on attempt $attempt - retrying phase: $phase_name"
-      # Save state before retry
-      save_phase_state "$phase_name" "$attempt"
-    else
-      log_error "❌ Phase failed after $attempt attempts: $phase_name"
-      save_phase_state "$phase_name" "$attempt" "failed"
-      return 1
-    fi
-  done
-
-  return 1
-}
-
-# Save phase state for recovery
-save_phase_state() {
-  local phase_name="$1"
-  local attempt="$2"
-  local status="${3:-retry}"
-
-  if [ -z "$STATE_FILE" ]; then
-    return 0
-  fi
-
-  local timestamp=$(date -u +"%Y-%m-%dT%H:%M:%SZ")
-
-  # Update state file with phase progress
-  cat > "$STATE_FILE" <<EOF
-{
-  "session_id": "${session_id}",
-  "task": "${task_id}",
-  "phases_completed": [${PHASES_COMPLETED}],
-  "current_phase": "${phase_name}",
-  "phase_attempts": {
-    "${phase_name}": ${attempt}
-  },
-  "status": "${status}",
-  "last_update": "${timestamp}"
-}
-EOF
-
-  log_info "💾 State saved: ${STATE_FILE}"
-}
-
 # Read task file and extract metadata
 read_task() {
   local task_id="$1"
@@ -200,8 +92,15 @@ create_feature_branch() {
 main() {
   local task_id="${1:-}"
 
+  # Batch mode: one worktree + pipeline per ticket, run concurrently
+  if [ "$task_id" = "--batch" ]; then
+    shift
+    exec python3 "${SCRIPT_DIR}/multi_claude_batch.py" "$@"
+  fi
+
   if [ -z "$task_id" ]; then
     log_error "Usage: $0 TASK-XX"
+    echo "       $0 --batch TASK-XX TASK-YY ... [--max-pipelines N] [--token-budget N]"
     echo ""
     echo "Example: $0 TASK-19"
     echo ""
@@ -218,6 +117,11 @@ main() {
   fi
 
   # Check dependencies
+  if ! command -v python3 &> /dev/null; then
+    log_error "python3 not found (required by the phase orchestrator)"
+    exit 1
+  fi
+
   if ! command -v claude &> /dev/null; then
     log_error "Claude Code CLI not found. Install from: https://install.claude.com"
     exit 1
@@ -241,333 +145,35 @@ main() {
   branch_name=$(create_feature_branch "$task_id")
   log_success "Branch: $branch_name" >&2
 
-  # Generate unique session ID
-  local session_id="$(echo "$task_id" | tr '[:upper:]' '[:lower:]')-$(date +%s)"
+  # Generate unique session ID (batch mode passes its own)
+  local session_id="${NAV_SESSION_ID:-$(echo "$task_id" | tr '[:upper:]' '[:lower:]')-$(date +%s)}"
   local plan_file=".agent/tasks/${session_id}-plan.md"
-
-  # Initialize state tracking
-  STATE_FILE=".agent/tasks/${session_id}-state.json"
-  PHASES_COMPLETED=""
-  export STATE_FILE PHASES_COMPLETED session_id task_id
+  local review_report_file=".agent/tasks/${session_id}-review-report.md"
 
   # Create marker log if not exists
   mkdir -p .agent
   touch .agent/.marker-log
 
-  log_phase "Phase 1: Planning (Orchestrator)"
-  update_task_status "$task_file" "🚧 In Progress (Planning)"
-
-  log_info "Orchestrator: Creating implementation plan..."
-
-  orchestrator_output=$(claude -p \
-    "You are the Planning Claude in a multi-Claude workflow.
-
-TASK: Read task from ${task_file}. Create implementation plan and save to ${plan_file}.
-
-EFFICIENCY TIPS:
-- Use Task agent (subagent_type=Explore) for codebase exploration instead of manual file reading
-- Task agents return summaries, saving 60-80% tokens
-- For unfamiliar codebases: Launch Explore agent with 'medium' thoroughness
-
-PLAN REQUIREMENTS:
-1) Feature description
-2) Implementation steps (detailed, actionable)
-3) Files to create/modify
-4) Expected outcome
-5) Test strategy
-
-CRITICAL: You MUST create a completion marker when done.
-
-After saving the plan to ${plan_file}:
-1. Verify file was written successfully
-2. The plan file itself serves as the completion marker
-
-The orchestrator will wait for ${plan_file} to exist before proceeding.
-
-$(error_handling_instructions "$plan_file")" \
-    --output-format json \
-    --dangerously-skip-permissions 2>&1)
-
-  if [ $? -ne 0 ]; then
-    log_error "Orchestrator failed"
-    echo "$orchestrator_output"
-    update_task_status "$task_file" "❌ Failed (Planning)"
-    exit 1
-  fi
-
-  log_success "Plan creation requested"
+  log_phase "Phases 1-5: Planning → Implementation → Testing ∥ Documentation → Review"
 
-  if ! wait_for_marker_with_retry "$plan_file" "planning" 1 180; then
-    log_error "Planning phase failed - no plan file created"
-    log_info "💾 Workflow state saved to: $STATE_FILE"
-    log_info "Resume with: ./scripts/resume-workflow.sh $session_id"
-    update_task_status "$task_file" "❌ Failed (Planning)"
-    exit 1
+  # The orchestrator runs phases as a DAG (testing and documentation in
+  # parallel), awaits each sub-Claude directly and saves state for resume.
+  # Phases unchanged since an earlier run are restored from the phase cache
+  local cache_args=()
+  if [ "${NAV_PHASE_CACHE:-1}" = "0" ]; then
+    cache_args+=(--no-cache)
   fi
 
-  log_success "Plan saved to: $plan_file"
-  PHASES_COMPLETED='"phase0"'
-  save_phase_state "phase1" 1 "complete"
-  update_task_status "$task_file" "🚧 In Progress (Planning complete)"
-
-  log_phase "Phase 2: Implementation"
-  update_task_status "$task_file" "🚧 In Progress (Implementation)"
-
-  log_info "Implementation: Building feature from plan..."
-
-  local impl_done_file=".agent/tasks/${session_id}-done"
-
-  impl_output=$(claude -p \
-    "You are the Implementation Claude in a multi-Claude workflow.
-
-TASK: Read the plan from ${plan_file}. Implement the feature following the plan.
-
-EFFICIENCY TIPS:
-- For multi-file searches: Use Task agent (subagent_type=Explore) instead of manual Grep/Glob
-- For understanding existing patterns: Launch Explore agent to analyze similar code
-- Task agents save 60-80% tokens on exploration tasks
-
-IMPLEMENTATION RULES:
-- Follow the plan exactly
-- Write clean, well-documented code
-- Use project conventions (check existing files for patterns)
-
-CRITICAL: You MUST create a completion marker when done.
-
-Steps:
-1. Implement all features from the plan
-2. Test your changes work correctly
-3. Create completion marker using Bash tool:
-
-   touch ${impl_done_file}
-
-Marker file: ${impl_done_file}
-This is REQUIRED for orchestrator to proceed to next phase.
-
-$(error_handling_instructions "$impl_done_file")" \
-    --output-format json \
-    --dangerously-skip-permissions 2>&1)
-
-  if [ $? -ne 0 ]; then
-    log_error "Implementation failed"
-    echo "$impl_output"
-    update_task_status "$task_file" "❌ Failed (Implementation)"
+  if ! python3 "${SCRIPT_DIR}/multi_claude_orchestrator.py" run "$task_id" \
+    --task-file "$task_file" \
+    --session-id "$session_id" \
+    --max-parallel "${NAV_MAX_PARALLEL:-2}" \
+    --timeout "${NAV_PHASE_TIMEOUT:-1800}" \
+    ${cache_args[@]+"${cache_args[@]}"}; then
+    log_error "Multi-Claude pipeline failed"
     exit 1
   fi
 
-  log_success "Implementation requested"
-
-  if ! wait_for_marker_with_retry "$impl_done_file" "implementation" 1 180; then
-    log_error "Implementation phase failed - no completion marker"
-    log_info "💾 Workflow state saved to: $STATE_FILE"
-    log_info "Resume with: ./scripts/resume-workflow.sh $session_id"
-    update_task_status "$task_file" "❌ Failed (Implementation)"
-    exit 1
-  fi
-
-  log_success "Implementation complete"
-  PHASES_COMPLETED='"phase0", "phase1"'
-  save_phase_state "phase2" 1 "complete"
-  update_task_status "$task_file" "🚧 In Progress (Implementation complete)"
-
-  log_phase "Phase 3 & 4: Parallel Testing + Documentation"
-  update_task_status "$task_file" "🚧 In Progress (Testing & Documentation)"
-
-  local test_done_file=".agent/tasks/${session_id}-tests-done"
-  local docs_done_file=".agent/tasks/${session_id}-docs-done"
-
-  log_info "Testing: Validating implementation... (parallel)"
-  log_info "Documentation: Generating docs... (parallel)"
-
-  # Launch testing Claude in background
-  (
-    test_output=$(claude -p \
-      "You are the Testing Claude in a multi-Claude workflow.
-
-TASK: Read the plan from ${plan_file}. Review implementation and generate comprehensive tests. Run tests to validate.
-
-EFFICIENCY TIPS:
-- Use Task agent (subagent_type=Explore) to find existing test patterns
-- Analyze similar test files to match project conventions
-
-TEST REQUIREMENTS:
-- Unit tests for all functions
-- Edge cases and error handling
-- Run tests and verify they pass
-
-CRITICAL: You MUST create a completion marker when done.
-
-Steps:
-1. Generate comprehensive tests
-2. Run tests and verify they pass
-3. Create completion marker using Bash tool:
-
-   touch ${test_done_file}
-
-Marker file: ${test_done_file}
-This is REQUIRED for orchestrator to proceed.
-
-$(error_handling_instructions "$test_done_file")" \
-      --output-format json \
-      --dangerously-skip-permissions 2>&1)
-
-    if [ $? -ne 0 ]; then
-      echo "TEST_FAILED" > ".agent/tasks/${session_id}-tests-failed"
-      log_error "Testing failed"
-    fi
-  ) &
-  local test_pid=$!
-
-  # Launch documentation Claude in parallel
-  (
-    docs_output=$(claude -p \
-      "You are the Documentation Claude in a multi-Claude workflow.
-
-TASK: Read the plan from ${plan_file}. Review implementation and generate comprehensive documentation.
-
-EFFICIENCY TIPS:
-- Use Task agent (subagent_type=Explore) to find existing documentation patterns
-- Match project documentation style
-
-DOCUMENTATION REQUIREMENTS:
-- README sections (installation, usage, examples)
-- JSDoc/TSDoc for all public APIs
-- Usage examples with code snippets
-
-CRITICAL: You MUST create a completion marker when done.
-
-Steps:
-1. Generate comprehensive documentation
-2. Verify documentation is complete
-3. Create completion marker using Bash tool:
-
-   touch ${docs_done_file}
-
-Marker file: ${docs_done_file}
-This is REQUIRED for orchestrator to proceed.
-
-$(error_handling_instructions "$docs_done_file")" \
-      --output-format json \
-      --dangerously-skip-permissions 2>&1)
-
-    if [ $? -ne 0 ]; then
-      echo "DOCS_FAILED" > ".agent/tasks/${session_id}-docs-failed"
-      log_error "Documentation failed"
-    fi
-  ) &
-  local docs_pid=$!
-
-  log_success "Parallel execution started"
-  log_info "Waiting for parallel phases to complete..."
-
-  # Wait for testing
-  if ! wait_for_marker_with_retry "$test_done_file" "testing" 1 180; then
-    log_error "Testing phase timeout"
-    kill $test_pid $docs_pid 2>/dev/null
-    log_info "💾 Workflow state saved to: $STATE_FILE"
-    log_info "Resume with: ./scripts/resume-workflow.sh $session_id"
-    update_task_status "$task_file" "❌ Failed (Testing timeout)"
-    exit 1
-  fi
-  log_success "Testing complete"
-
-  # Wait for documentation
-  if ! wait_for_marker_with_retry "$docs_done_file" "documentation" 1 180; then
-    log_error "Documentation phase timeout"
-    kill $docs_pid 2>/dev/null
-    log_info "💾 Workflow state saved to: $STATE_FILE"
-    log_info "Resume with: ./scripts/resume-workflow.sh $session_id"
-    update_task_status "$task_file" "❌ Failed (Documentation timeout)"
-    exit 1
-  fi
-  log_success "Documentation complete"
-
-  wait $test_pid $docs_pid 2>/dev/null
-
-  # Check quality gates
-  log_info "Checking quality gates..."
-
-  if [ -f ".agent/tasks/${session_id}-tests-failed" ]; then
-    log_error "Tests failed - quality gate not met"
-    cat ".agent/tasks/${session_id}-tests-failed"
-    update_task_status "$task_file" "❌ Failed (Tests failed)"
-    exit 1
-  fi
-
-  if [ -f ".agent/tasks/${session_id}-docs-failed" ]; then
-    log_error "Documentation generation failed"
-    cat ".agent/tasks/${session_id}-docs-failed"
-    update_task_status "$task_file" "❌ Failed (Documentation failed)"
-    exit 1
-  fi
-
-  log_success "All quality gates passed ✓"
-  PHASES_COMPLETED='"phase0", "phase1", "phase2", "phase3"'
-  save_phase_state "phase4" 1 "complete"
-  update_task_status "$task_file" "🚧 In Progress (Testing & docs complete)"
-
-  log_phase "Phase 5: Review"
-  update_task_status "$task_file" "🚧 In Progress (Review)"
-
-  local review_done_file=".agent/tasks/${session_id}-review-done"
-  local review_report_file=".agent/tasks/${session_id}-review-report.md"
-
-  log_info "Review: Analyzing all changes..."
-
-  review_output=$(claude -p \
-    "You are the Review Claude in a multi-Claude workflow.
-
-TASK: Read the plan from ${plan_file}. Review all implementation changes using git diff. Analyze code quality, test coverage, documentation. Generate review report and save to ${review_report_file}.
-
-EFFICIENCY TIPS:
-- Use Task agent (subagent_type=Explore) to analyze patterns across multiple files
-- For large changesets: Use Task agent to summarize changes before detailed review
-
-REVIEW REQUIREMENTS:
-Include in ${review_report_file}:
-1) Quality score (1-10)
-2) Strengths
-3) Issues found
-4) Suggestions for improvement
-5) Approval decision (APPROVED/NEEDS_WORK)
-
-CRITICAL: You MUST create a completion marker when done.
-
-Steps:
-1. Review all changes thoroughly
-2. Save review report to ${review_report_file}
-3. Create completion marker using Bash tool:
-
-   touch ${review_done_file}
-
-Marker file: ${review_done_file}
-This is REQUIRED for orchestrator to proceed.
-
-$(error_handling_instructions "$review_done_file")" \
-    --output-format json \
-    --dangerously-skip-permissions 2>&1)
-
-  if [ $? -ne 0 ]; then
-    log_error "Review failed"
-    echo "$review_output"
-    update_task_status "$task_file" "❌ Failed (Review)"
-    exit 1
-  fi
-
-  log_success "Review requested"
-
-  if ! wait_for_marker_with_retry "$review_done_file" "review" 1 180; then
-    log_error "Review phase timeout"
-    log_info "💾 Workflow state saved to: $STATE_FILE"
-    log_info "Resume with: ./scripts/resume-workflow.sh $session_id"
-    update_task_status "$task_file" "❌ Failed (Review timeout)"
-    exit 1
-  fi
-
-  log_success "Review complete"
-  PHASES_COMPLETED='"phase0", "phase1", "phase2", "phase3", "phase4"'
-  save_phase_state "phase5" 1 "complete"
-
   # Check review approval
   if [ -f "$review_report_file" ]; then
     if grep -q "APPROVED" "$review_report_file"; then
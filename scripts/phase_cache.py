@@ -0,0 +1,402 @@
+#!/usr/bin/env python3
+"""
+Navigator Multi-Claude Phase Cache
+
+Content-addressed cache of completed pipeline phases, so a re-run (a new
+`run` after a failure, `resume`, a batch re-run in a fresh worktree) only
+pays for phases whose inputs changed.
+
+Results are cached per phase group: phases with the same dependencies
+(testing and documentation) may run concurrently in one working tree, so
+their changes can't be told apart and are stored together. Every other
+phase is a group of its own. A group's key hashes:
+- the task spec (task file, minus its **Status** line)
+- the base commit the pipeline started from
+- the member phases' prompts (with the session ID normalized out)
+- the result digests of the groups it depends on
+
+so a re-planned task invalidates everything downstream of the plan. A
+cached result holds the group's artifacts (plan, review report) and the
+working-tree changes it made - the diff, plus the post-group content of
+each changed file - taken between a git snapshot of the tree when the
+group starts and one when its last member completes (written through a
+temporary index; the real index is untouched). .agent/tasks and
+.agent/.cache are excluded from snapshots.
+
+Entries live in .agent/.cache/phases/<key>.json of the main checkout, so
+batch-mode worktrees share them.
+
+Used by scripts/multi_claude_orchestrator.py.
+
+Usage:
+    python3 scripts/phase_cache.py list
+    python3 scripts/phase_cache.py clear
+"""
+
+import argparse
+import asyncio
+import base64
+import hashlib
+import json
+import os
+import re
+import shutil
+import sys
+import tempfile
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+CACHE_VERSION = 2
+CACHE_DIR = Path('.agent') / '.cache' / 'phases'
+SESSION_PLACEHOLDER = '{session}'
+
+EXECUTABLE_MODE = '100755'
+SYMLINK_MODE = '120000'
+SUBMODULE_MODE = '160000'
+
+# Pipeline bookkeeping, never part of a phase's diff
+SNAPSHOT_EXCLUDE = (
+    ':(top).agent/tasks',
+    ':(top).agent/.cache',
+    ':(top).agent/.marker-log',
+)
+
+
+async def git(*args: str, env: Optional[Dict[str, str]] = None,
+              stdin: Optional[bytes] = None) -> Tuple[int, bytes]:
+    """Run git; returns (exit code, stdout). 127 if git isn't installed."""
+    try:
+        process = await asyncio.create_subprocess_exec(
+            'git', *args,
+            env=dict(os.environ, **env) if env else None,
+            stdin=asyncio.subprocess.PIPE if stdin is not None else asyncio.subprocess.DEVNULL,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.DEVNULL,
+        )
+    except OSError:
+        return 127, b''
+    stdout, _ = await process.communicate(stdin)
+    return process.returncode, stdout
+
+
+async def head_commit() -> Optional[str]:
+    """Commit the working tree is based on, or None outside a git repository."""
+    code, out = await git('rev-parse', '--verify', '--quiet', 'HEAD')
+    return out.decode().strip() if code == 0 else None
+
+
+def _sha256(*parts: str) -> str:
+    digest = hashlib.sha256()
+    for part in parts:
+        digest.update(part.encode())
+        digest.update(b'\0')
+    return digest.hexdigest()
+
+
+def phase_key(group: str, prompts: Iterable[str], session_id: str, task_text: str,
+              base_commit: str, dep_digests: Iterable[str]) -> str:
+    """
+    Cache key for one phase group run.
+
+    Args:
+        group: Group name (e.g. 'testing+documentation')
+        prompts: Full sub-Claude prompts of the group's phases, in order
+        session_id: Session the prompts were built for (normalized out)
+        task_text: Task file contents
+        base_commit: Commit the pipeline started from
+        dep_digests: Result digests of the groups this one depends on
+
+    Returns:
+        Hex digest
+    """
+    spec = re.sub(r'^\*\*Status\*\*:.*$', '', task_text, flags=re.MULTILINE)
+    return _sha256(str(CACHE_VERSION), group,
+                   *(prompt.replace(session_id, SESSION_PLACEHOLDER) for prompt in prompts),
+                   spec, base_commit, *dep_digests)
+
+
+class PhaseCache:
+    """
+    Stores and restores phase group results; create with `await PhaseCache.open()`.
+
+    begin() snapshots the tree when a group's first phase starts and
+    record() diffs against that snapshot once the group completes, so a
+    result holds exactly the changes its own phases made. Phases in one
+    group share a working tree while they run and get each other's changes,
+    which is why they are cached as one result.
+
+    Args:
+        directory: Cache directory
+        root: Top of the working tree
+    """
+
+    def __init__(self, directory: Path, root: Path):
+        self.directory = directory
+        self.root = root
+        self.starts: Dict[str, str] = {}  # group -> tree when it started
+        self._lock = asyncio.Lock()
+
+    @classmethod
+    async def open(cls, directory: Optional[Path] = None) -> Optional['PhaseCache']:
+        """Cache for the current repository, or None outside a git work tree."""
+        code, out = await git('rev-parse', '--show-toplevel')
+        if code != 0:
+            return None
+        root = Path(out.decode().strip())
+        directory = directory or await default_cache_dir()
+        if directory is None:
+            return None
+        return cls(directory, root)
+
+    def _path(self, key: str) -> Path:
+        return self.directory / f"{key}.json"
+
+    def lookup(self, key: str) -> Optional[Dict]:
+        """Cached result for a key, or None."""
+        try:
+            with open(self._path(key), 'r') as f:
+                entry = json.load(f)
+        except (OSError, json.JSONDecodeError):
+            return None
+        if not isinstance(entry, dict) or entry.get('version') != CACHE_VERSION:
+            return None
+        return entry
+
+    async def begin(self, group: str):
+        """Snapshot the tree before the group's first phase starts (later calls are no-ops)."""
+        async with self._lock:
+            if group not in self.starts:
+                tree = await snapshot_tree()
+                if tree is not None:
+                    self.starts[group] = tree
+
+    async def record(self, key: str, group: str, session_id: str,
+                     artifacts: Iterable[str], usage: Dict[str, Dict]) -> Optional[str]:
+        """
+        Store a group whose phases have all completed.
+
+        Args:
+            key: Group key (see phase_key)
+            group: Group name
+            session_id: Session whose artifacts to store
+            artifacts: Artifact file paths (plan, review report)
+            usage: Token usage per phase (reported on later hits)
+
+        Returns:
+            Result digest (feeds dependent groups' keys), or None if the
+            group wasn't begun or the tree couldn't be snapshotted
+        """
+        async with self._lock:
+            start = self.starts.get(group)
+            tree = await snapshot_tree() if start else None
+            if tree is None:
+                return None
+            files = await changed_files(start, tree)
+            code, diff = await git('diff', '--binary', start, tree)
+            if files is None or code != 0:
+                return None
+
+        total: Dict[str, float] = {}
+        for phase_usage in usage.values():
+            for name, value in phase_usage.items():
+                total[name] = total.get(name, 0) + value
+
+        stored = {}
+        for path in artifacts:
+            try:
+                content = Path(path).read_text()
+            except (OSError, UnicodeDecodeError):
+                continue
+            stored[path.replace(session_id, SESSION_PLACEHOLDER)] = \
+                content.replace(session_id, SESSION_PLACEHOLDER)
+
+        entry = {
+            'version': CACHE_VERSION,
+            'key': key,
+            'phase': group,
+            'session_id': session_id,
+            'created': datetime.now(timezone.utc).strftime('%Y-%m-%dT%H:%M:%SZ'),
+            'usage': total,
+            'phase_usage': usage,
+            'artifacts': stored,
+            'files': files,
+            'diff': diff.decode(errors='replace'),
+            'digest': _sha256(
+                *(f"{path}\0{item['blob'] if item else '-'}" for path, item in sorted(files.items())),
+                *(f"{path}\0{content}" for path, content in sorted(stored.items())),
+            ),
+        }
+        try:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            # The workflow commits with `git add .` - never pick up the cache
+            ignore_file = self.directory / '.gitignore'
+            if not ignore_file.exists():
+                ignore_file.write_text('*\n')
+            fd, tmp_path = tempfile.mkstemp(dir=self.directory, prefix='.phase-')
+            with os.fdopen(fd, 'w') as f:
+                json.dump(entry, f)
+            os.replace(tmp_path, self._path(key))
+        except OSError:
+            # Cache is an optimization - never fail the pipeline over it
+            pass
+        return entry['digest']
+
+    async def restore(self, entry: Dict, session_id: str) -> bool:
+        """
+        Re-create a cached group result in the working tree.
+
+        Files the phase changed are written with their post-phase content
+        (deleted files are removed), so restoring is idempotent - re-running
+        in the checkout the phase already ran in changes nothing.
+
+        Returns:
+            False if a file couldn't be written
+        """
+        files = entry.get('files', {})
+        async with self._lock:
+            try:
+                for path, item in files.items():
+                    target = self.root / path
+                    if item is None:
+                        if target.is_symlink() or target.exists():
+                            target.unlink()
+                        continue
+                    content = base64.b64decode(item['content'])
+                    target.parent.mkdir(parents=True, exist_ok=True)
+                    if target.is_symlink():
+                        target.unlink()
+                    if item['mode'] == SYMLINK_MODE:
+                        target.unlink(missing_ok=True)
+                        os.symlink(content, target)
+                    else:
+                        target.write_bytes(content)
+                        target.chmod(0o755 if item['mode'] == EXECUTABLE_MODE else 0o644)
+            except (OSError, KeyError, ValueError):
+                return False
+
+        for template, content in entry.get('artifacts', {}).items():
+            path = Path(template.replace(SESSION_PLACEHOLDER, session_id))
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_text(content.replace(SESSION_PLACEHOLDER, session_id))
+        return True
+
+
+async def default_cache_dir() -> Optional[Path]:
+    """CACHE_DIR in the main checkout (shared by all worktrees), None outside git."""
+    code, out = await git('rev-parse', '--show-toplevel')
+    if code != 0:
+        return None
+    root = Path(out.decode().strip())
+
+    code, out = await git('rev-parse', '--path-format=absolute', '--git-common-dir')
+    common_dir = Path(out.decode().strip())
+    if code == 0 and common_dir.name == '.git':
+        root = common_dir.parent
+    return root / CACHE_DIR
+
+
+async def _with_temp_index(commands: List[Tuple[Tuple[str, ...], Optional[bytes]]],
+                           seed_index: bool) -> Optional[str]:
+    """Run git commands against a throwaway index; returns the last one's output."""
+    with tempfile.TemporaryDirectory(prefix='nav-index-') as tmp:
+        index = os.path.join(tmp, 'index')
+        if seed_index:
+            # Start from the real index so unchanged files aren't re-hashed
+            code, out = await git('rev-parse', '--git-path', 'index')
+            if code == 0:
+                try:
+                    shutil.copyfile(out.decode().strip(), index)
+                except OSError:
+                    pass
+
+        out = b''
+        for args, stdin in commands:
+            code, out = await git(*args, env={'GIT_INDEX_FILE': index}, stdin=stdin)
+            if code != 0:
+                return None
+        return out.decode().strip()
+
+
+async def snapshot_tree() -> Optional[str]:
+    """Tree object of the working tree (tracked and untracked, honoring .gitignore)."""
+    # Excluded paths are dropped after adding: naming an ignored path in
+    # `git add` pathspecs is an error
+    return await _with_temp_index([
+        (('add', '-A', '--', ':/'), None),
+        (('rm', '-r', '-q', '--cached', '--ignore-unmatch', '--', *SNAPSHOT_EXCLUDE), None),
+        (('write-tree',), None),
+    ], seed_index=True)
+
+
+async def changed_files(old_tree: str, new_tree: str) -> Optional[Dict[str, Optional[Dict]]]:
+    """
+    Files that differ between two trees, with their new content.
+
+    Returns:
+        Mapping of path -> {'mode', 'blob', 'content' (base64)}, or None for
+        deleted files; None if git fails
+    """
+    code, raw = await git('diff', '--raw', '-z', '--no-renames', '--no-abbrev', old_tree, new_tree)
+    if code != 0:
+        return None
+
+    fields = raw.decode(errors='surrogateescape').split('\0')
+    changes = {}
+    for meta, path in zip(fields[0::2], fields[1::2]):
+        _, new_mode, _, blob, status = meta.lstrip(':').split(' ')
+        if status == 'D':
+            changes[path] = None
+        elif new_mode != SUBMODULE_MODE:
+            changes[path] = {'mode': new_mode, 'blob': blob}
+
+    blobs = [item['blob'] for item in changes.values() if item]
+    if blobs:
+        code, out = await git('cat-file', '--batch', stdin='\n'.join(blobs).encode() + b'\n')
+        if code != 0:
+            return None
+        contents = {}
+        offset = 0
+        for _ in blobs:
+            header_end = out.index(b'\n', offset)
+            blob, _, size = out[offset:header_end].decode().split(' ')
+            start = header_end + 1
+            contents[blob] = out[start:start + int(size)]
+            offset = start + int(size) + 1
+        for item in changes.values():
+            if item:
+                item['content'] = base64.b64encode(contents[item['blob']]).decode()
+    return changes
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Navigator multi-Claude phase cache")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    subparsers.add_parser("list", help="List cached phase group results")
+    subparsers.add_parser("clear", help="Delete all cached phase results")
+
+    args = parser.parse_args()
+
+    directory = asyncio.run(default_cache_dir()) or CACHE_DIR
+    entries = sorted(directory.glob('*.json')) if directory.is_dir() else []
+
+    if args.command == "clear":
+        for path in entries:
+            path.unlink()
+        print(f"Removed {len(entries)} cached phase results from {directory}")
+        return 0
+
+    for path in entries:
+        try:
+            with open(path, 'r') as f:
+                entry = json.load(f)
+        except (OSError, json.JSONDecodeError):
+            continue
+        tokens = entry.get('usage', {}).get('tokens', 0)
+        print(f"{entry.get('key', path.stem)[:12]}  {entry.get('phase', '?'):<22} "
+              f"{entry.get('session_id', '?'):<28} {entry.get('created', '?')}  {tokens:>10,} tokens")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
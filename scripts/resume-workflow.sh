@@ -185,6 +185,7 @@ log_success "Workflow resumed successfully!"
 echo ""
 echo "Next steps:"
 echo "1. Verify phase completion"
-echo "2. Continue with next phase or re-run full workflow"
+echo "2. Continue remaining phases: python3 scripts/multi_claude_orchestrator.py resume $SESSION_ID"
+echo "   (phases unchanged since an earlier run are restored from the phase cache)"
 echo "3. Check state: cat $STATE_FILE"
 echo ""
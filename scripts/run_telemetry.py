@@ -0,0 +1,273 @@
+#!/usr/bin/env python3
+"""
+Navigator Multi-Claude Run Telemetry
+
+Structured per-phase telemetry for multi-Claude runs. The orchestrator
+appends one JSON object per event to .agent/tasks/<session>-run.jsonl:
+
+    pipeline_start  task, phases (name -> deps), options
+    phase_start     phase, attempt
+    phase_end       phase, attempt, status, exit_code, reason, duration_s, usage
+    phase_cached    phase, key, saved_usage
+    phase_skipped   phase (completed in an earlier run)
+    pipeline_end    status, duration_s, usage
+
+Every event carries `ts` (Unix time). A resumed session appends a new
+pipeline_start, so one log can hold several runs.
+
+analyze_run() turns a run's events into per-phase totals and the critical
+path - the chain of phases, each waiting on the one before, that set the
+run's wall time - and format_report() renders it. Both back
+`multi_claude_orchestrator.py report <session>`.
+"""
+
+import json
+import time
+from pathlib import Path
+from typing import Dict, List, Optional
+
+
+class RunLog:
+    """
+    Append-only JSONL event log for one session.
+
+    Args:
+        path: Log file (created on first write)
+    """
+
+    def __init__(self, path: str):
+        self.path = Path(path)
+
+    def write(self, event: str, **fields):
+        """Append an event; telemetry never fails the pipeline."""
+        record = {'event': event, 'ts': round(time.time(), 3), **fields}
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with open(self.path, 'a') as f:
+                f.write(json.dumps(record, separators=(',', ':')) + '\n')
+        except OSError:
+            pass
+
+
+def load_runs(path: str) -> List[List[Dict]]:
+    """
+    Events of a run log, split into runs.
+
+    Args:
+        path: Run log file
+
+    Returns:
+        One event list per pipeline_start (malformed lines skipped)
+    """
+    runs: List[List[Dict]] = []
+    with open(path, 'r') as f:
+        for line in f:
+            try:
+                event = json.loads(line)
+            except json.JSONDecodeError:
+                continue
+            if not isinstance(event, dict) or 'event' not in event:
+                continue
+            if event['event'] == 'pipeline_start' or not runs:
+                runs.append([])
+            runs[-1].append(event)
+    return runs
+
+
+def _share(part: float, whole: float) -> float:
+    return round(100.0 * part / whole, 1) if whole else 0.0
+
+
+def analyze_run(events: List[Dict]) -> Dict:
+    """
+    Per-phase totals and critical path for one run.
+
+    Args:
+        events: Events of one run (see load_runs)
+
+    Returns:
+        Dict with run-level totals, 'phases' (name -> totals, in start
+        order), 'critical_path' (phase names) and 'dominant' phases
+    """
+    start_event = events[0] if events[0]['event'] == 'pipeline_start' else {}
+    end_event = next((e for e in reversed(events) if e['event'] == 'pipeline_end'), {})
+    deps = start_event.get('phases', {})
+
+    phases: Dict[str, Dict] = {}
+    for event in events:
+        name = event.get('phase')
+        if name is None:
+            continue
+        phase = phases.setdefault(name, {
+            'status': 'pending', 'attempts': 0, 'start': event['ts'], 'end': event['ts'],
+            'busy_s': 0.0, 'longest_attempt_s': 0.0, 'last_attempt_s': 0.0, 'tokens': 0, 'cost_usd': 0.0,
+            'exit_codes': [], 'reasons': [], 'cached': False, 'saved_tokens': 0,
+        })
+        phase['end'] = max(phase['end'], event['ts'])
+
+        kind = event['event']
+        if kind == 'phase_start':
+            phase['attempts'] += 1
+            phase['status'] = 'running'
+        elif kind == 'phase_end':
+            duration = float(event.get('duration_s') or 0.0)
+            usage = event.get('usage') or {}
+            phase['status'] = event.get('status', 'failed')
+            phase['busy_s'] += duration
+            phase['longest_attempt_s'] = max(phase['longest_attempt_s'], duration)
+            phase['last_attempt_s'] = duration
+            phase['tokens'] += int(usage.get('tokens', 0))
+            phase['cost_usd'] += float(usage.get('cost_usd', 0.0))
+            phase['exit_codes'].append(event.get('exit_code'))
+            if event.get('reason'):
+                phase['reasons'].append(event['reason'])
+        elif kind == 'phase_cached':
+            phase['status'] = 'cached'
+            phase['cached'] = True
+            phase['saved_tokens'] += int((event.get('saved_usage') or {}).get('tokens', 0))
+        elif kind == 'phase_skipped':
+            phase['status'] = 'skipped'
+
+    run_start = start_event.get('ts', min((p['start'] for p in phases.values()), default=0.0))
+    run_end = end_event.get('ts', max((p['end'] for p in phases.values()), default=run_start))
+    wall_s = max(run_end - run_start, 0.0)
+    tokens = sum(p['tokens'] for p in phases.values())
+
+    for name, phase in phases.items():
+        phase['wall_s'] = round(phase['end'] - phase['start'], 3)
+        phase['retries'] = max(phase['attempts'] - 1, 0)
+        phase['wall_pct'] = _share(phase['wall_s'], wall_s)
+        phase['tokens_pct'] = _share(phase['tokens'], tokens)
+        phase['cost_usd'] = round(phase['cost_usd'], 4)
+        phase['busy_s'] = round(phase['busy_s'], 3)
+        phase['longest_attempt_s'] = round(phase['longest_attempt_s'], 3)
+        phase['last_attempt_s'] = round(phase['last_attempt_s'], 3)
+
+        # Slack: gap between finishing and the first dependent starting -
+        # time the phase could have taken without delaying anything
+        dependents = [other for other, other_deps in deps.items()
+                      if name in other_deps and other in phases]
+        next_start = min((phases[d]['start'] for d in dependents), default=run_end)
+        phase['slack_s'] = round(max(next_start - phase['end'], 0.0), 3) if dependents else None
+
+    # Critical path: walk back from the last phase to finish through the
+    # dependency that finished last
+    critical_path: List[str] = []
+    current: Optional[str] = max(phases, key=lambda n: phases[n]['end'], default=None)
+    while current is not None:
+        critical_path.append(current)
+        ready = [dep for dep in deps.get(current, ()) if dep in phases]
+        current = max(ready, key=lambda n: phases[n]['end'], default=None)
+    critical_path.reverse()
+    critical_s = sum(phases[name]['wall_s'] for name in critical_path)
+
+    # Peak number of phases running at once
+    edges = sorted([(p['start'], 1) for p in phases.values() if p['busy_s']]
+                   + [(p['end'], -1) for p in phases.values() if p['busy_s']],
+                   key=lambda edge: (edge[0], edge[1]))
+    running = peak = 0
+    for _, step in edges:
+        running += step
+        peak = max(peak, running)
+
+    dominant = {}
+    if phases:
+        by_time = max(phases, key=lambda n: phases[n]['wall_s'])
+        by_tokens = max(phases, key=lambda n: phases[n]['tokens'])
+        dominant = {
+            'wall_time': {'phase': by_time, 'pct': phases[by_time]['wall_pct']},
+            'tokens': {'phase': by_tokens, 'pct': phases[by_tokens]['tokens_pct']},
+        }
+
+    return {
+        'task': start_event.get('task'),
+        'started': run_start,
+        'status': end_event.get('status', 'incomplete'),
+        'options': start_event.get('options', {}),
+        'wall_s': round(wall_s, 3),
+        'tokens': tokens,
+        'cost_usd': round(sum(p['cost_usd'] for p in phases.values()), 4),
+        'saved_tokens': sum(p['saved_tokens'] for p in phases.values()),
+        'peak_parallel': peak,
+        'critical_path': critical_path,
+        'critical_s': round(critical_s, 3),
+        'critical_pct': _share(critical_s, wall_s),
+        'dominant': dominant,
+        'phases': {name: dict({k: v for k, v in phase.items() if k not in ('start', 'end')},
+                              started=phase['start'], finished=phase['end'])
+                   for name, phase in phases.items()},
+    }
+
+
+def format_duration(seconds: Optional[float]) -> str:
+    if seconds is None:
+        return '-'
+    if seconds < 60:
+        return f"{seconds:.1f}s"
+    minutes, secs = divmod(int(round(seconds)), 60)
+    hours, minutes = divmod(minutes, 60)
+    return f"{hours}h {minutes:02d}m" if hours else f"{minutes}m {secs:02d}s"
+
+
+def format_report(session_id: str, runs: List[Dict]) -> str:
+    """
+    Human-readable report for a session's analyzed runs.
+
+    Args:
+        session_id: Session identifier
+        runs: analyze_run() results, oldest first
+
+    Returns:
+        Report text
+    """
+    lines = []
+    for number, run in enumerate(runs, 1):
+        started = time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(run['started']))
+        title = f"Session {session_id}"
+        if len(runs) > 1:
+            title += f" - run {number} of {len(runs)}"
+        lines.append(title)
+        lines.append(f"  Task {run['task'] or '?'}, started {started}: {run['status']} in "
+                     f"{format_duration(run['wall_s'])}, {run['tokens']:,} tokens, ${run['cost_usd']:.2f}")
+        if run['saved_tokens']:
+            lines.append(f"  Restored from cache: {run['saved_tokens']:,} tokens not spent")
+        lines.append('')
+
+        lines.append(f"  {'PHASE':<16} {'STATUS':<9} {'TRIES':>5} {'WALL':>9} {'%WALL':>6} "
+                     f"{'TOKENS':>11} {'%TOK':>6} {'COST':>8} {'SLACK':>9}")
+        for name, phase in run['phases'].items():
+            marker = '*' if name in run['critical_path'] else ' '
+            cost = f"${phase['cost_usd']:.2f}"
+            lines.append(
+                f"{marker} {name:<16} {phase['status']:<9} {phase['attempts']:>5} "
+                f"{format_duration(phase['wall_s']):>9} {phase['wall_pct']:>5.1f}% "
+                f"{phase['tokens']:>11,} {phase['tokens_pct']:>5.1f}% {cost:>8} "
+                f"{format_duration(phase['slack_s']):>9}")
+        lines.append('')
+
+        if run['critical_path']:
+            lines.append(f"  Critical path (*): {' → '.join(run['critical_path'])} - "
+                         f"{format_duration(run['critical_s'])}, {run['critical_pct']:.0f}% of wall time")
+        if run['dominant']:
+            by_time, by_tokens = run['dominant']['wall_time'], run['dominant']['tokens']
+            lines.append(f"  Dominant phase: {by_time['phase']} ({by_time['pct']:.0f}% of wall time); "
+                         f"{by_tokens['phase']} uses most tokens ({by_tokens['pct']:.0f}%)")
+
+        retried = [(name, p) for name, p in run['phases'].items() if p['retries']]
+        for name, phase in retried:
+            lost = phase['busy_s'] - phase['last_attempt_s'] if phase['status'] == 'complete' else phase['busy_s']
+            reasons = '; '.join(dict.fromkeys(phase['reasons'])) or 'unknown'
+            lines.append(f"  Retries: {name} x{phase['retries']} ({reasons}) - "
+                         f"~{format_duration(max(lost, 0.0))} spent on failed attempts")
+
+        options = run['options']
+        ran = [p for p in run['phases'].values() if p['attempts']]
+        if ran and options.get('timeout'):
+            longest = max(p['longest_attempt_s'] for p in ran)
+            lines.append(f"  Longest attempt: {format_duration(longest)} of a "
+                         f"{format_duration(float(options['timeout']))} timeout")
+        if options.get('max_parallel'):
+            lines.append(f"  Peak parallel phases: {run['peak_parallel']} "
+                         f"(max parallel {options['max_parallel']})")
+        lines.append('')
+    return '\n'.join(lines)
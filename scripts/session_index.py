@@ -0,0 +1,332 @@
+#!/usr/bin/env python3
+"""
+Navigator Session History Index
+
+Maintains a local SQLite index (~/.claude/.nav-session-index.db) of token
+and cost totals per session, per day and per model, built from Claude Code
+session transcripts. Each transcript is scanned incrementally: the index
+remembers the byte offset it reached, so an update only parses lines
+appended since the previous scan.
+
+Queries run against the index, so "tokens this week" or "cache hit trend
+over 30 days" don't rescan transcripts.
+
+Usage:
+    python3 scripts/session_index.py summary --days 7      # shell-parseable totals
+    python3 scripts/session_index.py trend --days 30       # per-day table
+    python3 scripts/session_index.py models --days 30      # per-model table
+    python3 scripts/session_index.py update                # just refresh index
+"""
+
+import argparse
+import json
+import os
+import sqlite3
+import sys
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from session_stats import USAGE_FIELDS, claude_project_dir
+
+INDEX_FILE = Path.home() / '.claude' / '.nav-session-index.db'
+
+# USD per million tokens: (input, output, cache write, cache read)
+# Longest matching model prefix wins; used when entries carry no costUSD
+MODEL_PRICING = {
+    "claude-opus-4-5": (5.00, 25.00, 6.25, 0.50),
+    "claude-opus-4": (15.00, 75.00, 18.75, 1.50),
+    "claude-sonnet-4": (3.00, 15.00, 3.75, 0.30),
+    "claude-3-7-sonnet": (3.00, 15.00, 3.75, 0.30),
+    "claude-3-5-sonnet": (3.00, 15.00, 3.75, 0.30),
+    "claude-haiku-4-5": (1.00, 5.00, 1.25, 0.10),
+    "claude-3-5-haiku": (0.80, 4.00, 1.00, 0.08),
+}
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS files (
+    path TEXT PRIMARY KEY,
+    project TEXT NOT NULL,
+    session_id TEXT NOT NULL,
+    inode INTEGER,
+    offset INTEGER NOT NULL DEFAULT 0
+);
+CREATE TABLE IF NOT EXISTS usage (
+    project TEXT NOT NULL,
+    session_id TEXT NOT NULL,
+    day TEXT NOT NULL,
+    model TEXT NOT NULL,
+    messages INTEGER NOT NULL DEFAULT 0,
+    input_tokens INTEGER NOT NULL DEFAULT 0,
+    output_tokens INTEGER NOT NULL DEFAULT 0,
+    cache_creation INTEGER NOT NULL DEFAULT 0,
+    cache_read INTEGER NOT NULL DEFAULT 0,
+    cost_usd REAL NOT NULL DEFAULT 0,
+    PRIMARY KEY (project, session_id, day, model)
+);
+CREATE INDEX IF NOT EXISTS usage_project_day ON usage (project, day);
+"""
+
+TOTAL_COLUMNS = ["messages", "input_tokens", "output_tokens", "cache_creation", "cache_read", "cost_usd"]
+
+
+def connect(index_file: Path = INDEX_FILE) -> sqlite3.Connection:
+    """Open (and create if needed) the index database."""
+    index_file.parent.mkdir(parents=True, exist_ok=True)
+    conn = sqlite3.connect(str(index_file))
+    conn.executescript(SCHEMA)
+    return conn
+
+
+def model_pricing(model: str) -> Optional[Tuple[float, float, float, float]]:
+    """Per-MTok prices for model (longest prefix match), None if unknown."""
+    matches = [prefix for prefix in MODEL_PRICING if model.startswith(prefix)]
+    return MODEL_PRICING[max(matches, key=len)] if matches else None
+
+
+def entry_cost(model: str, tokens: Dict[str, int], cost_usd: Optional[float]) -> float:
+    """Cost of one assistant turn: recorded costUSD, else priced from usage."""
+    if cost_usd is not None:
+        return float(cost_usd)
+
+    pricing = model_pricing(model)
+    if not pricing:
+        return 0.0
+
+    input_price, output_price, write_price, read_price = pricing
+    return (
+        tokens["input_tokens"] * input_price
+        + tokens["output_tokens"] * output_price
+        + tokens["cache_creation"] * write_price
+        + tokens["cache_read"] * read_price
+    ) / 1_000_000
+
+
+def parse_lines(chunk: bytes) -> Dict[Tuple[str, str], Dict[str, float]]:
+    """
+    Aggregate usage in a chunk of complete JSONL lines by (day, model).
+
+    Args:
+        chunk: Raw transcript bytes ending on a newline
+
+    Returns:
+        Mapping of (day, model) -> totals (see TOTAL_COLUMNS)
+    """
+    buckets = {}
+
+    for line in chunk.splitlines():
+        if b'"usage"' not in line:
+            continue
+        try:
+            data = json.loads(line)
+        except (json.JSONDecodeError, UnicodeDecodeError):
+            continue
+
+        message = data.get('message') if isinstance(data, dict) else None
+        if not isinstance(message, dict) or not isinstance(message.get('usage'), dict):
+            continue
+
+        usage = message['usage']
+        tokens = {key: usage.get(field, 0) or 0 for field, key in USAGE_FIELDS.items()}
+        model = message.get('model') or 'unknown'
+        day = str(data.get('timestamp') or '')[:10] or 'unknown'
+
+        bucket = buckets.setdefault((day, model), dict.fromkeys(TOTAL_COLUMNS, 0))
+        for key, value in tokens.items():
+            bucket[key] += value
+        bucket["messages"] += 1
+        bucket["cost_usd"] += entry_cost(model, tokens, data.get('costUSD'))
+
+    return buckets
+
+
+def update_file(conn: sqlite3.Connection, project: str, path: Path) -> bool:
+    """
+    Index lines appended to one transcript since the last scan.
+
+    Returns:
+        True if anything new was indexed
+    """
+    stat = path.stat()
+    session_id = path.stem
+
+    row = conn.execute("SELECT inode, offset FROM files WHERE path = ?", (str(path),)).fetchone()
+    inode, offset = row if row else (None, 0)
+
+    # Transcript replaced or truncated - drop its rows and rescan
+    if row and (inode != stat.st_ino or stat.st_size < offset):
+        conn.execute("DELETE FROM usage WHERE project = ? AND session_id = ?", (project, session_id))
+        offset = 0
+
+    if row and stat.st_size == offset:
+        return False
+
+    with open(path, 'rb') as f:
+        f.seek(offset)
+        delta = f.read(stat.st_size - offset)
+
+    # Only complete lines; a partially written one is picked up next scan
+    end = delta.rfind(b'\n') + 1
+
+    for (day, model), totals in parse_lines(delta[:end]).items():
+        conn.execute(
+            """
+            INSERT INTO usage (project, session_id, day, model, messages, input_tokens,
+                               output_tokens, cache_creation, cache_read, cost_usd)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            ON CONFLICT (project, session_id, day, model) DO UPDATE SET
+                messages = messages + excluded.messages,
+                input_tokens = input_tokens + excluded.input_tokens,
+                output_tokens = output_tokens + excluded.output_tokens,
+                cache_creation = cache_creation + excluded.cache_creation,
+                cache_read = cache_read + excluded.cache_read,
+                cost_usd = cost_usd + excluded.cost_usd
+            """,
+            (project, session_id, day, model, *[totals[column] for column in TOTAL_COLUMNS]),
+        )
+
+    conn.execute(
+        "INSERT OR REPLACE INTO files (path, project, session_id, inode, offset) VALUES (?, ?, ?, ?, ?)",
+        (str(path), project, session_id, stat.st_ino, offset + end),
+    )
+    return end > 0
+
+
+def update_index(conn: sqlite3.Connection, project_path: str) -> int:
+    """
+    Bring index up to date for every transcript of project.
+
+    Returns:
+        Number of transcripts with new data
+    """
+    claude_dir = claude_project_dir(project_path)
+    project = claude_dir.name
+    updated = 0
+
+    with conn:
+        for path in sorted(claude_dir.glob("*.jsonl")):
+            try:
+                if update_file(conn, project, path):
+                    updated += 1
+            except OSError:
+                continue
+
+    return updated
+
+
+def since_day(days: int) -> str:
+    """First day (UTC, YYYY-MM-DD) of a window ending today."""
+    return (datetime.now(timezone.utc) - timedelta(days=days - 1)).strftime('%Y-%m-%d')
+
+
+def cache_efficiency(input_tokens: int, cache_read: int) -> float:
+    """Share of non-output input served from cache (same formula as session_stats)."""
+    total_with_cache = input_tokens + cache_read
+    return (cache_read / total_with_cache * 100) if total_with_cache > 0 else 0.0
+
+
+def query_summary(conn: sqlite3.Connection, project: str, days: int) -> Dict:
+    """Totals over the last `days` days."""
+    row = conn.execute(
+        f"""
+        SELECT COUNT(DISTINCT session_id), {', '.join(f'COALESCE(SUM({c}), 0)' for c in TOTAL_COLUMNS)}
+        FROM usage WHERE project = ? AND day >= ?
+        """,
+        (project, since_day(days)),
+    ).fetchone()
+
+    summary = dict(zip(["sessions"] + TOTAL_COLUMNS, row))
+
+    # Every cache read is a token not paid as fresh input; savings are what
+    # those reads would have cost as fresh input, minus what they did cost
+    tokens_saved = 0
+    savings = 0.0
+    for model, cache_read in conn.execute(
+        "SELECT model, SUM(cache_read) FROM usage WHERE project = ? AND day >= ? GROUP BY model",
+        (project, since_day(days)),
+    ):
+        tokens_saved += cache_read
+        pricing = model_pricing(model)
+        if pricing:
+            savings += cache_read * (pricing[0] - pricing[3]) / 1_000_000
+    summary["cache_tokens_saved"] = tokens_saved
+    summary["cache_savings_usd"] = savings
+    return summary
+
+
+def query_grouped(conn: sqlite3.Connection, project: str, days: int, group_by: str) -> List[Dict]:
+    """Totals over the last `days` days grouped by 'day' or 'model'."""
+    rows = conn.execute(
+        f"""
+        SELECT {group_by}, COUNT(DISTINCT session_id), {', '.join(f'SUM({c})' for c in TOTAL_COLUMNS)}
+        FROM usage WHERE project = ? AND day >= ?
+        GROUP BY {group_by} ORDER BY {group_by}
+        """,
+        (project, since_day(days)),
+    ).fetchall()
+    return [dict(zip([group_by, "sessions"] + TOTAL_COLUMNS, row)) for row in rows]
+
+
+def print_summary(summary: Dict, days: int):
+    """Shell-parseable totals (source <(...) friendly)."""
+    print(f"PERIOD_DAYS={days}")
+    print(f"SESSIONS={summary['sessions']}")
+    print(f"MESSAGES={summary['messages']}")
+    print(f"INPUT_TOKENS={summary['input_tokens']}")
+    print(f"OUTPUT_TOKENS={summary['output_tokens']}")
+    print(f"CACHE_CREATION={summary['cache_creation']}")
+    print(f"CACHE_READ={summary['cache_read']}")
+    print(f"CACHE_EFFICIENCY={cache_efficiency(summary['input_tokens'], summary['cache_read']):.1f}")
+    print(f"COST_USD={summary['cost_usd']:.4f}")
+    print(f"CACHE_TOKENS_SAVED={summary['cache_tokens_saved']}")
+    print(f"CACHE_SAVINGS_USD={summary['cache_savings_usd']:.4f}")
+
+
+def print_table(rows: List[Dict], key: str):
+    """Fixed-width table for trend/models reports."""
+    print(f"{key.capitalize():<28} {'Sessions':>8} {'Input':>12} {'Output':>10} {'Cache Read':>12} {'Cache %':>8} {'Cost':>10}")
+    print("━" * 94)
+    for row in rows:
+        efficiency = cache_efficiency(row['input_tokens'], row['cache_read'])
+        print(
+            f"{row[key]:<28} {row['sessions']:>8} {row['input_tokens']:>12,} {row['output_tokens']:>10,} "
+            f"{row['cache_read']:>12,} {efficiency:>7.1f}% {'$' + format(row['cost_usd'], '.2f'):>10}"
+        )
+    if not rows:
+        print("No sessions in this period")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Incremental session history index")
+    parser.add_argument("command", choices=["update", "summary", "trend", "models"], help="Action")
+    parser.add_argument("project_path", nargs="?", default=os.getcwd(), help="Project root (default: cwd)")
+    parser.add_argument("--days", type=int, default=7, help="Reporting window in days (default: 7)")
+
+    args = parser.parse_args()
+
+    if not claude_project_dir(args.project_path).is_dir():
+        print("❌ No Claude Code session data found", file=sys.stderr)
+        print(f"   Expected: {claude_project_dir(args.project_path)}", file=sys.stderr)
+        return 1
+
+    conn = connect()
+    try:
+        updated = update_index(conn, args.project_path)
+        project = claude_project_dir(args.project_path).name
+
+        if args.command == "update":
+            print(f"Indexed new data from {updated} session(s)")
+        elif args.command == "summary":
+            print_summary(query_summary(conn, project, args.days), args.days)
+        elif args.command == "trend":
+            print_table(query_grouped(conn, project, args.days, "day"), "day")
+        elif args.command == "models":
+            print_table(query_grouped(conn, project, args.days, "model"), "model")
+    finally:
+        conn.close()
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
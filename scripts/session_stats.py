@@ -0,0 +1,285 @@
+#!/usr/bin/env python3
+"""
+Navigator Session Statistics (transcript-powered)
+
+Aggregates token usage from Claude Code session transcripts
+(~/.claude/projects/<encoded-project-path>/*.jsonl) and prints
+shell-parseable KEY=VALUE lines for scripts/session-stats.sh and nav-stats.
+
+Transcripts are streamed line by line, and per-file aggregates are cached
+by (path, mtime, size) so unchanged sessions are never re-read. With --all,
+every session in the project is aggregated, cache misses in parallel.
+
+Usage:
+    python3 scripts/session_stats.py [project-path]
+    python3 scripts/session_stats.py --all [project-path]
+"""
+
+import argparse
+import glob
+import json
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Dict, List, Optional
+
+CACHE_FILE = Path.home() / '.claude' / '.nav-session-stats-cache.json'
+CACHE_VERSION = 1
+
+USAGE_FIELDS = {
+    "input_tokens": "input_tokens",
+    "output_tokens": "output_tokens",
+    "cache_creation_input_tokens": "cache_creation",
+    "cache_read_input_tokens": "cache_read",
+}
+
+CONTEXT_WINDOW_SIZE = 200000
+
+
+def encode_project_path(project_path: str) -> str:
+    """Encode path the way Claude Code names project dirs ('/' and '.' -> '-')."""
+    return project_path.replace('/', '-').replace('.', '-')
+
+
+def claude_project_dir(project_path: str) -> Path:
+    """Claude Code session data directory for project."""
+    return Path.home() / '.claude' / 'projects' / encode_project_path(project_path)
+
+
+def empty_totals() -> Dict[str, int]:
+    """Zeroed token aggregate."""
+    return {"messages": 0, "input_tokens": 0, "output_tokens": 0, "cache_creation": 0, "cache_read": 0}
+
+
+def aggregate_session_file(session_file: str) -> Dict[str, int]:
+    """
+    Sum usage over one transcript, streaming line by line.
+
+    Args:
+        session_file: Path to session JSONL
+
+    Returns:
+        Token aggregate (see empty_totals)
+    """
+    totals = empty_totals()
+
+    with open(session_file, 'r', errors='replace') as f:
+        for line in f:
+            # Cheap pre-filter: most lines (tool results, user turns) have no usage
+            if '"usage"' not in line:
+                continue
+            try:
+                data = json.loads(line)
+            except json.JSONDecodeError:
+                continue
+
+            message = data.get('message') if isinstance(data, dict) else None
+            if not isinstance(message, dict) or 'usage' not in message:
+                continue
+
+            usage = message['usage'] or {}
+            for field, key in USAGE_FIELDS.items():
+                totals[key] += usage.get(field, 0) or 0
+            totals["messages"] += 1
+
+    return totals
+
+
+def load_cache() -> Dict:
+    """Load per-file aggregate cache."""
+    try:
+        with open(CACHE_FILE, 'r') as f:
+            cache = json.load(f)
+        if cache.get("version") == CACHE_VERSION:
+            return cache
+    except (OSError, ValueError):
+        pass
+    return {"version": CACHE_VERSION, "files": {}}
+
+
+def save_cache(cache: Dict):
+    """Persist per-file aggregate cache (atomic rename)."""
+    try:
+        CACHE_FILE.parent.mkdir(parents=True, exist_ok=True)
+        tmp_file = CACHE_FILE.with_suffix(f'.{os.getpid()}.tmp')
+        with open(tmp_file, 'w') as f:
+            json.dump(cache, f)
+        os.replace(tmp_file, CACHE_FILE)
+    except OSError:
+        pass
+
+
+def session_aggregates(session_files: List[str], workers: Optional[int] = None,
+                       use_cache: bool = True) -> Dict[str, Dict[str, int]]:
+    """
+    Aggregate many transcripts, reusing cached results for unchanged files.
+
+    Args:
+        session_files: Transcript paths
+        workers: Process pool size for cache misses (default: CPU count)
+        use_cache: Read/write the on-disk aggregate cache
+
+    Returns:
+        Mapping of path -> token aggregate
+    """
+    cache = load_cache() if use_cache else {"version": CACHE_VERSION, "files": {}}
+    cached_files = cache["files"]
+
+    results = {}
+    misses = []
+    keys = {}
+
+    for path in session_files:
+        try:
+            stat = os.stat(path)
+        except OSError:
+            continue
+        keys[path] = [stat.st_mtime, stat.st_size]
+
+        entry = cached_files.get(path)
+        if entry and entry.get("key") == keys[path]:
+            results[path] = entry["totals"]
+        else:
+            misses.append(path)
+
+    if len(misses) > 1 and workers != 1:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            computed = dict(zip(misses, pool.map(aggregate_session_file, misses)))
+    else:
+        computed = {path: aggregate_session_file(path) for path in misses}
+
+    for path, totals in computed.items():
+        results[path] = totals
+        cached_files[path] = {"key": keys[path], "totals": totals}
+
+    if use_cache and computed:
+        # Forget sessions that no longer exist
+        cache["files"] = {path: entry for path, entry in cached_files.items() if os.path.exists(path)}
+        save_cache(cache)
+
+    return results
+
+
+def combine(aggregates: List[Dict[str, int]]) -> Dict[str, int]:
+    """Sum several token aggregates."""
+    totals = empty_totals()
+    for aggregate in aggregates:
+        for key in totals:
+            totals[key] += aggregate.get(key, 0)
+    return totals
+
+
+def usage_lines(totals: Dict[str, int]) -> List[str]:
+    """Shell-parseable token usage section."""
+    total_fresh_input = totals["input_tokens"] + totals["cache_creation"]
+    total_with_cache = totals["input_tokens"] + totals["cache_read"]
+    cache_efficiency = (totals["cache_read"] / total_with_cache * 100) if total_with_cache > 0 else 0
+
+    return [
+        f"MESSAGES={totals['messages']}",
+        f"INPUT_TOKENS={totals['input_tokens']}",
+        f"OUTPUT_TOKENS={totals['output_tokens']}",
+        f"CACHE_CREATION={totals['cache_creation']}",
+        f"CACHE_READ={totals['cache_read']}",
+        f"TOTAL_FRESH={total_fresh_input}",
+        f"TOTAL_CACHED={total_with_cache}",
+        f"CACHE_EFFICIENCY={cache_efficiency:.1f}",
+    ]
+
+
+def navigator_lines(project_path: str, totals: Dict[str, int]) -> List[str]:
+    """
+    Shell-parseable Navigator baseline comparison section (v3.5.0+).
+
+    Args:
+        project_path: Project root
+        totals: Token aggregate for the reported session(s)
+    """
+    # Check if Navigator initialized
+    agent_dir = os.path.join(project_path, ".agent")
+    if not os.path.exists(agent_dir):
+        # Not initialized - output zeros
+        return [
+            "BASELINE_TOKENS=0",
+            "LOADED_TOKENS=0",
+            "TOKENS_SAVED=0",
+            "SAVINGS_PERCENT=0",
+            "CONTEXT_USAGE_PERCENT=0",
+            "TIME_SAVED_MINUTES=0",
+        ]
+
+    # Calculate baseline: all .agent/ markdown files
+    # Convert bytes to tokens (4 chars ≈ 1 token)
+    baseline_bytes = 0
+    for md_file in glob.glob(os.path.join(agent_dir, "**/*.md"), recursive=True):
+        try:
+            baseline_bytes += os.path.getsize(md_file)
+        except OSError:
+            pass
+
+    baseline_tokens = baseline_bytes // 4
+
+    # Loaded tokens = cache creation (docs loaded for first time this session)
+    # This represents actual Navigator documentation loaded
+    total_cache_creation = totals["cache_creation"]
+    loaded_tokens = total_cache_creation if total_cache_creation > 0 else max(baseline_tokens // 10, 5000)
+
+    # Calculate savings
+    tokens_saved = baseline_tokens - loaded_tokens
+    savings_percent = int((tokens_saved / baseline_tokens * 100)) if baseline_tokens > 0 else 0
+
+    # Context = fresh input + output tokens (cached tokens don't count - deduplicated)
+    total_fresh_input = totals["input_tokens"] + total_cache_creation
+    total_conversation_tokens = total_fresh_input + totals["output_tokens"]
+    context_usage_percent = min(100, int((total_conversation_tokens / CONTEXT_WINDOW_SIZE) * 100))
+
+    # Estimate time saved (6 seconds per 1k tokens read time)
+    time_saved_minutes = (tokens_saved * 6) // 60000
+
+    return [
+        f"BASELINE_TOKENS={baseline_tokens}",
+        f"LOADED_TOKENS={loaded_tokens}",
+        f"TOKENS_SAVED={tokens_saved}",
+        f"SAVINGS_PERCENT={savings_percent}",
+        f"CONTEXT_USAGE_PERCENT={context_usage_percent}",
+        f"TIME_SAVED_MINUTES={time_saved_minutes}",
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Claude Code session token statistics")
+    parser.add_argument("project_path", nargs="?", default=os.getcwd(), help="Project root (default: cwd)")
+    parser.add_argument("--all", action="store_true", help="Aggregate every session, not just the latest")
+    parser.add_argument("--workers", type=int, default=None, help="Parallel workers for uncached sessions")
+    parser.add_argument("--no-cache", action="store_true", help="Ignore and don't update the aggregate cache")
+
+    args = parser.parse_args()
+    project_path = args.project_path
+    claude_dir = claude_project_dir(project_path)
+
+    if not claude_dir.is_dir():
+        print("❌ No Claude Code session data found")
+        print(f"   Project: {project_path}")
+        print(f"   Expected: {claude_dir}")
+        return 1
+
+    session_files = sorted(glob.glob(str(claude_dir / "*.jsonl")), key=os.path.getmtime, reverse=True)
+    if not session_files:
+        print(f"❌ No conversation files found in {claude_dir}")
+        return 1
+
+    # Most recent conversation file = current session
+    selected = session_files if args.all else session_files[:1]
+    aggregates = session_aggregates(selected, workers=args.workers, use_cache=not args.no_cache)
+    totals = combine(list(aggregates.values()))
+
+    if args.all:
+        print(f"SESSIONS={len(aggregates)}")
+    print('\n'.join(usage_lines(totals)))
+    print('\n'.join(navigator_lines(project_path, totals)))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,6 +1,7 @@
 #!/bin/bash
 # Sub-Claude Timeout Monitor
 # Monitors headless Claude instances for timeouts and marker creation
+# (event-driven via scripts/marker_watcher.py)
 
 set -euo pipefail
 
@@ -37,58 +38,72 @@ log_success() {
   echo -e "${GREEN}[Monitor] ✅${NC} $1" >&2
 }
 
+SCRIPT_DIR="$(cd "$(dirname "${BASH_SOURCE[0]}")" && pwd)"
+
+# Block until the marker appears, the Claude process exits or the timeout
+# passes - woken by inotify (polling fallback) rather than a sleep loop.
+# Returns marker_watcher.py's exit code: 0 marker, 1 failure marker,
+# 2 timeout, 3 process exited
+wait_marker() {
+  local timeout="$1"
+  shift
+  local status=0
+  python3 "$SCRIPT_DIR/marker_watcher.py" wait --timeout "$timeout" "$@" "$MARKER_FILE" >/dev/null 2>&1 || status=$?
+  return $status
+}
+
+log_marker() {
+  if [ -f ".agent/.marker-log" ]; then
+    echo "[$(date -u +"%Y-%m-%dT%H:%M:%SZ")] $1" >> .agent/.marker-log
+  fi
+}
+
 # Main monitoring loop
 monitor_claude() {
-  local elapsed=0
-  local check_interval=5  # Check every 5 seconds
-  local last_check=$((TIMEOUT - 30))  # Check for marker 30s before timeout
+  local warn_at=$((TIMEOUT - 30))  # Warn 30s before timeout
+  local started=$SECONDS
+  local status=0
 
   log_monitor "Monitoring phase: $PHASE_NAME (timeout: ${TIMEOUT}s)"
   log_monitor "Claude PID: $CLAUDE_PID"
   log_monitor "Marker file: $MARKER_FILE"
 
-  while [ $elapsed -lt $TIMEOUT ]; do
-    # Check if Claude process is still running
-    if ! kill -0 "$CLAUDE_PID" 2>/dev/null; then
+  if [ $warn_at -gt 0 ]; then
+    wait_marker "$warn_at" --pid "$CLAUDE_PID" || status=$?
+    if [ $status -eq 2 ]; then
+      log_warning "Approaching timeout (30s remaining) for phase: $PHASE_NAME"
+      log_marker "⚠️  $PHASE_NAME: Timeout approaching (${warn_at}/${TIMEOUT}s)"
+      status=0
+      wait_marker $((TIMEOUT - warn_at)) --pid "$CLAUDE_PID" || status=$?
+    fi
+  else
+    wait_marker "$TIMEOUT" --pid "$CLAUDE_PID" || status=$?
+  fi
+
+  case $status in
+    0)
+      log_success "Marker found: $MARKER_FILE"
+      log_marker "✅ $PHASE_NAME: $MARKER_FILE (elapsed: $((SECONDS - started))s)"
+      exit 0
+      ;;
+    1)
+      log_error "Sub-Claude reported failure: ${MARKER_FILE}.failed"
+      log_marker "❌ $PHASE_NAME: failure marker ${MARKER_FILE}.failed"
+      exit 1
+      ;;
+    3)
       log_monitor "Claude process $CLAUDE_PID exited naturally"
 
       # Give it a moment to write the marker
-      sleep 2
-
-      if [ -f "$MARKER_FILE" ]; then
+      if wait_marker 2; then
         log_success "Marker found after process exit"
         exit 0
       else
         log_warning "Process exited but no marker found"
         exit 1
       fi
-    fi
-
-    # Check if marker exists
-    if [ -f "$MARKER_FILE" ]; then
-      log_success "Marker found: $MARKER_FILE"
-
-      # Log to central marker log
-      if [ -f ".agent/.marker-log" ]; then
-        echo "[$(date -u +"%Y-%m-%dT%H:%M:%SZ")] ✅ $PHASE_NAME: $MARKER_FILE (elapsed: ${elapsed}s)" >> .agent/.marker-log
-      fi
-
-      exit 0
-    fi
-
-    # Warn when approaching timeout
-    if [ $elapsed -eq $last_check ]; then
-      log_warning "Approaching timeout (30s remaining) for phase: $PHASE_NAME"
-
-      # Log warning to marker log
-      if [ -f ".agent/.marker-log" ]; then
-        echo "[$(date -u +"%Y-%m-%dT%H:%M:%SZ")] ⚠️  $PHASE_NAME: Timeout approaching (${elapsed}/${TIMEOUT}s)" >> .agent/.marker-log
-      fi
-    fi
-
-    sleep $check_interval
-    elapsed=$((elapsed + check_interval))
-  done
+      ;;
+  esac
 
   # Timeout reached
   log_error "Timeout reached (${TIMEOUT}s) for phase: $PHASE_NAME"
@@ -97,17 +112,13 @@ monitor_claude() {
   if [ -f "$MARKER_FILE" ]; then
     log_success "Marker found just after timeout - accepting"
 
-    if [ -f ".agent/.marker-log" ]; then
-      echo "[$(date -u +"%Y-%m-%dT%H:%M:%SZ")] ✅ $PHASE_NAME: $MARKER_FILE (at timeout)" >> .agent/.marker-log
-    fi
+    log_marker "✅ $PHASE_NAME: $MARKER_FILE (at timeout)"
 
     exit 0
   fi
 
   # Log timeout to marker log
-  if [ -f ".agent/.marker-log" ]; then
-    echo "[$(date -u +"%Y-%m-%dT%H:%M:%SZ")] ❌ $PHASE_NAME: Timeout (no marker after ${TIMEOUT}s)" >> .agent/.marker-log
-  fi
+  log_marker "❌ $PHASE_NAME: Timeout (no marker after ${TIMEOUT}s)"
 
   # Kill Claude process if still running
   if kill -0 "$CLAUDE_PID" 2>/dev/null; then
@@ -2,20 +2,45 @@
 """
 Project information detection for Navigator initialization.
 
-Detects project name and tech stack from various config files.
+Detects project name and tech stack from various config files. The
+project tree is scanned once (bounded depth, skipping dependency and
+build directories), so monorepos report every package instead of only
+the first manifest found at the root. Manifests are parsed through the
+shared manifest cache (real TOML parsing, one parse per file per run),
+and the detection result is kept in the shared project cache
+(.agent/.cache/project.json) until a manifest changes.
 """
 
 import json
 import os
 import re
+import sys
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Dict, Optional
+from typing import Dict, List, Optional
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2] / 'shared'))
+from manifest_cache import load_json, load_text, load_toml  # noqa: E402
+from project_introspection import cached  # noqa: E402
+
+# How deep below the project root to look for package manifests
+MAX_SCAN_DEPTH = 4
+
+# Directories that never contain first-party packages
+SKIP_DIRS = {
+    "node_modules", "vendor", "target", "dist", "build", "out",
+    "venv", "env", "__pycache__", "site-packages", "bower_components",
+    "fixtures", "testdata",
+}
 
 
 def detect_project_info(cwd: str = ".") -> Dict[str, str]:
     """
     Detect project name and tech stack from config files.
 
+    For monorepos, tech_stack combines the stacks of all detected
+    packages.
+
     Args:
         cwd: Current working directory (default: ".")
 
@@ -25,265 +50,402 @@ def detect_project_info(cwd: str = ".") -> Dict[str, str]:
         - tech_stack: Comma-separated technologies
         - detected_from: Source file used for detection
     """
-    cwd_path = Path(cwd).resolve()
+    result = detect_projects(cwd)
+    root = result["root"]
 
-    # Try detection methods in order
-    detectors = [
-        _detect_from_package_json,
-        _detect_from_pyproject_toml,
-        _detect_from_go_mod,
-        _detect_from_cargo_toml,
-        _detect_from_composer_json,
-        _detect_from_gemfile,
-    ]
+    if result["is_monorepo"]:
+        return {
+            "name": root["name"],
+            "tech_stack": ", ".join(result["tech_stack"]),
+            "detected_from": root["detected_from"],
+        }
 
-    for detector in detectors:
-        result = detector(cwd_path)
-        if result:
-            return result
+    return {
+        "name": root["name"],
+        "tech_stack": root["tech_stack"],
+        "detected_from": root["detected_from"],
+    }
+
+
+def detect_projects(cwd: str = ".", max_depth: int = MAX_SCAN_DEPTH) -> Dict:
+    """
+    Detect every project/workspace package under a directory.
+
+    The tree is walked once with os.scandir. If the same manifests are
+    found with unchanged mtimes, the cached result is returned; otherwise
+    each manifest is parsed once (in parallel). Within a directory, the
+    first manifest in MANIFEST_DETECTORS order decides that package's
+    name and stack.
+
+    Args:
+        cwd: Project root (default: ".")
+        max_depth: Directory levels below the root to scan
+
+    Returns:
+        Dictionary with keys:
+        - root: Detection for the root directory (directory name fallback)
+        - projects: List of packages (path, name, tech_stack, detected_from,
+          manifests), root first
+        - tech_stack: Technologies across all packages, in first-seen order
+        - is_monorepo: True when more than one package was found
+    """
+    cwd_path = Path(cwd).resolve()
+    manifest_dirs = scan_manifests(cwd_path, max_depth)
+    sources = sorted(
+        str((directory / filename).relative_to(cwd_path))
+        for directory, filenames in manifest_dirs.items()
+        for filename in filenames
+    )
+
+    return cached(str(cwd_path), f"projects:depth={max_depth}", sources,
+                  lambda: _detect_from_manifests(cwd_path, manifest_dirs))
+
+
+def _detect_from_manifests(cwd_path: Path, manifest_dirs: Dict[Path, set]) -> Dict:
+    """Parse scanned manifests and build the detect_projects result."""
+    jobs = [
+        (directory, filename)
+        for directory, filenames in manifest_dirs.items()
+        for filename in MANIFEST_DETECTORS
+        if filename in filenames
+    ]
+    with ThreadPoolExecutor(max_workers=min(32, (os.cpu_count() or 1) + 4)) as pool:
+        detections = list(pool.map(lambda job: MANIFEST_DETECTORS[job[1]](job[0]), jobs))
+
+    by_directory: Dict[Path, List[Dict[str, str]]] = {}
+    for (directory, _), detection in zip(jobs, detections):
+        if detection:
+            by_directory.setdefault(directory, []).append(detection)
+
+    projects = []
+    for directory in sorted(by_directory, key=lambda d: (d != cwd_path, str(d))):
+        primary = by_directory[directory][0]
+        projects.append({
+            "path": str(directory.relative_to(cwd_path)),
+            "name": primary["name"],
+            "tech_stack": primary["tech_stack"],
+            "detected_from": primary["detected_from"],
+            "manifests": [d["detected_from"] for d in by_directory[directory]],
+        })
+
+    if projects and projects[0]["path"] == ".":
+        root = {key: projects[0][key] for key in ("name", "tech_stack", "detected_from")}
+    elif projects:
+        root = {"name": cwd_path.name, "tech_stack": "Unknown", "detected_from": "workspace_scan"}
+    else:
+        # Fallback: use directory name
+        root = {"name": cwd_path.name, "tech_stack": "Unknown", "detected_from": "directory_name"}
+
+    tech_stack: List[str] = []
+    for project in projects:
+        for part in project["tech_stack"].split(", "):
+            if part not in tech_stack:
+                tech_stack.append(part)
 
-    # Fallback: use directory name
     return {
-        "name": cwd_path.name,
-        "tech_stack": "Unknown",
-        "detected_from": "directory_name",
+        "root": root,
+        "projects": projects,
+        "tech_stack": tech_stack or ["Unknown"],
+        "is_monorepo": len(projects) > 1,
     }
 
 
+def scan_manifests(root: Path, max_depth: int = MAX_SCAN_DEPTH) -> Dict[Path, set]:
+    """
+    Walk the tree once and record which manifest files each directory has.
+
+    Hidden directories and SKIP_DIRS are not entered, and symlinked
+    directories are not followed.
+
+    Args:
+        root: Directory to scan
+        max_depth: Directory levels below root to descend
+
+    Returns:
+        Mapping of directory -> set of manifest filenames present
+    """
+    found: Dict[Path, set] = {}
+    stack = [(root, 0)]
+
+    while stack:
+        directory, depth = stack.pop()
+        manifests = set()
+        try:
+            with os.scandir(directory) as entries:
+                for entry in entries:
+                    if entry.name in MANIFEST_DETECTORS:
+                        if entry.is_file():
+                            manifests.add(entry.name)
+                    elif (depth < max_depth
+                          and not entry.name.startswith(".")
+                          and entry.name not in SKIP_DIRS
+                          and entry.is_dir(follow_symlinks=False)):
+                        stack.append((Path(entry.path), depth + 1))
+        except OSError:
+            continue
+
+        if manifests:
+            found[directory] = manifests
+
+    return found
+
+
 def _detect_from_package_json(cwd: Path) -> Optional[Dict[str, str]]:
     """Detect from package.json (Node.js/JavaScript)."""
-    package_json = cwd / "package.json"
-    if not package_json.exists():
+    data = load_json(cwd / "package.json")
+    if not isinstance(data, dict):
         return None
 
-    try:
-        with open(package_json) as f:
-            data = json.load(f)
-
-        name = data.get("name", cwd.name)
-        deps = {**data.get("dependencies", {}), **data.get("devDependencies", {})}
-
-        # Detect framework/stack
-        stack_parts = []
-
-        if "next" in deps:
-            stack_parts.append("Next.js")
-        elif "react" in deps:
-            stack_parts.append("React")
-        elif "vue" in deps:
-            stack_parts.append("Vue")
-        elif "angular" in deps:
-            stack_parts.append("Angular")
-        elif "svelte" in deps:
-            stack_parts.append("Svelte")
-        elif "express" in deps:
-            stack_parts.append("Express")
-        elif "fastify" in deps:
-            stack_parts.append("Fastify")
-
-        if "typescript" in deps:
-            stack_parts.append("TypeScript")
-
-        if "prisma" in deps:
-            stack_parts.append("Prisma")
-        elif "mongoose" in deps:
-            stack_parts.append("MongoDB")
-        elif "pg" in deps or "postgres" in deps:
-            stack_parts.append("PostgreSQL")
-
-        tech_stack = ", ".join(stack_parts) if stack_parts else "Node.js"
+    name = data.get("name", cwd.name)
+    deps = {**data.get("dependencies", {}), **data.get("devDependencies", {})}
+
+    # Detect framework/stack
+    stack_parts = []
+
+    if "next" in deps:
+        stack_parts.append("Next.js")
+    elif "react" in deps:
+        stack_parts.append("React")
+    elif "vue" in deps:
+        stack_parts.append("Vue")
+    elif "angular" in deps:
+        stack_parts.append("Angular")
+    elif "svelte" in deps:
+        stack_parts.append("Svelte")
+    elif "express" in deps:
+        stack_parts.append("Express")
+    elif "fastify" in deps:
+        stack_parts.append("Fastify")
+
+    if "typescript" in deps:
+        stack_parts.append("TypeScript")
+
+    if "prisma" in deps:
+        stack_parts.append("Prisma")
+    elif "mongoose" in deps:
+        stack_parts.append("MongoDB")
+    elif "pg" in deps or "postgres" in deps:
+        stack_parts.append("PostgreSQL")
+
+    tech_stack = ", ".join(stack_parts) if stack_parts else "Node.js"
+
+    return {
+        "name": name,
+        "tech_stack": tech_stack,
+        "detected_from": "package.json",
+    }
 
-        return {
-            "name": name,
-            "tech_stack": tech_stack,
-            "detected_from": "package.json",
-        }
-    except (json.JSONDecodeError, IOError):
-        return None
+
+def _requirement_name(requirement: str) -> str:
+    """Distribution name from a PEP 508 requirement ("fastapi[all]>=0.100")."""
+    return re.split(r"[\s\[<>=!~;@(]", requirement.strip(), maxsplit=1)[0].lower()
+
+
+def _pyproject_dependencies(data: Dict) -> set:
+    """Dependency names from PEP 621, dependency groups and Poetry tables."""
+    project = data.get("project", {})
+    requirements = list(project.get("dependencies", []))
+    for extra in project.get("optional-dependencies", {}).values():
+        requirements.extend(extra)
+    for group in data.get("dependency-groups", {}).values():
+        requirements.extend(item for item in group if isinstance(item, str))
+
+    names = {_requirement_name(req) for req in requirements if isinstance(req, str)}
+
+    poetry = data.get("tool", {}).get("poetry", {})
+    tables = [poetry.get("dependencies", {}), poetry.get("dev-dependencies", {})]
+    tables.extend(group.get("dependencies", {}) for group in poetry.get("group", {}).values())
+    for table in tables:
+        names.update(key.lower() for key in table)
+
+    names.discard("python")
+    return names
 
 
 def _detect_from_pyproject_toml(cwd: Path) -> Optional[Dict[str, str]]:
     """Detect from pyproject.toml (Python)."""
-    pyproject = cwd / "pyproject.toml"
-    if not pyproject.exists():
+    data = load_toml(cwd / "pyproject.toml")
+    if not isinstance(data, dict):
         return None
 
-    try:
-        content = pyproject.read_text()
-
-        # Extract name
-        name_match = re.search(r'name\s*=\s*["\']([^"\']+)["\']', content)
-        name = name_match.group(1) if name_match else cwd.name
+    # Name lives in [project] (PEP 621) or [tool.poetry]
+    name = (data.get("project", {}).get("name")
+            or data.get("tool", {}).get("poetry", {}).get("name")
+            or cwd.name)
+    deps = _pyproject_dependencies(data)
 
-        # Detect framework/stack
-        stack_parts = []
+    # Detect framework/stack
+    stack_parts = []
 
-        if "fastapi" in content.lower():
-            stack_parts.append("FastAPI")
-        elif "django" in content.lower():
-            stack_parts.append("Django")
-        elif "flask" in content.lower():
-            stack_parts.append("Flask")
+    if "fastapi" in deps:
+        stack_parts.append("FastAPI")
+    elif "django" in deps:
+        stack_parts.append("Django")
+    elif "flask" in deps:
+        stack_parts.append("Flask")
 
-        if "sqlalchemy" in content.lower():
-            stack_parts.append("SQLAlchemy")
-        if "pydantic" in content.lower():
-            stack_parts.append("Pydantic")
-        if "pytest" in content.lower():
-            stack_parts.append("Pytest")
+    if "sqlalchemy" in deps:
+        stack_parts.append("SQLAlchemy")
+    if "pydantic" in deps:
+        stack_parts.append("Pydantic")
+    if "pytest" in deps:
+        stack_parts.append("Pytest")
 
-        tech_stack = ", ".join(stack_parts) if stack_parts else "Python"
+    tech_stack = ", ".join(stack_parts) if stack_parts else "Python"
 
-        return {
-            "name": name,
-            "tech_stack": tech_stack,
-            "detected_from": "pyproject.toml",
-        }
-    except IOError:
-        return None
+    return {
+        "name": name,
+        "tech_stack": tech_stack,
+        "detected_from": "pyproject.toml",
+    }
 
 
 def _detect_from_go_mod(cwd: Path) -> Optional[Dict[str, str]]:
     """Detect from go.mod (Go)."""
-    go_mod = cwd / "go.mod"
-    if not go_mod.exists():
+    content = load_text(cwd / "go.mod")
+    if content is None:
         return None
 
-    try:
-        content = go_mod.read_text()
+    # Extract module name
+    module_match = re.search(r'module\s+([^\s]+)', content)
+    name = module_match.group(1).split("/")[-1] if module_match else cwd.name
 
-        # Extract module name
-        module_match = re.search(r'module\s+([^\s]+)', content)
-        name = module_match.group(1).split("/")[-1] if module_match else cwd.name
+    # Detect framework/stack
+    stack_parts = ["Go"]
 
-        # Detect framework/stack
-        stack_parts = ["Go"]
+    if "gin-gonic/gin" in content:
+        stack_parts.append("Gin")
+    elif "gorilla/mux" in content:
+        stack_parts.append("Gorilla Mux")
+    elif "fiber" in content:
+        stack_parts.append("Fiber")
 
-        if "gin-gonic/gin" in content:
-            stack_parts.append("Gin")
-        elif "gorilla/mux" in content:
-            stack_parts.append("Gorilla Mux")
-        elif "fiber" in content:
-            stack_parts.append("Fiber")
+    if "gorm" in content:
+        stack_parts.append("GORM")
 
-        if "gorm" in content:
-            stack_parts.append("GORM")
+    tech_stack = ", ".join(stack_parts)
 
-        tech_stack = ", ".join(stack_parts)
+    return {
+        "name": name,
+        "tech_stack": tech_stack,
+        "detected_from": "go.mod",
+    }
 
-        return {
-            "name": name,
-            "tech_stack": tech_stack,
-            "detected_from": "go.mod",
-        }
-    except IOError:
-        return None
+
+def _cargo_dependencies(data: Dict) -> set:
+    """Crate names from [dependencies], [dev-dependencies] and [workspace.dependencies]."""
+    tables: List[Dict] = [
+        data.get("dependencies", {}),
+        data.get("dev-dependencies", {}),
+        data.get("workspace", {}).get("dependencies", {}),
+    ]
+    # Platform-specific tables: [target.'cfg(...)'.dependencies]
+    tables.extend(target.get("dependencies", {}) for target in data.get("target", {}).values())
+    return {key for table in tables for key in table}
 
 
 def _detect_from_cargo_toml(cwd: Path) -> Optional[Dict[str, str]]:
     """Detect from Cargo.toml (Rust)."""
-    cargo_toml = cwd / "Cargo.toml"
-    if not cargo_toml.exists():
+    data = load_toml(cwd / "Cargo.toml")
+    if not isinstance(data, dict):
         return None
 
-    try:
-        content = cargo_toml.read_text()
+    # Workspace roots have no [package]
+    name = data.get("package", {}).get("name") or cwd.name
+    deps = _cargo_dependencies(data)
 
-        # Extract name
-        name_match = re.search(r'name\s*=\s*["\']([^"\']+)["\']', content)
-        name = name_match.group(1) if name_match else cwd.name
+    # Detect framework/stack
+    stack_parts = ["Rust"]
 
-        # Detect framework/stack
-        stack_parts = ["Rust"]
+    if "actix-web" in deps:
+        stack_parts.append("Actix Web")
+    elif "rocket" in deps:
+        stack_parts.append("Rocket")
+    elif "axum" in deps:
+        stack_parts.append("Axum")
 
-        if "actix-web" in content:
-            stack_parts.append("Actix Web")
-        elif "rocket" in content:
-            stack_parts.append("Rocket")
-        elif "axum" in content:
-            stack_parts.append("Axum")
+    if "diesel" in deps:
+        stack_parts.append("Diesel")
+    elif "sqlx" in deps:
+        stack_parts.append("SQLx")
 
-        if "diesel" in content:
-            stack_parts.append("Diesel")
-        elif "sqlx" in content:
-            stack_parts.append("SQLx")
+    tech_stack = ", ".join(stack_parts)
 
-        tech_stack = ", ".join(stack_parts)
-
-        return {
-            "name": name,
-            "tech_stack": tech_stack,
-            "detected_from": "Cargo.toml",
-        }
-    except IOError:
-        return None
+    return {
+        "name": name,
+        "tech_stack": tech_stack,
+        "detected_from": "Cargo.toml",
+    }
 
 
 def _detect_from_composer_json(cwd: Path) -> Optional[Dict[str, str]]:
     """Detect from composer.json (PHP)."""
-    composer_json = cwd / "composer.json"
-    if not composer_json.exists():
+    data = load_json(cwd / "composer.json")
+    if not isinstance(data, dict):
         return None
 
-    try:
-        with open(composer_json) as f:
-            data = json.load(f)
-
-        name = data.get("name", cwd.name).split("/")[-1]
-        deps = {**data.get("require", {}), **data.get("require-dev", {})}
+    name = data.get("name", cwd.name).split("/")[-1]
+    deps = {**data.get("require", {}), **data.get("require-dev", {})}
 
-        # Detect framework/stack
-        stack_parts = []
+    # Detect framework/stack
+    stack_parts = []
 
-        if any("laravel" in dep for dep in deps):
-            stack_parts.append("Laravel")
-        elif any("symfony" in dep for dep in deps):
-            stack_parts.append("Symfony")
+    if any("laravel" in dep for dep in deps):
+        stack_parts.append("Laravel")
+    elif any("symfony" in dep for dep in deps):
+        stack_parts.append("Symfony")
 
-        tech_stack = ", ".join(stack_parts) if stack_parts else "PHP"
+    tech_stack = ", ".join(stack_parts) if stack_parts else "PHP"
 
-        return {
-            "name": name,
-            "tech_stack": tech_stack,
-            "detected_from": "composer.json",
-        }
-    except (json.JSONDecodeError, IOError):
-        return None
+    return {
+        "name": name,
+        "tech_stack": tech_stack,
+        "detected_from": "composer.json",
+    }
 
 
 def _detect_from_gemfile(cwd: Path) -> Optional[Dict[str, str]]:
     """Detect from Gemfile (Ruby)."""
-    gemfile = cwd / "Gemfile"
-    if not gemfile.exists():
+    content = load_text(cwd / "Gemfile")
+    if content is None:
         return None
 
-    try:
-        content = gemfile.read_text()
+    name = cwd.name
 
-        name = cwd.name
+    # Detect framework/stack
+    stack_parts = []
 
-        # Detect framework/stack
-        stack_parts = []
+    if "rails" in content.lower():
+        stack_parts.append("Ruby on Rails")
+    elif "sinatra" in content.lower():
+        stack_parts.append("Sinatra")
+    else:
+        stack_parts.append("Ruby")
 
-        if "rails" in content.lower():
-            stack_parts.append("Ruby on Rails")
-        elif "sinatra" in content.lower():
-            stack_parts.append("Sinatra")
-        else:
-            stack_parts.append("Ruby")
+    tech_stack = ", ".join(stack_parts)
 
-        tech_stack = ", ".join(stack_parts)
+    return {
+        "name": name,
+        "tech_stack": tech_stack,
+        "detected_from": "Gemfile",
+    }
 
-        return {
-            "name": name,
-            "tech_stack": tech_stack,
-            "detected_from": "Gemfile",
-        }
-    except IOError:
-        return None
+
+# Manifest filename -> detector, in precedence order
+MANIFEST_DETECTORS = {
+    "package.json": _detect_from_package_json,
+    "pyproject.toml": _detect_from_pyproject_toml,
+    "go.mod": _detect_from_go_mod,
+    "Cargo.toml": _detect_from_cargo_toml,
+    "composer.json": _detect_from_composer_json,
+    "Gemfile": _detect_from_gemfile,
+}
 
 
 if __name__ == "__main__":
-    # Test detection
-    info = detect_project_info()
+    # Test detection (--all: every package in a monorepo)
+    if "--all" in sys.argv[1:]:
+        info = detect_projects()
+    else:
+        info = detect_project_info()
     print(json.dumps(info, indent=2))
@@ -1,100 +1,539 @@
 #!/usr/bin/env python3
 """
 Compress conversation context into a concise marker summary.
+
+Input is consumed as a stream of lines: priority items (code blocks, file
+paths, errors) are collected over the whole conversation into bounded,
+deduplicated candidate pools, so memory stays flat no matter how long the
+transcript is. When reading from a file, the recent-context window is
+taken from the end of the file with a reverse line iterator.
+
+Candidates are scored by recency, repetition and error severity, then a
+knapsack packer picks the highest-value set that fits max_length, instead
+of keeping the first N of each kind and cutting the text off.
+
+Per-section token estimates for a finished marker are written next to it
+(<marker>.tokens.json) so nav-start can load a marker within a token
+budget without measuring it first.
 """
 
+import io
+import os
+import re
 import sys
+import json
+import math
+import hashlib
 import argparse
+from collections import OrderedDict, deque
 from datetime import datetime
 
-def compress_context(context_text, max_length=5000):
+# Candidate pool sizes per kind (lowest-scoring items are evicted)
+MAX_CANDIDATES = {
+    'file_path': 40,
+    'code_block': 12,
+    'error': 30,
+}
+MAX_CODE_BLOCK_LINES = 80
+RECENT_LINES = 20
+
+FILE_EXTENSIONS = ('.md', '.py', '.json', '.sh')
+
+# Relevance scoring
+KIND_WEIGHTS = {
+    'recent': 3.0,
+    'error': 2.0,
+    'code_block': 1.5,
+    'file_path': 1.0,
+}
+RECENCY_HALF_LIFE = 400  # Lines until an item's recency weight halves
+ERROR_SEVERITY = (
+    (('traceback', 'exception', 'fatal', 'panic', 'segmentation fault'), 3.0),
+    (('error',), 2.0),
+    (('failed', 'failure'), 1.5),
+)
+ERROR_PATTERN = re.compile(
+    '|'.join(re.escape(keyword) for keywords, _ in ERROR_SEVERITY for keyword in keywords),
+    re.IGNORECASE,
+)
+
+# Knapsack cost granularity in chars (keeps the DP table small)
+KNAPSACK_UNIT = 8
+
+SECTION_TITLES = OrderedDict([
+    ('file_path', "**Files Modified**:\n"),
+    ('code_block', "**Code Snippets**:\n```\n"),
+    ('error', "**Errors/Issues**:\n"),
+    ('recent', "**Recent Context**:\n"),
+])
+SECTION_SEPARATOR = '\n\n---\n\n'
+
+# Marker section headings: "## Title" (marker template) or a line that is
+# only "**Title**:" (compressor output)
+SECTION_HEADING = re.compile(r'^(?:## (?P<heading>.+?)|\*\*(?P<label>[^*]+)\*\*:)\s*$')
+CHARS_PER_TOKEN = 4
+ITEM_SEPARATORS = {'code_block': '\n\n'}
+CODE_FENCE_CLOSE = "\n```"
+
+
+def content_hash(text):
+    """Short digest used to deduplicate items."""
+    return hashlib.blake2b(text.encode('utf-8', errors='replace'), digest_size=8).digest()
+
+
+def normalize(kind, text):
+    """Key text so near-identical items collapse into one candidate."""
+    text = ' '.join(text.split())
+    if kind == 'error':
+        # Same error with different line numbers/ids is still the same error
+        text = re.sub(r'\d+', 'N', text.lower())
+    return text
+
+
+def error_severity(text):
+    """Severity multiplier for an error line (0 if it isn't one)."""
+    if not ERROR_PATTERN.search(text):
+        return 0.0
+    lowered = text.lower()
+    for keywords, weight in ERROR_SEVERITY:
+        if any(keyword in lowered for keyword in keywords):
+            return weight
+    return 0.0
+
+
+class Candidate:
+    """Deduplicated item with the statistics needed for scoring."""
+
+    __slots__ = ('kind', 'text', 'count', 'last_seen', 'severity')
+
+    def __init__(self, kind, text, position, severity=1.0):
+        self.kind = kind
+        self.text = text
+        self.count = 1
+        self.last_seen = position
+        self.severity = severity
+
+    def score(self, position):
+        """
+        Relevance at stream position: kind weight x severity, decayed by
+        distance from the end, boosted (logarithmically) by repetition.
+        """
+        recency = 0.5 ** ((position - self.last_seen) / RECENCY_HALF_LIFE)
+        frequency = 1.0 + math.log2(self.count)
+        return KIND_WEIGHTS[self.kind] * self.severity * recency * frequency
+
+
+class CandidatePool:
+    """Bounded per-kind pools of deduplicated candidates."""
+
+    def __init__(self, limits=None):
+        self.limits = limits or MAX_CANDIDATES
+        self.pools = {kind: {} for kind in self.limits}
+
+    def add(self, kind, text, position, severity=1.0):
+        pool = self.pools[kind]
+        key = content_hash(normalize(kind, text))
+        candidate = pool.get(key)
+
+        if candidate:
+            candidate.count += 1
+            candidate.last_seen = position
+            candidate.text = text  # Keep the latest wording
+            return
+
+        pool[key] = Candidate(kind, text, position, severity)
+        # Let the pool overshoot to 2x, then prune back in one sort, so
+        # eviction cost is amortized instead of paid on every insert
+        if len(pool) > 2 * self.limits[kind]:
+            ranked = sorted(pool, key=lambda k: pool[k].score(position), reverse=True)
+            for weakest in ranked[self.limits[kind]:]:
+                del pool[weakest]
+
+    def candidates(self, position):
+        """Surviving candidates, at most the configured limit per kind."""
+        for kind, pool in self.pools.items():
+            ranked = sorted(pool.values(), key=lambda c: c.score(position), reverse=True)
+            yield from ranked[:self.limits[kind]]
+
+
+def iter_lines(source):
     """
-    Compress conversation context while preserving key information.
+    Yield lines without trailing newlines from a string or file object.
+
+    Strings are wrapped in StringIO so they are walked lazily instead of
+    being split into one large list.
+    """
+    if isinstance(source, str):
+        source = io.StringIO(source)
+    for line in source:
+        yield line.rstrip('\r\n')
+
+
+def read_lines_reverse(path, block_size=65536):
+    """
+    Yield lines of a file from last to first, reading fixed-size blocks
+    from the end so only the tail that is consumed is ever read.
 
     Args:
-        context_text: Full conversation context
-        max_length: Maximum compressed length (default: 5000 chars)
+        path: File to read
+        block_size: Bytes read per seek
 
-    Returns:
-        str: Compressed summary
+    Yields:
+        str: Lines without newline, last line first
     """
-    # In a real implementation, this would use AI summarization
-    # For now, we'll use simple truncation with smart extraction
+    with open(path, 'rb') as f:
+        f.seek(0, os.SEEK_END)
+        position = f.tell()
+        remainder = b''
+        first_block = True
+
+        while position > 0:
+            read_size = min(block_size, position)
+            position -= read_size
+            f.seek(position)
+            block = f.read(read_size) + remainder
+            lines = block.split(b'\n')
+            # First element may be a partial line; carry it to the next block
+            remainder = lines.pop(0)
+
+            if first_block:
+                first_block = False
+                if lines and lines[-1] == b'':
+                    lines.pop()  # Trailing newline at end of file
+
+            for line in reversed(lines):
+                yield line.decode('utf-8', errors='replace').rstrip('\r')
+
+        if remainder or not first_block:
+            yield remainder.decode('utf-8', errors='replace').rstrip('\r')
 
-    # Extract key sections (simplified for v2.0)
-    lines = context_text.split('\n')
 
-    # Priority extraction:
-    # 1. Code blocks
-    # 2. File paths mentioned
-    # 3. Error messages
-    # 4. Task descriptions
-    # 5. Recent conversation
+def tail_lines(path, count=RECENT_LINES):
+    """Last `count` lines of a file, in original order."""
+    lines = []
+    for line in read_lines_reverse(path):
+        if len(lines) >= count:
+            break
+        lines.append(line)
+    lines.reverse()
+    return lines
 
-    code_blocks = []
-    file_paths = []
-    errors = []
-    recent_context = []
+
+def extract_priority_items(lines, recent_lines=RECENT_LINES):
+    """
+    Single pass over the conversation collecting deduplicated, scored
+    candidates into bounded pools.
+
+    Args:
+        lines: Iterable of lines (consumed lazily)
+        recent_lines: Size of trailing window to keep (0 to skip)
+
+    Returns:
+        dict: candidates (list of Candidate), recent (list of str),
+              position (total lines seen)
+    """
+    pool = CandidatePool()
+    recent = deque(maxlen=recent_lines)
 
     in_code_block = False
     code_buffer = []
+    position = 0
+
+    for position, line in enumerate(lines, 1):
+        stripped = line.strip()
 
-    for line in lines[-200:]:  # Focus on recent 200 lines
         # Extract code blocks
-        if line.strip().startswith('```'):
-            if in_code_block:
-                code_blocks.append('\n'.join(code_buffer))
-                code_buffer = []
+        if stripped.startswith('```'):
+            if in_code_block and code_buffer:
+                pool.add('code_block', '\n'.join(code_buffer), position)
+            code_buffer = []
             in_code_block = not in_code_block
         elif in_code_block:
-            code_buffer.append(line)
+            # Cap a single block so one huge paste can't grow the buffer
+            if len(code_buffer) < MAX_CODE_BLOCK_LINES:
+                code_buffer.append(line)
 
         # Extract file paths
-        if '.md' in line or '.py' in line or '.json' in line or '.sh' in line:
-            file_paths.append(line.strip())
+        if any(ext in line for ext in FILE_EXTENSIONS):
+            pool.add('file_path', stripped, position)
 
         # Extract errors
-        if 'error' in line.lower() or 'failed' in line.lower():
-            errors.append(line.strip())
+        severity = error_severity(line)
+        if severity:
+            pool.add('error', stripped, position, severity)
+
+        if recent_lines:
+            recent.append(line)
+
+    return {
+        'candidates': list(pool.candidates(position)),
+        'recent': list(recent),
+        'position': position,
+    }
+
+
+def section_overhead():
+    """Chars used by headers, separators and fences if every section is present."""
+    return (sum(len(title) for title in SECTION_TITLES.values())
+            + len(CODE_FENCE_CLOSE)
+            + len(SECTION_SEPARATOR) * (len(SECTION_TITLES) - 1))
+
+
+def pack_items(groups, budget):
+    """
+    Multiple-choice 0/1 knapsack: pick at most one option per group so the
+    total score is maximal and the combined length fits the budget.
+
+    A single item is a group with one option; alternatives that exclude
+    each other (e.g. different lengths of the recent-context tail) share
+    a group.
+
+    Args:
+        groups: List of groups, each a list of (score, cost_chars, payload)
+        budget: Available chars
+
+    Returns:
+        list: Selected payloads
+    """
+    capacity = max(budget, 0) // KNAPSACK_UNIT
+    best = [0.0] * (capacity + 1)
+    choices = []
+
+    for group in groups:
+        options = [(score, -(-cost // KNAPSACK_UNIT)) for score, cost, _ in group]  # ceil
+        previous = best[:]
+        chosen = bytearray(capacity + 1)  # 0 = skip group, i + 1 = option i
+        for c in range(capacity + 1):
+            for index, (score, cost) in enumerate(options):
+                if cost <= c and previous[c - cost] + score > best[c]:
+                    best[c] = previous[c - cost] + score
+                    chosen[c] = index + 1
+        choices.append(chosen)
+
+    selected = []
+    c = capacity
+    for group, chosen in zip(reversed(groups), reversed(choices)):
+        if chosen[c]:
+            _, cost, payload = group[chosen[c] - 1]
+            selected.append(payload)
+            c -= -(-cost // KNAPSACK_UNIT)
+    return selected
+
+
+def rank_and_pack(extracted, max_length):
+    """
+    Score every candidate and the recent-context tail, then pack the most
+    relevant set into max_length.
+
+    Returns:
+        dict: kind -> list of texts in conversation order
+    """
+    position = extracted['position']
+    groups = []
+
+    for candidate in extracted['candidates']:
+        separator = ITEM_SEPARATORS.get(candidate.kind, '\n')
+        cost = len(candidate.text) + len(separator)
+        payload = [(candidate.kind, candidate.last_seen, candidate.text)]
+        groups.append([(candidate.score(position), cost, payload)])
 
-        # Keep recent context
-        if len(recent_context) < 50:
-            recent_context.append(line)
+    # Recent context must stay contiguous, so its options are tails of
+    # increasing length; later lines are worth more
+    recent = extracted['recent']
+    tail_options = []
+    score = cost = 0
+    payload = []
+    for distance, line in enumerate(reversed(recent)):
+        score += KIND_WEIGHTS['recent'] * 0.5 ** (distance / RECENT_LINES)
+        cost += len(line) + 1
+        payload = [('recent', position - distance, line)] + payload
+        tail_options.append((score, cost, payload))
+    if tail_options:
+        groups.append(tail_options)
 
-    # Build compressed summary
+    selected = pack_items(groups, max_length - section_overhead())
+
+    sections = {kind: [] for kind in SECTION_TITLES}
+    chosen = [item for payload in selected for item in payload]
+    for kind, seen, text in sorted(chosen, key=lambda item: item[1]):
+        sections[kind].append(text)
+    return sections
+
+
+def format_summary(sections, max_length=5000):
+    """Build the marker summary from packed sections."""
     summary_parts = []
 
-    if file_paths:
-        summary_parts.append("**Files Modified**:\n" + '\n'.join(set(file_paths[:10])))
+    if sections['file_path']:
+        summary_parts.append(SECTION_TITLES['file_path'] + '\n'.join(sections['file_path']))
 
-    if code_blocks:
-        summary_parts.append("**Code Snippets**:\n```\n" + '\n\n'.join(code_blocks[:3]) + "\n```")
+    if sections['code_block']:
+        summary_parts.append(SECTION_TITLES['code_block'] + '\n\n'.join(sections['code_block']) + CODE_FENCE_CLOSE)
 
-    if errors:
-        summary_parts.append("**Errors/Issues**:\n" + '\n'.join(set(errors[:5])))
+    if sections['error']:
+        summary_parts.append(SECTION_TITLES['error'] + '\n'.join(sections['error']))
 
-    summary_parts.append("**Recent Context**:\n" + '\n'.join(recent_context[-20:]))
+    summary_parts.append(SECTION_TITLES['recent'] + '\n'.join(sections['recent']))
 
-    compressed = '\n\n---\n\n'.join(summary_parts)
+    compressed = SECTION_SEPARATOR.join(summary_parts)
 
-    # Ensure within max_length
+    # Packing already respects max_length; this only guards tiny budgets
     if len(compressed) > max_length:
         compressed = compressed[:max_length] + "\n\n[... truncated ...]"
 
     return compressed
 
+
+def compress_stream(lines, max_length=5000):
+    """
+    Compress a stream of conversation lines.
+
+    Args:
+        lines: Iterable of lines (file object, generator, ...)
+        max_length: Maximum compressed length (default: 5000 chars)
+
+    Returns:
+        str: Compressed summary
+    """
+    extracted = extract_priority_items(lines)
+    return format_summary(rank_and_pack(extracted, max_length), max_length)
+
+
+def compress_file(path, max_length=5000):
+    """
+    Compress a conversation file.
+
+    Priority items are streamed forward over the whole file; the recent
+    window is read backwards from the end of the file.
+
+    Args:
+        path: Conversation file
+        max_length: Maximum compressed length (default: 5000 chars)
+
+    Returns:
+        str: Compressed summary
+    """
+    with open(path, 'r', errors='replace') as f:
+        extracted = extract_priority_items(iter_lines(f), recent_lines=0)
+    extracted['recent'] = tail_lines(path, RECENT_LINES)
+    return format_summary(rank_and_pack(extracted, max_length), max_length)
+
+
+def compress_context(context_text, max_length=5000):
+    """
+    Compress conversation context while preserving key information.
+
+    Args:
+        context_text: Full conversation context
+        max_length: Maximum compressed length (default: 5000 chars)
+
+    Returns:
+        str: Compressed summary
+    """
+    # In a real implementation, this would use AI summarization
+    # For now, we'll use smart extraction over the streamed input
+    return compress_stream(iter_lines(context_text), max_length)
+
+
+def estimate_tokens(text):
+    """Rough token count (~4 chars per token)."""
+    return -(-len(text) // CHARS_PER_TOKEN)
+
+
+def section_estimates(content):
+    """
+    Split a marker into sections and estimate each one's token cost.
+
+    Text before the first heading is the "Header" section. Headings inside
+    code fences are ignored.
+
+    Args:
+        content: Marker markdown
+
+    Returns:
+        list: Dicts with title, start, end (char offsets), tokens
+    """
+    boundaries = [(0, 'Header')]
+    offset = 0
+    in_fence = False
+
+    for line in content.splitlines(keepends=True):
+        stripped = line.strip()
+        if stripped.startswith('```'):
+            in_fence = not in_fence
+        elif not in_fence:
+            match = SECTION_HEADING.match(line.rstrip('\r\n'))
+            if match:
+                title = (match.group('heading') or match.group('label')).strip()
+                if offset == 0:
+                    boundaries[0] = (0, title)
+                else:
+                    boundaries.append((offset, title))
+        offset += len(line)
+
+    sections = []
+    for index, (start, title) in enumerate(boundaries):
+        end = boundaries[index + 1][0] if index + 1 < len(boundaries) else len(content)
+        sections.append({
+            'title': title,
+            'start': start,
+            'end': end,
+            'tokens': estimate_tokens(content[start:end]),
+        })
+    return sections
+
+
+def estimates_path(marker_path):
+    """Sidecar file holding a marker's section estimates."""
+    marker_path = str(marker_path)
+    base = marker_path[:-3] if marker_path.endswith('.md') else marker_path
+    return base + '.tokens.json'
+
+
+def write_estimates(marker_path, content=None):
+    """
+    Write <marker>.tokens.json next to a marker.
+
+    Args:
+        marker_path: Marker .md file
+        content: Marker text (read from marker_path if omitted)
+
+    Returns:
+        dict: Estimates that were written
+    """
+    if content is None:
+        with open(marker_path, 'r') as f:
+            content = f.read()
+
+    sections = section_estimates(content)
+    estimates = {
+        'size': len(content),
+        'tokens': sum(section['tokens'] for section in sections),
+        'sections': sections,
+    }
+    with open(estimates_path(marker_path), 'w') as f:
+        json.dump(estimates, f, indent=2)
+        f.write('\n')
+    return estimates
+
+
 if __name__ == "__main__":
     parser = argparse.ArgumentParser(description="Compress conversation context for markers")
     parser.add_argument("--input", help="Input file (default: stdin)")
     parser.add_argument("--max-length", type=int, default=5000, help="Max compressed length")
+    parser.add_argument("--estimate", metavar="MARKER",
+                        help="Write per-section token estimates for a marker file and exit")
 
     args = parser.parse_args()
 
+    if args.estimate:
+        estimates = write_estimates(args.estimate)
+        print(f"{estimates_path(args.estimate)}: ~{estimates['tokens']} tokens in {len(estimates['sections'])} sections")
+        sys.exit(0)
+
     if args.input:
-        with open(args.input, 'r') as f:
-            context = f.read()
+        compressed = compress_file(args.input, args.max_length)
     else:
-        context = sys.stdin.read()
+        compressed = compress_stream(iter_lines(sys.stdin), args.max_length)
 
-    compressed = compress_context(context, args.max_length)
     print(compressed)
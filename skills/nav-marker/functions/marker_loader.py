@@ -0,0 +1,187 @@
+#!/usr/bin/env python3
+"""
+Load a context marker within a token budget.
+
+Sections are taken in priority order - summary first, then code snippets,
+then errors, then everything else - until the budget is used up. Costs
+come from the <marker>.tokens.json estimates written by marker_compressor,
+so nothing has to be measured at session start. Selected sections are
+printed in their original order, followed by a note listing what was
+left out.
+
+Usage:
+    python3 marker_loader.py .agent/.context-markers/2025-10-16-1430_auth.md --budget 4000
+    python3 marker_loader.py 2025-10-16-1430_auth --budget 4000   # body compacted into store
+"""
+
+import sys
+import json
+import argparse
+from pathlib import Path
+
+from marker_compressor import estimate_tokens, estimates_path, section_estimates
+from marker_store import MARKERS_DIR, load_marker, marker_name
+
+DEFAULT_BUDGET = 6000
+
+# Lower tier loads first; sections not listed load last
+SECTION_TIERS = (
+    ('summary', ('header', 'context marker', 'conversation summary', 'current focus',
+                 'next steps', 'technical decisions', 'files modified', 'recent context')),
+    ('code', ('code snippets', 'code')),
+    ('errors', ('errors/issues', 'errors', 'issues')),
+)
+OTHER_TIER = len(SECTION_TIERS)
+
+
+def section_tier(title):
+    """Loading tier for a section title."""
+    lowered = title.lower()
+    for tier, (_, titles) in enumerate(SECTION_TIERS):
+        if any(lowered.startswith(prefix) for prefix in titles):
+            return tier
+    return OTHER_TIER
+
+
+def read_marker(marker, markers_dir=MARKERS_DIR):
+    """
+    Marker text and the path its estimates live next to.
+
+    Args:
+        marker: Marker file path or name (stored markers are rebuilt)
+
+    Returns:
+        tuple: (content, marker_path)
+    """
+    path = Path(marker)
+    if path.suffix == '.md' and path.exists():
+        return path.read_text(), path
+
+    name = marker_name(marker)
+    return load_marker(name, markers_dir), Path(markers_dir) / f"{name}.md"
+
+
+def load_estimates(marker_path, content):
+    """Stored section estimates, recomputed if missing or stale."""
+    try:
+        with open(estimates_path(marker_path), 'r') as f:
+            estimates = json.load(f)
+        if estimates.get('size') == len(content):
+            return estimates['sections']
+    except (OSError, json.JSONDecodeError):
+        pass
+    return section_estimates(content)
+
+
+def select_sections(sections, budget):
+    """
+    Take sections tier by tier until the budget runs out.
+
+    The first section that doesn't fit is cut at a line boundary so the
+    budget is used fully; loading stops there.
+
+    Args:
+        sections: Section estimates (title, start, end, tokens)
+        budget: Token budget
+
+    Returns:
+        tuple: (selected list of (section, partial token allowance or None),
+               skipped sections)
+    """
+    ordered = sorted(sections, key=lambda section: (section_tier(section['title']), section['start']))
+    selected = []
+    skipped = []
+    remaining = budget
+    exhausted = False
+
+    for section in ordered:
+        if exhausted:
+            skipped.append(section)
+        elif section['tokens'] <= remaining:
+            selected.append((section, None))
+            remaining -= section['tokens']
+        else:
+            exhausted = True
+            skipped.append(section)
+            if remaining > 0:
+                selected.append((section, remaining))
+
+    return selected, skipped
+
+
+def render(content, selected, skipped):
+    """Selected sections in document order, plus an omission note."""
+    parts = []
+    omitted = []
+
+    for section, partial_tokens in sorted(selected, key=lambda item: item[0]['start']):
+        text = content[section['start']:section['end']]
+        if partial_tokens is None:
+            parts.append(text)
+            continue
+
+        kept = []
+        used = 0
+        for line in text.splitlines(keepends=True):
+            cost = estimate_tokens(line)
+            if used + cost > partial_tokens:
+                break
+            kept.append(line)
+            used += cost
+        if kept:
+            partial = ''.join(kept).rstrip('\n')
+            if sum(1 for line in kept if line.strip().startswith('```')) % 2:
+                partial += '\n```'  # Don't leave a code fence open
+            parts.append(partial + f"\n\n[... {section['tokens'] - used} more tokens omitted ...]\n\n")
+
+    for section in sorted(skipped, key=lambda section: section['start']):
+        if not any(section is chosen for chosen, _ in selected):
+            omitted.append(f"{section['title']} (~{section['tokens']} tokens)")
+
+    output = ''.join(parts).rstrip('\n') + '\n'
+    if omitted:
+        output += "\n---\n\n**Not loaded (token budget)**: " + ', '.join(omitted) + '\n'
+    return output
+
+
+def load_with_budget(marker, budget=DEFAULT_BUDGET, markers_dir=MARKERS_DIR):
+    """
+    Marker text trimmed to a token budget.
+
+    Args:
+        marker: Marker file path or name
+        budget: Token budget
+        markers_dir: Markers directory
+
+    Returns:
+        tuple: (text, tokens_used)
+    """
+    content, marker_path = read_marker(marker, markers_dir)
+    sections = load_estimates(marker_path, content)
+    selected, skipped = select_sections(sections, budget)
+    used = sum(section['tokens'] if partial is None else partial for section, partial in selected)
+    return render(content, selected, skipped), min(used, budget)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load a context marker within a token budget")
+    parser.add_argument("marker", help="Marker file or name")
+    parser.add_argument("--budget", type=int, default=DEFAULT_BUDGET,
+                        help=f"Token budget (default: {DEFAULT_BUDGET})")
+    parser.add_argument("--markers-dir", default=str(MARKERS_DIR), help="Markers directory")
+
+    args = parser.parse_args()
+
+    try:
+        text, used = load_with_budget(args.marker, args.budget, Path(args.markers_dir))
+    except FileNotFoundError as e:
+        print(f"❌ {e}", file=sys.stderr)
+        return 1
+
+    sys.stdout.write(text)
+    print(f"Loaded ~{used:,} of {args.budget:,} token budget", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
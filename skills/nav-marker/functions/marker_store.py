@@ -0,0 +1,541 @@
+#!/usr/bin/env python3
+"""
+Content-addressed store for context markers.
+
+Consecutive markers in a session repeat most of their content (same files,
+same decisions, a few new lines of progress). Instead of keeping every
+marker as a full snapshot, markers are split into chunks at their "## "
+sections, each chunk is stored once under its hash, and a small manifest
+records the chunk list plus the delta against the previous marker.
+
+Layout (under .agent/.context-markers/.store/):
+    chunks/ab/ab12...     Chunk text, named by content hash
+    manifests/<name>.json Chunk list, base marker, added/removed chunks
+
+The index (.agent/.context-markers/.index.json) is rewritten on every
+store and holds one small entry per marker - timestamp, task id, size,
+topics and chunk hashes - so the right marker can be picked and loaded
+without opening any marker body or manifest.
+
+Markers are reconstructed lazily, one chunk at a time, and only when
+the .md body is no longer on disk.
+
+Usage:
+    python3 marker_store.py store .agent/.context-markers/2025-10-16-1430_auth.md
+    python3 marker_store.py load 2025-10-16-1430_auth
+    python3 marker_store.py load 2025-10-16-1430_auth --changed-since 2025-10-16-1200_start
+    python3 marker_store.py compact --keep 3
+    python3 marker_store.py list
+    python3 marker_store.py find --task TASK-12   # newest matching marker name
+"""
+
+import os
+import re
+import sys
+import json
+import hashlib
+import argparse
+import tempfile
+from collections import Counter
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+
+try:
+    import fcntl
+except ImportError:
+    # No advisory locking on this platform - writes are still atomic
+    fcntl = None
+
+from marker_compressor import write_estimates
+
+MARKERS_DIR = Path('.agent') / '.context-markers'
+STORE_DIRNAME = '.store'
+
+INDEX_FILENAME = '.index.json'
+INDEX_VERSION = 1
+
+# Sections longer than this are split further at blank lines
+CHUNK_MAX_CHARS = 2000
+
+TASK_ID_PATTERN = re.compile(r'\b[A-Z][A-Z0-9]*-\d+\b')
+TOPIC_WORD_PATTERN = re.compile(r'[a-z][a-z0-9_]{3,}')
+MAX_TOPICS = 8
+# Marker boilerplate that would otherwise top every topic list
+TOPIC_STOPWORDS = frozenset({
+    'marker', 'context', 'created', 'note', 'provided', 'before', 'after',
+    'compact', 'auto', 'with', 'from', 'that', 'this', 'into', 'need',
+    'feature', 'phase', 'blockers', 'none', 'working', 'current', 'focus',
+    'task',
+})
+
+
+def store_dir(markers_dir=MARKERS_DIR):
+    return Path(markers_dir) / STORE_DIRNAME
+
+
+def chunk_hash(text):
+    """Content address of a chunk."""
+    return hashlib.blake2b(text.encode('utf-8'), digest_size=16).hexdigest()
+
+
+def chunk_path(digest, markers_dir=MARKERS_DIR):
+    return store_dir(markers_dir) / 'chunks' / digest[:2] / digest
+
+
+def manifest_path(name, markers_dir=MARKERS_DIR):
+    return store_dir(markers_dir) / 'manifests' / f"{name}.json"
+
+
+def marker_name(path_or_name):
+    """Marker name without directory or .md suffix."""
+    name = Path(path_or_name).name
+    return name[:-3] if name.endswith('.md') else name
+
+
+def _write_atomic(path, text):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=path.parent, prefix='.tmp-')
+    try:
+        with os.fdopen(fd, 'w') as f:
+            f.write(text)
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+        raise
+
+
+def _split_long(section):
+    """Split an oversized section at blank lines, keeping pieces in order."""
+    if len(section) <= CHUNK_MAX_CHARS:
+        return [section]
+
+    # Each paragraph keeps the separator after it, so pieces join back exactly
+    parts = re.split(r'(\n\n)', section)
+    paragraphs = [''.join(parts[i:i + 2]) for i in range(0, len(parts), 2)]
+
+    pieces = []
+    current = ''
+    for paragraph in paragraphs:
+        if current and len(current) + len(paragraph) > CHUNK_MAX_CHARS:
+            pieces.append(current)
+            current = ''
+        current += paragraph
+    if current:
+        pieces.append(current)
+    return pieces
+
+
+def split_chunks(content):
+    """
+    Split marker markdown into chunks at "## " headings.
+
+    Chunks concatenate back to the exact original text, so reconstruction
+    is byte-for-byte.
+
+    Args:
+        content: Marker markdown
+
+    Returns:
+        list: Chunk strings
+    """
+    sections = []
+    current = []
+    for line in content.splitlines(keepends=True):
+        if line.startswith('## ') and current:
+            sections.append(''.join(current))
+            current = []
+        current.append(line)
+    if current:
+        sections.append(''.join(current))
+
+    chunks = []
+    for section in sections:
+        chunks.extend(_split_long(section))
+    return chunks
+
+
+def load_manifest(name, markers_dir=MARKERS_DIR):
+    """Manifest dict for a stored marker, or None."""
+    try:
+        with open(manifest_path(name, markers_dir), 'r') as f:
+            return json.load(f)
+    except (OSError, json.JSONDecodeError):
+        return None
+
+
+def index_path(markers_dir=MARKERS_DIR):
+    return Path(markers_dir) / INDEX_FILENAME
+
+
+def load_index(markers_dir=MARKERS_DIR):
+    """Marker index dict (empty index if missing or unreadable)."""
+    try:
+        with open(index_path(markers_dir), 'r') as f:
+            index = json.load(f)
+        if index.get('version') == INDEX_VERSION:
+            return index
+    except (OSError, json.JSONDecodeError):
+        pass
+    return {'version': INDEX_VERSION, 'latest': None, 'markers': {}}
+
+
+@contextmanager
+def index_lock(markers_dir=MARKERS_DIR):
+    """Serialize store writes, index read-modify-write and gc (not reentrant)."""
+    lock_path = store_dir(markers_dir) / 'index.lock'
+    lock_path.parent.mkdir(parents=True, exist_ok=True)
+    with open(lock_path, 'w') as lock:
+        if fcntl:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            if fcntl:
+                fcntl.flock(lock, fcntl.LOCK_UN)
+
+
+def extract_task_id(name, content):
+    """First task id (e.g. TASK-12, PROJ-301) in the marker name or text."""
+    match = TASK_ID_PATTERN.search(name) or TASK_ID_PATTERN.search(content)
+    return match.group(0) if match else None
+
+
+def extract_topics(name, content):
+    """
+    Most frequent meaningful words from the marker name, note and
+    Current Focus section.
+    """
+    focus = ''
+    match = re.search(r'^## Current Focus\n(.*?)(?=^## |\Z)', content, re.MULTILINE | re.DOTALL)
+    if match:
+        focus = match.group(1)
+    note = re.search(r'^\*\*Note\*\*:(.*)$', content, re.MULTILINE)
+
+    text = ' '.join([name.replace('-', ' ').replace('_', ' '),
+                     note.group(1) if note else '', focus]).lower()
+    words = Counter(word for word in TOPIC_WORD_PATTERN.findall(text)
+                    if word not in TOPIC_STOPWORDS)
+    return [word for word, _ in words.most_common(MAX_TOPICS)]
+
+
+def index_entry(manifest, content):
+    """Compact index record for a stored marker."""
+    return {
+        'created': manifest['created'],
+        'task_id': extract_task_id(manifest['name'], content),
+        'size': manifest['size'],
+        'topics': extract_topics(manifest['name'], content),
+        'chunks': manifest['chunks'],
+    }
+
+
+def _add_index_entry(manifest, content, markers_dir):
+    # Caller holds index_lock
+    index = load_index(markers_dir)
+    index['markers'][manifest['name']] = index_entry(manifest, content)
+    index['latest'] = manifest['name']
+    _write_atomic(index_path(markers_dir), json.dumps(index, separators=(',', ':')) + '\n')
+
+
+def update_index(manifest, content, markers_dir=MARKERS_DIR):
+    """Add or replace a marker's index entry and mark it latest."""
+    with index_lock(markers_dir):
+        _add_index_entry(manifest, content, markers_dir)
+
+
+def rebuild_index(markers_dir=MARKERS_DIR):
+    """
+    Recreate the index from manifests (recovery after manual edits).
+
+    Returns:
+        int: Number of markers indexed
+    """
+    manifests = sorted(list_markers(markers_dir), key=lambda m: m['created'])
+    index = {'version': INDEX_VERSION, 'latest': None, 'markers': {}}
+    for manifest in manifests:
+        content = load_marker(manifest['name'], markers_dir, manifest=manifest)
+        index['markers'][manifest['name']] = index_entry(manifest, content)
+        index['latest'] = manifest['name']
+
+    with index_lock(markers_dir):
+        _write_atomic(index_path(markers_dir), json.dumps(index, separators=(',', ':')) + '\n')
+    return len(manifests)
+
+
+def latest_marker(markers_dir=MARKERS_DIR):
+    """Name of the most recently stored marker, or None."""
+    return load_index(markers_dir)['latest']
+
+
+def find_marker(markers_dir=MARKERS_DIR, task_id=None, topic=None):
+    """
+    Newest indexed marker matching a task id and/or topic.
+
+    Args:
+        markers_dir: Markers directory
+        task_id: Task id to match exactly (case-insensitive)
+        topic: Word that must appear in the marker's topics
+
+    Returns:
+        str: Marker name, or None
+    """
+    index = load_index(markers_dir)
+    if not task_id and not topic:
+        return index['latest']
+
+    matches = [
+        (entry['created'], name) for name, entry in index['markers'].items()
+        if (not task_id or (entry['task_id'] or '').upper() == task_id.upper())
+        and (not topic or topic.lower() in entry['topics'])
+    ]
+    return max(matches)[1] if matches else None
+
+
+def store_marker(path, markers_dir=MARKERS_DIR, base=None):
+    """
+    Add a marker file to the store.
+
+    Args:
+        path: Marker .md file
+        markers_dir: Markers directory
+        base: Marker to delta against (default: most recently stored one)
+
+    Returns:
+        dict: Manifest that was written
+    """
+    path = Path(path)
+    name = marker_name(path)
+    content = path.read_text()
+    chunks = split_chunks(content)
+    digests = []
+
+    # Locked until the manifest references the chunks, so gc can't take them
+    with index_lock(markers_dir):
+        for chunk in chunks:
+            digest = chunk_hash(chunk)
+            target = chunk_path(digest, markers_dir)
+            if not target.exists():
+                _write_atomic(target, chunk)
+            digests.append(digest)
+
+        if base is None:
+            base = latest_marker(markers_dir)
+        base_manifest = load_manifest(base, markers_dir) if base and base != name else None
+        base_chunks = set(base_manifest['chunks']) if base_manifest else set()
+
+        manifest = {
+            'name': name,
+            'created': datetime.fromtimestamp(path.stat().st_mtime).isoformat(timespec='seconds'),
+            'size': len(content),
+            'chunks': digests,
+            'base': base_manifest['name'] if base_manifest else None,
+            'added': [digest for digest in digests if digest not in base_chunks],
+            'removed': sorted(base_chunks - set(digests)),
+        }
+
+        _write_atomic(manifest_path(name, markers_dir), json.dumps(manifest, indent=2) + '\n')
+        _add_index_entry(manifest, content, markers_dir)
+    write_estimates(path, content)
+    return manifest
+
+
+def read_chunk(digest, markers_dir=MARKERS_DIR):
+    return chunk_path(digest, markers_dir).read_text()
+
+
+def iter_marker(name, markers_dir=MARKERS_DIR, changed_since=None, manifest=None):
+    """
+    Yield a marker's text chunk by chunk.
+
+    The .md file is used while it still exists; otherwise chunks are read
+    from the store on demand.
+
+    Args:
+        name: Marker name
+        markers_dir: Markers directory
+        changed_since: Only yield chunks not present in this other marker
+        manifest: Already-loaded manifest (skips the index lookup)
+
+    Yields:
+        str: Chunk text
+    """
+    if changed_since:
+        chunks = _chunk_list(name, markers_dir, manifest)
+        known = set(_chunk_list(changed_since, markers_dir))
+        for digest in chunks:
+            if digest not in known:
+                yield read_chunk(digest, markers_dir)
+        return
+
+    body = Path(markers_dir) / f"{name}.md"
+    if body.exists():
+        with open(body, 'r') as f:
+            yield f.read()
+        return
+
+    for digest in _chunk_list(name, markers_dir, manifest):
+        yield read_chunk(digest, markers_dir)
+
+
+def _chunk_list(name, markers_dir, manifest=None):
+    """Chunk hashes for a marker, from the index (manifest as fallback)."""
+    if manifest is None:
+        entry = load_index(markers_dir)['markers'].get(name)
+        if entry:
+            return entry['chunks']
+        manifest = load_manifest(name, markers_dir)
+    if manifest is None:
+        raise FileNotFoundError(f"Marker not in store: {name}")
+    return manifest['chunks']
+
+
+def load_marker(name, markers_dir=MARKERS_DIR, changed_since=None, manifest=None):
+    """Full marker text (or only changed chunks)."""
+    return ''.join(iter_marker(name, markers_dir, changed_since, manifest))
+
+
+def compact_store(keep=3, markers_dir=MARKERS_DIR):
+    """
+    Remove .md bodies of stored markers beyond the newest `keep`.
+
+    A body is only removed after its reconstruction from chunks matches
+    the file exactly. The active marker is always kept.
+
+    Returns:
+        list: Names whose bodies were removed
+    """
+    markers_dir = Path(markers_dir)
+    active = None
+    active_file = markers_dir / '.active'
+    if active_file.exists():
+        active = marker_name(active_file.read_text().strip())
+
+    bodies = sorted(markers_dir.glob('*.md'), key=lambda p: p.stat().st_mtime, reverse=True)
+    removed = []
+
+    for body in bodies[keep:]:
+        name = marker_name(body)
+        manifest = load_manifest(name, markers_dir)
+        if name == active or manifest is None:
+            continue
+        try:
+            rebuilt = ''.join(read_chunk(digest, markers_dir) for digest in manifest['chunks'])
+        except OSError:
+            continue
+        if rebuilt == body.read_text():
+            body.unlink()
+            removed.append(name)
+
+    return removed
+
+
+def gc_store(markers_dir=MARKERS_DIR):
+    """
+    Delete chunks no manifest references.
+
+    Returns:
+        int: Number of chunks deleted
+    """
+    root = store_dir(markers_dir)
+    # A concurrent store writes chunks before its manifest - don't walk in between
+    with index_lock(markers_dir):
+        referenced = set()
+        for path in (root / 'manifests').glob('*.json'):
+            try:
+                referenced.update(json.loads(path.read_text())['chunks'])
+            except (OSError, json.JSONDecodeError, KeyError):
+                # Unreadable manifest - be conservative and keep everything
+                return 0
+
+        deleted = 0
+        for path in (root / 'chunks').glob('*/*'):
+            if path.name not in referenced:
+                path.unlink()
+                deleted += 1
+    return deleted
+
+
+def list_markers(markers_dir=MARKERS_DIR):
+    """Stored manifests, newest first."""
+    manifests = []
+    for path in (store_dir(markers_dir) / 'manifests').glob('*.json'):
+        manifest = load_manifest(path.stem, markers_dir)
+        if manifest:
+            manifests.append(manifest)
+    return sorted(manifests, key=lambda m: m['created'], reverse=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Content-addressed context marker store")
+    parser.add_argument("--markers-dir", default=str(MARKERS_DIR), help="Markers directory")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    store_parser = subparsers.add_parser("store", help="Add a marker file to the store")
+    store_parser.add_argument("marker", help="Marker .md file")
+    store_parser.add_argument("--base", help="Marker to delta against (default: latest stored)")
+
+    load_parser = subparsers.add_parser("load", help="Print a marker (reconstructed if needed)")
+    load_parser.add_argument("marker", help="Marker name or filename")
+    load_parser.add_argument("--changed-since", help="Only print chunks not in this marker")
+
+    compact_parser = subparsers.add_parser("compact", help="Drop .md bodies of older stored markers")
+    compact_parser.add_argument("--keep", type=int, default=3, help="Newest bodies to keep (default: 3)")
+
+    subparsers.add_parser("gc", help="Delete unreferenced chunks")
+    subparsers.add_parser("list", help="List stored markers")
+
+    find_parser = subparsers.add_parser("find", help="Print newest marker name matching task/topic (index lookup)")
+    find_parser.add_argument("--task", help="Task id, e.g. TASK-12")
+    find_parser.add_argument("--topic", help="Topic word")
+
+    subparsers.add_parser("reindex", help="Rebuild .index.json from manifests")
+
+    args = parser.parse_args()
+    markers_dir = Path(args.markers_dir)
+
+    if args.command == "store":
+        manifest = store_marker(args.marker, markers_dir, base=args.base)
+        print(f"Stored {manifest['name']}: {len(manifest['chunks'])} chunks, "
+              f"{len(manifest['added'])} new vs {manifest['base'] or 'nothing'}")
+
+    elif args.command == "load":
+        changed_since = marker_name(args.changed_since) if args.changed_since else None
+        try:
+            for chunk in iter_marker(marker_name(args.marker), markers_dir, changed_since):
+                sys.stdout.write(chunk)
+        except FileNotFoundError as e:
+            print(f"❌ {e}", file=sys.stderr)
+            return 1
+
+    elif args.command == "compact":
+        removed = compact_store(args.keep, markers_dir)
+        print(f"Removed {len(removed)} marker bodies (reconstructable from store)")
+
+    elif args.command == "gc":
+        print(f"Deleted {gc_store(markers_dir)} unreferenced chunks")
+
+    elif args.command == "find":
+        name = find_marker(markers_dir, task_id=args.task, topic=args.topic)
+        if not name:
+            return 1
+        print(name)
+
+    elif args.command == "reindex":
+        print(f"Indexed {rebuild_index(markers_dir)} markers")
+
+    elif args.command == "list":
+        for manifest in list_markers(markers_dir):
+            body = markers_dir / f"{manifest['name']}.md"
+            state = "" if body.exists() else " (stored)"
+            print(f"{manifest['created']}  {manifest['name']}  {manifest['size']} chars, "
+                  f"{len(manifest['added'])}/{len(manifest['chunks'])} new chunks{state}")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
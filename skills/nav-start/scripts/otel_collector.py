@@ -0,0 +1,300 @@
+#!/usr/bin/env python3
+"""
+Navigator Local Metrics Collector (OTLP stand-in)
+
+Lightweight OTLP/HTTP receiver that stores Claude Code metrics on disk so
+otel_session_stats.py can show real session statistics offline, without
+running Prometheus or an OpenTelemetry Collector.
+
+Data points are appended to one JSONL file per day under
+~/.claude/.nav-otel/ and queried by time range. Counter names and labels
+are normalized the same way the Prometheus exporter does
+(claude_code.token.usage -> claude_code_token_usage_total,
+session.id -> session_id), so both sources feed the same parser.
+
+Usage:
+    python3 otel_collector.py serve [--port 4318]
+
+    # Then point Claude Code at it:
+    export CLAUDE_CODE_ENABLE_TELEMETRY=1
+    export OTEL_METRICS_EXPORTER=otlp
+    export OTEL_EXPORTER_OTLP_PROTOCOL=http/json
+    export OTEL_EXPORTER_OTLP_ENDPOINT=http://localhost:4318
+
+    python3 otel_collector.py query --hours 24   # Prometheus-style dump
+"""
+
+import argparse
+import json
+import sys
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple
+
+STORE_DIR = Path.home() / '.claude' / '.nav-otel'
+RETENTION_DAYS = 30
+
+# OTLP AggregationTemporality
+TEMPORALITY_DELTA = 1
+TEMPORALITY_CUMULATIVE = 2
+
+
+def store_file(day: str, store_dir: Path = STORE_DIR) -> Path:
+    """Append-only store file for a UTC day (YYYY-MM-DD)."""
+    return store_dir / f"metrics-{day}.jsonl"
+
+
+def _attribute_value(value: Dict):
+    """Unwrap OTLP AnyValue."""
+    for key in ("stringValue", "intValue", "doubleValue", "boolValue"):
+        if key in value:
+            return value[key]
+    return None
+
+
+def _attributes(attributes: List[Dict]) -> Dict[str, str]:
+    """OTLP KeyValue list -> Prometheus-style labels (dots become underscores)."""
+    labels = {}
+    for attribute in attributes or []:
+        value = _attribute_value(attribute.get("value", {}))
+        if value is not None:
+            labels[attribute["key"].replace('.', '_')] = str(value)
+    return labels
+
+
+def flatten_otlp_metrics(payload: Dict) -> Iterator[Dict]:
+    """
+    Flatten an OTLP ExportMetricsServiceRequest (JSON encoding) into points.
+
+    Yields:
+        {"t": seconds, "name": str, "labels": dict, "value": float, "temporality": int}
+    """
+    for resource_metrics in payload.get("resourceMetrics", []):
+        for scope_metrics in resource_metrics.get("scopeMetrics", []):
+            for metric in scope_metrics.get("metrics", []):
+                name = metric.get("name", "").replace('.', '_')
+
+                if "sum" in metric:
+                    data = metric["sum"]
+                    temporality = data.get("aggregationTemporality", TEMPORALITY_CUMULATIVE)
+                    # Prometheus exporter suffixes counters with _total
+                    if data.get("isMonotonic") and not name.endswith("_total"):
+                        name += "_total"
+                elif "gauge" in metric:
+                    data = metric["gauge"]
+                    temporality = None
+                else:
+                    # Histograms/summaries aren't used by session stats
+                    continue
+
+                for point in data.get("dataPoints", []):
+                    if "asDouble" in point:
+                        value = float(point["asDouble"])
+                    elif "asInt" in point:
+                        value = float(point["asInt"])
+                    else:
+                        continue
+
+                    yield {
+                        "t": int(point.get("timeUnixNano", 0)) / 1e9 or time.time(),
+                        "name": name,
+                        "labels": _attributes(point.get("attributes")),
+                        "value": value,
+                        "temporality": temporality,
+                    }
+
+
+def append_points(points: List[Dict], store_dir: Path = STORE_DIR):
+    """Append points to their day's store file."""
+    by_day = {}
+    for point in points:
+        day = datetime.fromtimestamp(point["t"], timezone.utc).strftime('%Y-%m-%d')
+        by_day.setdefault(day, []).append(json.dumps(point, separators=(',', ':')))
+
+    store_dir.mkdir(parents=True, exist_ok=True)
+    for day, lines in by_day.items():
+        with open(store_file(day, store_dir), 'a') as f:
+            f.write('\n'.join(lines) + '\n')
+
+
+def prune_store(retention_days: int = RETENTION_DAYS, store_dir: Path = STORE_DIR):
+    """Delete store files older than retention."""
+    cutoff = (datetime.now(timezone.utc) - timedelta(days=retention_days)).strftime('%Y-%m-%d')
+    for path in store_dir.glob("metrics-*.jsonl"):
+        if path.stem[len("metrics-"):] < cutoff:
+            try:
+                path.unlink()
+            except OSError:
+                pass
+
+
+def has_data(store_dir: Path = STORE_DIR) -> bool:
+    """Cheap check whether the collector has stored anything."""
+    return store_dir.is_dir() and any(store_dir.glob("metrics-*.jsonl"))
+
+
+def _read_points(start: float, end: float, store_dir: Path) -> Iterator[Dict]:
+    """Points with t <= end from store files that can overlap [.., end]."""
+    last_day = datetime.fromtimestamp(end, timezone.utc).strftime('%Y-%m-%d')
+    first_day = datetime.fromtimestamp(start, timezone.utc).strftime('%Y-%m-%d') if start > 0 else ''
+
+    for path in sorted(store_dir.glob("metrics-*.jsonl")):
+        day = path.stem[len("metrics-"):]
+        # Cumulative series need their last value before start, so read one
+        # extra day back; everything older is skipped without opening it
+        if day > last_day or (first_day and day < _previous_day(first_day)):
+            continue
+        with open(path, 'r') as f:
+            for line in f:
+                try:
+                    point = json.loads(line)
+                except json.JSONDecodeError:
+                    continue
+                if point["t"] <= end:
+                    yield point
+
+
+def _previous_day(day: str) -> str:
+    return (datetime.strptime(day, '%Y-%m-%d') - timedelta(days=1)).strftime('%Y-%m-%d')
+
+
+def query_store(start: Optional[float] = None, end: Optional[float] = None,
+                store_dir: Path = STORE_DIR) -> List[Tuple[str, Dict[str, str], float]]:
+    """
+    Series values accumulated within a time range.
+
+    Delta points inside the range are summed; cumulative series report their
+    growth over the range (last value in range minus last value before it);
+    gauges report their last value in range.
+
+    Args:
+        start: Range start, unix seconds (default: beginning of store)
+        end: Range end, unix seconds (default: now)
+
+    Returns:
+        List of (metric name, labels, value) samples, Prometheus-parser shaped
+    """
+    start = start or 0
+    end = end or time.time()
+
+    series = {}
+    for point in _read_points(start, end, store_dir):
+        key = (point["name"], tuple(sorted(point["labels"].items())))
+        entry = series.setdefault(key, {"before": 0.0, "last": None, "sum": 0.0,
+                                         "temporality": point["temporality"]})
+        in_range = point["t"] >= start
+
+        if point["temporality"] == TEMPORALITY_DELTA:
+            if in_range:
+                entry["sum"] += point["value"]
+        elif in_range:
+            entry["last"] = point["value"]
+        else:
+            entry["before"] = point["value"]
+
+    samples = []
+    for (name, labels), entry in series.items():
+        if entry["temporality"] == TEMPORALITY_DELTA:
+            value = entry["sum"]
+        elif entry["last"] is None:
+            continue
+        elif entry["temporality"] == TEMPORALITY_CUMULATIVE:
+            # Counter restarted inside range - everything in range is new
+            value = entry["last"] - entry["before"] if entry["last"] >= entry["before"] else entry["last"]
+        else:
+            value = entry["last"]
+        samples.append((name, dict(labels), value))
+
+    return samples
+
+
+def _escape_label(value: str) -> str:
+    return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def format_prometheus(samples: List[Tuple[str, Dict[str, str], float]]) -> str:
+    """Render samples as Prometheus text exposition."""
+    lines = []
+    for name, labels, value in sorted(samples, key=lambda s: (s[0], sorted(s[1].items()))):
+        label_text = ','.join(f'{key}="{_escape_label(val)}"' for key, val in sorted(labels.items()))
+        lines.append(f"{name}{{{label_text}}} {value:g}" if label_text else f"{name} {value:g}")
+    return '\n'.join(lines)
+
+
+class OTLPHandler(BaseHTTPRequestHandler):
+    """POST /v1/metrics (OTLP/HTTP, JSON encoding)."""
+
+    write_lock = threading.Lock()
+
+    def do_POST(self):
+        if self.path.rstrip('/') != '/v1/metrics':
+            self.send_error(404)
+            return
+
+        if 'json' not in self.headers.get('Content-Type', ''):
+            # Protobuf would need the opentelemetry-proto package
+            self.send_error(415, "Only OTLP/HTTP JSON is supported (OTEL_EXPORTER_OTLP_PROTOCOL=http/json)")
+            return
+
+        try:
+            length = int(self.headers.get('Content-Length', 0))
+            payload = json.loads(self.rfile.read(length) or b'{}')
+            points = list(flatten_otlp_metrics(payload))
+        except (ValueError, KeyError, TypeError) as e:
+            self.send_error(400, f"Invalid OTLP payload: {e}")
+            return
+
+        with self.write_lock:
+            append_points(points)
+
+        body = b'{}'
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        # Exporters post every few seconds - keep the terminal quiet
+        pass
+
+
+def serve(host: str, port: int):
+    """Run the OTLP receiver until interrupted."""
+    prune_store()
+    server = ThreadingHTTPServer((host, port), OTLPHandler)
+    print(f"Navigator collector listening on http://{host}:{port}/v1/metrics", file=sys.stderr)
+    print(f"Storing metrics in {STORE_DIR}", file=sys.stderr)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Local OTLP metrics collector for Navigator")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    serve_parser = subparsers.add_parser("serve", help="Run OTLP/HTTP receiver")
+    serve_parser.add_argument("--host", default="127.0.0.1", help="Bind address (default: 127.0.0.1)")
+    serve_parser.add_argument("--port", type=int, default=4318, help="Port (default: 4318, OTLP/HTTP)")
+
+    query_parser = subparsers.add_parser("query", help="Print stored metrics as Prometheus text")
+    query_parser.add_argument("--hours", type=float, default=24, help="Time range ending now (default: 24)")
+
+    args = parser.parse_args()
+
+    if args.command == "serve":
+        serve(args.host, args.port)
+    elif args.command == "query":
+        print(format_prometheus(query_store(start=time.time() - args.hours * 3600)))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
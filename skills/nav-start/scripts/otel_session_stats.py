@@ -11,13 +11,22 @@ Usage:
 Environment Variables Required:
     CLAUDE_CODE_ENABLE_TELEMETRY=1
     OTEL_METRICS_EXPORTER=console (or otlp)
+
+With OTEL_METRICS_EXPORTER=otlp pointed at the bundled collector
+(otel_collector.py serve), metrics are read from its local store - no
+Prometheus and no network round trip needed.
 """
 
 import os
+import re
 import sys
 import json
+import time
 import subprocess
-from typing import Dict, Optional
+from typing import Dict, Iterable, Optional, Tuple
+
+# Time range queried from the local collector store
+LOCAL_QUERY_HOURS = 24
 
 
 def check_otel_enabled() -> bool:
@@ -55,6 +64,17 @@ def get_otel_metrics() -> Optional[Dict]:
     # Alternative: Check if Prometheus exporter is running
     exporter_type = os.getenv("OTEL_METRICS_EXPORTER", "")
 
+    if exporter_type != "prometheus":
+        # Bundled local collector - plain file read, no blocking HTTP call
+        try:
+            import otel_collector
+
+            if otel_collector.has_data():
+                samples = otel_collector.query_store(start=time.time() - LOCAL_QUERY_HOURS * 3600)
+                return {"source": "local", "samples": samples}
+        except ImportError:
+            pass
+
     if exporter_type == "prometheus":
         # Try to query Prometheus endpoint
         try:
@@ -74,47 +94,70 @@ def get_otel_metrics() -> Optional[Dict]:
     return None
 
 
-def parse_prometheus_metrics(prometheus_data: str) -> Optional[Dict]:
+# Prometheus text exposition: name{label="value",...} value [timestamp]
+_METRIC_NAME_RE = re.compile(r'[a-zA-Z_:][a-zA-Z0-9_:]*')
+_LABEL_RE = re.compile(r'\s*([a-zA-Z_][a-zA-Z0-9_]*)\s*=\s*"((?:[^"\\]|\\.)*)"\s*,?')
+_LABEL_ESCAPES = {'\\\\': '\\', '\\"': '"', '\\n': '\n'}
+_LABEL_ESCAPE_RE = re.compile(r'\\[\\"n]')
+
+# claude_code_token_usage "type" label -> metrics field
+TOKEN_TYPE_FIELDS = {
+    "input": "input_tokens",
+    "output": "output_tokens",
+    "cacheRead": "cache_read_tokens",
+    "cacheCreation": "cache_creation_tokens",
+}
+
+
+def parse_prometheus_sample(line: str) -> Optional[Tuple[str, Dict[str, str], float]]:
     """
-    Parse Prometheus format metrics from Claude Code.
+    Tokenize one Prometheus exposition line.
 
     Args:
-        prometheus_data: Raw Prometheus metrics text
+        line: Raw line of Prometheus text format
 
     Returns:
-        Parsed metrics dictionary or None
+        (metric name, labels, value) or None for comments, blanks and
+        malformed lines
     """
-    # First, find the most recent session_id
-    current_session_id = None
-    session_count_max = 0
+    name_match = _METRIC_NAME_RE.match(line)
+    if not name_match:
+        return None
 
-    for line in prometheus_data.split('\n'):
-        # Skip comments
-        if line.startswith('#'):
-            continue
+    name = name_match.group(0)
+    pos = name_match.end()
+    labels = {}
+
+    if line.startswith('{', pos):
+        pos += 1
+        while True:
+            label_match = _LABEL_RE.match(line, pos)
+            if not label_match:
+                break
+            value = label_match.group(2)
+            if '\\' in value:
+                value = _LABEL_ESCAPE_RE.sub(lambda m: _LABEL_ESCAPES[m.group(0)], value)
+            labels[label_match.group(1)] = value
+            pos = label_match.end()
+
+        pos = line.find('}', pos)
+        if pos == -1:
+            return None
+        pos += 1
+
+    parts = line[pos:].split()
+    if not parts:
+        return None
+
+    try:
+        return name, labels, float(parts[0])
+    except ValueError:
+        return None
 
-        if 'claude_code_session_count_total' in line:
-            parts = line.split()
-            if len(parts) >= 2:
-                try:
-                    count = float(parts[-1])
-                    if count >= session_count_max:
-                        session_count_max = count
-                        # Extract session_id from labels
-                        if 'session_id="' in line:
-                            session_start = line.find('session_id="') + 12
-                            session_end = line.find('"', session_start)
-                            if session_end > session_start:
-                                current_session_id = line[session_start:session_end]
-                except ValueError:
-                    # Skip lines that don't have numeric values
-                    continue
-
-    if not current_session_id:
-        # Fallback: use any session if we can't determine current
-        pass
 
-    metrics = {
+def _empty_metrics(session_id: Optional[str]) -> Dict:
+    """Zeroed metrics aggregate."""
+    return {
         "input_tokens": 0,
         "output_tokens": 0,
         "cache_read_tokens": 0,
@@ -122,114 +165,138 @@ def parse_prometheus_metrics(prometheus_data: str) -> Optional[Dict]:
         "cost_usd": 0.0,
         "active_time_seconds": 0,
         "model": "unknown",
-        "session_id": current_session_id or "unknown"
+        "session_id": session_id,
     }
 
-    try:
-        for line in prometheus_data.split('\n'):
-            # Skip comments and empty lines
-            if line.startswith('#') or not line.strip():
-                continue
-
-            # Filter by current session_id for accurate stats
-            if current_session_id and f'session_id="{current_session_id}"' not in line:
-                continue
-
-            # Parse token usage metrics
-            if 'claude_code_token_usage' in line and not line.startswith('#'):
-                parts = line.split()
-                if len(parts) >= 2:
-                    value = float(parts[-1])
-
-                    if 'type="input"' in line:
-                        metrics["input_tokens"] += int(value)
-                    elif 'type="output"' in line:
-                        metrics["output_tokens"] += int(value)
-                    elif 'type="cacheRead"' in line:
-                        metrics["cache_read_tokens"] += int(value)
-                    elif 'type="cacheCreation"' in line:
-                        metrics["cache_creation_tokens"] += int(value)
-
-                    # Extract model
-                    if 'model="' in line:
-                        model_start = line.find('model="') + 7
-                        model_end = line.find('"', model_start)
-                        if model_end > model_start:
-                            metrics["model"] = line[model_start:model_end]
-
-            # Parse cost metrics
-            elif 'claude_code_cost_usage' in line:
-                parts = line.split()
-                if len(parts) >= 2:
-                    metrics["cost_usd"] += float(parts[-1])
-
-            # Parse active time
-            elif 'claude_code_active_time_total' in line:
-                parts = line.split()
-                if len(parts) >= 2:
-                    metrics["active_time_seconds"] = int(float(parts[-1]))
-
-        # Return metrics only if we have actual data
-        if metrics["input_tokens"] > 0 or metrics["output_tokens"] > 0:
-            return metrics
-
-        # If current session has no data, try without session filter (most recent data)
-        if current_session_id:
-            # Retry without session filter
-            metrics_fallback = {
-                "input_tokens": 0,
-                "output_tokens": 0,
-                "cache_read_tokens": 0,
-                "cache_creation_tokens": 0,
-                "cost_usd": 0.0,
-                "active_time_seconds": 0,
-                "model": "unknown",
-                "session_id": None  # No specific session (aggregate)
-            }
-
-            for line in prometheus_data.split('\n'):
-                if line.startswith('#') or not line.strip():
-                    continue
-
-                # No session filtering - aggregate all
-                if 'claude_code_token_usage' in line:
-                    parts = line.split()
-                    if len(parts) >= 2:
-                        value = float(parts[-1])
-                        if 'type="input"' in line:
-                            metrics_fallback["input_tokens"] += int(value)
-                        elif 'type="output"' in line:
-                            metrics_fallback["output_tokens"] += int(value)
-                        elif 'type="cacheRead"' in line:
-                            metrics_fallback["cache_read_tokens"] += int(value)
-                        elif 'type="cacheCreation"' in line:
-                            metrics_fallback["cache_creation_tokens"] += int(value)
-
-                        if 'model="' in line:
-                            model_start = line.find('model="') + 7
-                            model_end = line.find('"', model_start)
-                            if model_end > model_start:
-                                metrics_fallback["model"] = line[model_start:model_end]
-
-                elif 'claude_code_cost_usage' in line:
-                    parts = line.split()
-                    if len(parts) >= 2:
-                        metrics_fallback["cost_usd"] += float(parts[-1])
-
-                elif 'claude_code_active_time_total' in line:
-                    parts = line.split()
-                    if len(parts) >= 2:
-                        metrics_fallback["active_time_seconds"] = int(float(parts[-1]))
-
-            if metrics_fallback["input_tokens"] > 0 or metrics_fallback["output_tokens"] > 0:
-                return metrics_fallback
 
+def _accumulate(metrics: Dict, name: str, labels: Dict[str, str], value: float):
+    """Fold one sample into a metrics aggregate."""
+    if name.startswith('claude_code_token_usage'):
+        field = TOKEN_TYPE_FIELDS.get(labels.get('type'))
+        if field:
+            metrics[field] += int(value)
+        if labels.get('model'):
+            metrics["model"] = labels['model']
+
+    elif name.startswith('claude_code_cost_usage'):
+        metrics["cost_usd"] += value
+
+    elif name.startswith('claude_code_active_time_total'):
+        metrics["active_time_seconds"] = int(value)
+
+
+def index_prometheus_metrics(prometheus_data: str) -> Dict:
+    """
+    Build per-session aggregates from Prometheus text in a single pass.
+
+    Args:
+        prometheus_data: Raw Prometheus metrics text
+
+    Returns:
+        See index_samples
+    """
+    samples = (parse_prometheus_sample(line) for line in prometheus_data.splitlines())
+    return index_samples(sample for sample in samples if sample)
+
+
+def index_samples(samples: Iterable[Tuple[str, Dict[str, str], float]]) -> Dict:
+    """
+    Build per-session aggregates from (name, labels, value) samples.
+
+    Args:
+        samples: Parsed Prometheus lines or local collector query results
+
+    Returns:
+        {
+            "current_session_id": session with highest session count (or None),
+            "sessions": {session_id: metrics},  # None key = no session label
+            "overall": metrics across all sessions
+        }
+    """
+    sessions = {}
+    overall = _empty_metrics(None)
+    current_session_id = None
+    session_count_max = 0
+
+    for name, labels, value in samples:
+
+        # Counter creation timestamps, not usage
+        if name.endswith('_created'):
+            continue
+
+        session_id = labels.get('session_id')
+
+        # Most recent session = highest session count
+        if name.startswith('claude_code_session_count_total') and value >= session_count_max:
+            session_count_max = value
+            if session_id:
+                current_session_id = session_id
+
+        if session_id not in sessions:
+            sessions[session_id] = _empty_metrics(session_id)
+
+        _accumulate(sessions[session_id], name, labels, value)
+        _accumulate(overall, name, labels, value)
+
+    return {
+        "current_session_id": current_session_id,
+        "sessions": sessions,
+        "overall": overall,
+    }
+
+
+def _has_token_data(metrics: Dict) -> bool:
+    return metrics["input_tokens"] > 0 or metrics["output_tokens"] > 0
+
+
+def parse_prometheus_metrics(prometheus_data: str) -> Optional[Dict]:
+    """
+    Parse Prometheus format metrics from Claude Code.
+
+    Args:
+        prometheus_data: Raw Prometheus metrics text
+
+    Returns:
+        Metrics for the current session, or aggregated across all sessions
+        (session_id None) if the current one has no token data yet; None if
+        there is no token data at all
+    """
+    try:
+        return metrics_from_index(index_prometheus_metrics(prometheus_data))
     except Exception as e:
         print(f"Error parsing Prometheus metrics: {e}", file=sys.stderr)
 
     return None
 
 
+def metrics_from_index(index: Dict) -> Optional[Dict]:
+    """
+    Pick the metrics to display from a session index.
+
+    Returns:
+        Current session metrics, all-session aggregate if the current session
+        has no token data yet, or None
+    """
+    current_session_id = index["current_session_id"]
+
+    if current_session_id:
+        # Filter by current session_id for accurate stats
+        metrics = index["sessions"].get(current_session_id) or _empty_metrics(current_session_id)
+    else:
+        # Can't determine current session - use everything
+        metrics = dict(index["overall"], session_id="unknown")
+
+    # Return metrics only if we have actual data
+    if _has_token_data(metrics):
+        return metrics
+
+    # If current session has no data, fall back to aggregate of all sessions
+    if current_session_id and _has_token_data(index["overall"]):
+        return index["overall"]
+
+    return None
+
+
 def query_session_metrics() -> Optional[Dict]:
     """
     Query current session metrics from OpenTelemetry.
@@ -255,6 +322,9 @@ def query_session_metrics() -> Optional[Dict]:
     if metrics_data.get("source") == "prometheus":
         return parse_prometheus_metrics(metrics_data.get("data", ""))
 
+    if metrics_data.get("source") == "local":
+        return metrics_from_index(index_samples(metrics_data.get("samples", [])))
+
     # For console exporter, we'd need to implement JSON parsing
     # This is more complex as it requires capturing stderr output
 
@@ -316,6 +386,13 @@ def display_no_metrics_message():
         print("     python3 scripts/otel_session_stats.py")
         print()
         print("Prometheus metrics will be available at: http://localhost:9464/metrics")
+        print()
+        print("Or run the bundled local collector (no Prometheus needed):")
+        print()
+        print("  python3 scripts/otel_collector.py serve &")
+        print("  export OTEL_METRICS_EXPORTER=otlp")
+        print("  export OTEL_EXPORTER_OTLP_PROTOCOL=http/json")
+        print("  export OTEL_EXPORTER_OTLP_ENDPOINT=http://localhost:4318")
     else:
         print(f"Exporter: {exporter}")
         print()
@@ -1,14 +1,35 @@
 #!/usr/bin/env python3
 """
 Map Figma components to codebase components using Code Connect data and fuzzy matching.
+
+Fuzzy matching goes through a trigram index over codebase component names:
+each Figma name is scored exactly (SequenceMatcher) only against a short
+list of names that share trigrams with it, instead of against every
+component in the codebase.
+
+Component files are discovered with the shared file scanner, which honors
+.gitignore, scans top-level directories in parallel and reuses directory
+listings whose mtime hasn't changed since the previous run.
 """
 
 import json
 import argparse
 import os
-from typing import Dict, List, Any
+import sys
+from collections import defaultdict
+from pathlib import Path
+from typing import Dict, List, Any, Optional
 from difflib import SequenceMatcher
 
+sys.path.insert(0, str(Path(__file__).resolve().parents[2] / 'shared'))
+from file_scanner import find_files  # noqa: E402
+
+# Build output and dependencies, skipped even without a .gitignore
+SKIP_DIRS = ['node_modules', 'dist', 'build', '.git', '.next']
+
+# Max distinct names scored exactly per lookup (ranked by shared trigrams)
+SHORTLIST_SIZE = 128
+
 
 def calculate_similarity(str1: str, str2: str) -> float:
     """Calculate similarity ratio between two strings."""
@@ -19,45 +40,100 @@ def find_component_files(project_root: str, extensions: List[str] = None) -> Lis
     """
     Find all component files in project.
 
+    Files ignored by .gitignore and directories in SKIP_DIRS are left out.
+
     Args:
         project_root: Project root directory
-        extensions: File extensions to search (default: ['tsx', 'jsx', 'vue'])
+        extensions: File extensions to search (default: ['tsx', 'jsx', 'vue', 'svelte'])
 
     Returns:
-        List of component file info (path, name)
+        List of component file info (path, name), sorted by path
     """
     if extensions is None:
         extensions = ['tsx', 'jsx', 'vue', 'svelte']
 
     components = []
 
-    for root, dirs, files in os.walk(project_root):
-        # Skip node_modules, dist, build directories
-        dirs[:] = [d for d in dirs if d not in ['node_modules', 'dist', 'build', '.git', '.next']]
+    for rel_path in find_files(project_root, extensions, skip_dirs=SKIP_DIRS,
+                               cache_name='components'):
+        # Extract component name (filename without extension)
+        comp_name = os.path.splitext(os.path.basename(rel_path))[0]
 
-        for file in files:
-            if any(file.endswith(f'.{ext}') for ext in extensions):
-                full_path = os.path.join(root, file)
-                rel_path = os.path.relpath(full_path, project_root)
+        # Skip test files, stories, etc.
+        if any(suffix in comp_name.lower() for suffix in ['.test', '.spec', '.stories', '.story']):
+            continue
 
-                # Extract component name (filename without extension)
-                comp_name = os.path.splitext(file)[0]
+        rel_path = os.path.normpath(rel_path)
+        components.append({
+            'name': comp_name,
+            'path': rel_path,
+            'full_path': os.path.join(project_root, rel_path)
+        })
 
-                # Skip test files, stories, etc.
-                if any(suffix in comp_name.lower() for suffix in ['.test', '.spec', '.stories', '.story']):
-                    continue
+    return components
 
-                components.append({
-                    'name': comp_name,
-                    'path': rel_path,
-                    'full_path': full_path
-                })
 
-    return components
+def trigrams(name: str) -> set:
+    """Padded character trigrams of a lowercased name ("btn" → " b", " bt", ...)."""
+    padded = f"  {name.lower()} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class ComponentIndex:
+    """
+    Trigram inverted index over codebase component names.
+
+    Components sharing a name (e.g. several "index" files) are grouped so
+    each distinct name is scored once per lookup.
+    """
+
+    def __init__(self, codebase_components: List[Dict[str, str]]):
+        self.components = codebase_components
+        self.names: List[str] = []
+        self.members: List[List[int]] = []
+        self.postings: Dict[str, List[int]] = defaultdict(list)
+
+        name_ids: Dict[str, int] = {}
+        for position, comp in enumerate(codebase_components):
+            name = comp['name']
+            name_id = name_ids.get(name)
+            if name_id is None:
+                name_id = name_ids[name] = len(self.names)
+                self.names.append(name)
+                self.members.append([])
+                for gram in trigrams(name):
+                    self.postings[gram].append(name_id)
+            self.members[name_id].append(position)
+
+    def shortlist(self, query: str, threshold: float, limit: int = SHORTLIST_SIZE) -> List[int]:
+        """
+        Name ids worth scoring exactly for a query.
+
+        Names must share at least one trigram with the query and pass the
+        length bound (ratio ≤ 2·min(len)/(len sum), so names that are far
+        too short or long can't reach the threshold); the rest are ranked
+        by shared trigram count.
+        """
+        query_length = len(query)
+        overlap: Dict[int, int] = defaultdict(int)
+        for gram in trigrams(query):
+            for name_id in self.postings.get(gram, ()):
+                overlap[name_id] += 1
+
+        candidates = []
+        for name_id, shared in overlap.items():
+            name_length = len(self.names[name_id])
+            total = query_length + name_length
+            if total and 2 * min(query_length, name_length) / total >= threshold:
+                candidates.append((shared, name_id))
+
+        candidates.sort(key=lambda item: (-item[0], item[1]))
+        return [name_id for _, name_id in candidates[:limit]]
 
 
 def fuzzy_match_component(figma_name: str, codebase_components: List[Dict[str, str]],
-                         threshold: float = 0.6) -> List[Dict[str, Any]]:
+                         threshold: float = 0.6,
+                         index: Optional[ComponentIndex] = None) -> List[Dict[str, Any]]:
     """
     Fuzzy match Figma component name to codebase components.
 
@@ -65,31 +141,41 @@ def fuzzy_match_component(figma_name: str, codebase_components: List[Dict[str, s
         figma_name: Figma component name
         codebase_components: List of codebase component info
         threshold: Minimum similarity threshold
+        index: Prebuilt ComponentIndex over codebase_components (built on
+            the fly if omitted; pass one when matching many names)
 
     Returns:
-        List of matches with confidence scores
+        List of matches with confidence scores (best first; names sharing
+        few trigrams with the Figma name may be left out of long lists)
     """
-    matches = []
+    if index is None:
+        index = ComponentIndex(codebase_components)
+
+    scored = []
 
     # Clean Figma name (remove variant info)
     # "Button/Primary/Large" → "Button"
     base_name = figma_name.split('/')[0].strip()
 
-    for comp in codebase_components:
-        comp_name = comp['name']
-        similarity = calculate_similarity(base_name, comp_name)
+    for name_id in index.shortlist(base_name, threshold):
+        similarity = calculate_similarity(base_name, index.names[name_id])
 
         if similarity >= threshold:
-            matches.append({
-                'figma_name': figma_name,
-                'code_component': comp_name,
-                'code_path': comp['path'],
-                'confidence': round(similarity, 3),
-                'match_type': 'fuzzy'
-            })
+            scored.extend((similarity, position) for position in index.members[name_id])
 
-    # Sort by confidence
-    matches.sort(key=lambda x: x['confidence'], reverse=True)
+    # Sort by confidence (codebase order breaks ties)
+    scored.sort(key=lambda item: (-item[0], item[1]))
+
+    matches = []
+    for similarity, position in scored:
+        comp = index.components[position]
+        matches.append({
+            'figma_name': figma_name,
+            'code_component': comp['name'],
+            'code_path': comp['path'],
+            'confidence': round(similarity, 3),
+            'match_type': 'fuzzy'
+        })
 
     return matches
 
@@ -176,8 +262,9 @@ def map_components(figma_components: List[Dict[str, Any]],
     Returns:
         Component mappings with confidence scores
     """
-    # Find all component files in codebase
+    # Find all component files in codebase and index their names once
     codebase_components = find_component_files(project_root)
+    component_index = ComponentIndex(codebase_components)
 
     mappings = {
         'mapped': [],
@@ -204,7 +291,8 @@ def map_components(figma_components: List[Dict[str, Any]],
             })
         else:
             # Fallback to fuzzy matching
-            matches = fuzzy_match_component(comp_name, codebase_components, threshold=0.6)
+            matches = fuzzy_match_component(comp_name, codebase_components, threshold=0.6,
+                                            index=component_index)
 
             if matches and matches[0]['confidence'] >= 0.8:
                 # High confidence match
@@ -0,0 +1,352 @@
+#!/usr/bin/env python3
+"""
+Gitignore-aware, cached file discovery shared by skill functions.
+
+Finds files with given extensions under a project root:
+- .gitignore files (at any level) and .git/info/exclude are honored,
+  including negation, directory-only and anchored patterns and "**"
+- top-level directories are scanned in parallel (os.scandir in a
+  thread pool)
+- each directory's listing is cached by its mtime, so a repeat run only
+  re-lists directories whose entries changed (an edit to a .gitignore
+  rescans the directories it applies to)
+
+The cache is kept at .agent/.cache/files-<name>.json in projects that
+have .agent/ (Navigator initialized), and in memory otherwise.
+
+Usage:
+    sys.path.insert(0, str(Path(__file__).resolve().parents[2] / 'shared'))
+    from file_scanner import find_files
+
+    python3 file_scanner.py [project_root] --ext tsx --ext jsx
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import re
+import sys
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from manifest_cache import load_text
+
+CACHE_VERSION = 1
+CACHE_DIR = Path('.agent') / '.cache'
+
+# Never worth entering, ignored or not
+ALWAYS_SKIP = {'.git'}
+
+# (resolved root, cache name) -> cache document, for projects without .agent/
+_MEMORY: Dict[Tuple[str, str], Dict] = {}
+
+
+def _translate(pattern: str) -> str:
+    """Regex body for a gitignore glob ("*" stays within one path segment)."""
+    parts = []
+    i = 0
+    while i < len(pattern):
+        if pattern.startswith('**/', i):
+            parts.append('(?:.*/)?')
+            i += 3
+        elif pattern.startswith('**', i):
+            parts.append('.*')
+            i += 2
+        elif pattern[i] == '*':
+            parts.append('[^/]*')
+            i += 1
+        elif pattern[i] == '?':
+            parts.append('[^/]')
+            i += 1
+        elif pattern[i] == '[' and ']' in pattern[i + 2:]:
+            end = pattern.index(']', i + 2)
+            body = pattern[i + 1:end].replace('\\', '\\\\')
+            if body.startswith('!'):
+                body = '^' + body[1:]
+            parts.append(f'[{body}]')
+            i = end + 1
+        else:
+            if pattern[i] == '\\' and i + 1 < len(pattern):
+                i += 1
+            parts.append(re.escape(pattern[i]))
+            i += 1
+    return ''.join(parts)
+
+
+def parse_ignore(text: str) -> List[Tuple[re.Pattern, bool, bool]]:
+    """
+    Compile gitignore lines.
+
+    Args:
+        text: .gitignore contents
+
+    Returns:
+        List of (regex over paths relative to the file's directory,
+        negated, directory_only), in file order
+    """
+    rules = []
+    for raw_line in text.splitlines():
+        line = raw_line.rstrip()
+        if not line or line.startswith('#'):
+            continue
+
+        negated = line.startswith('!')
+        if negated:
+            line = line[1:]
+        elif line.startswith('\\'):
+            line = line[1:]
+
+        directory_only = line.endswith('/')
+        line = line.rstrip('/')
+        if not line:
+            continue
+
+        # A slash anywhere but the end anchors the pattern to the file's directory
+        anchored = '/' in line
+        body = _translate(line.lstrip('/'))
+        if not anchored:
+            body = '(?:.*/)?' + body
+        rules.append((re.compile(f'^{body}$'), negated, directory_only))
+    return rules
+
+
+def is_ignored(rel_path: str, is_dir: bool, chain) -> bool:
+    """
+    Whether a path is ignored by a chain of ignore files.
+
+    Args:
+        rel_path: Path relative to the scan root ("/" separated)
+        is_dir: Whether the path is a directory
+        chain: (base directory, rules) pairs from the root down; later
+            rules take precedence
+
+    Returns:
+        True if the last matching rule ignores the path
+    """
+    ignored = False
+    for base, rules in chain:
+        if base:
+            if not rel_path.startswith(base + '/'):
+                continue
+            relative = rel_path[len(base) + 1:]
+        else:
+            relative = rel_path
+        for regex, negated, directory_only in rules:
+            if directory_only and not is_dir:
+                continue
+            if regex.match(relative):
+                ignored = not negated
+    return ignored
+
+
+def _signature(path: Path) -> Optional[str]:
+    try:
+        stat = path.stat()
+    except OSError:
+        return None
+    return f'{stat.st_mtime_ns}:{stat.st_size}'
+
+
+def _extend_chain(root: Path, rel: str, chain, chain_key: str, ignore_file: Path):
+    """Chain and chain key with one more ignore file applied at rel."""
+    signature = _signature(ignore_file)
+    if signature is None:
+        return chain, chain_key
+    rules = parse_ignore(load_text(ignore_file) or '')
+    key = hashlib.blake2b(f'{chain_key}|{rel}:{signature}'.encode(), digest_size=8).hexdigest()
+    return chain + ((rel, rules),), key
+
+
+def _list_dir(path: Path) -> Tuple[List[str], List[str]]:
+    """Raw (file names, directory names) of a directory; symlinked dirs skipped."""
+    files, dirs = [], []
+    with os.scandir(path) as entries:
+        for entry in entries:
+            try:
+                if entry.is_dir(follow_symlinks=False):
+                    dirs.append(entry.name)
+                elif entry.is_file():
+                    files.append(entry.name)
+            except OSError:
+                continue
+    return files, dirs
+
+
+def _walk(root: Path, start: str, chain, chain_key: str, options: Dict,
+          old: Dict, new: Dict, found: List[str]) -> bool:
+    """
+    Scan one subtree, reusing cached listings whose directory mtime matches.
+
+    Returns:
+        True if any directory had to be re-listed
+    """
+    extensions, skip_dirs = options['extensions'], options['skip_dirs']
+    rescanned = False
+    stack = [(start, chain, chain_key)]
+
+    while stack:
+        rel, chain, chain_key = stack.pop()
+        path = root / rel if rel else root
+        try:
+            mtime = path.stat().st_mtime_ns
+        except OSError:
+            continue
+
+        cached = old.get(rel)
+        raw = None
+        if cached and cached['mtime'] == mtime:
+            has_ignore_file = cached['gitignore']
+        else:
+            try:
+                raw = _list_dir(path)
+            except OSError:
+                continue
+            has_ignore_file = '.gitignore' in raw[0]
+
+        if has_ignore_file:
+            chain, chain_key = _extend_chain(root, rel, chain, chain_key, path / '.gitignore')
+
+        if raw is None and cached['rules'] == chain_key:
+            entry = cached
+        else:
+            if raw is None:
+                try:
+                    raw = _list_dir(path)
+                except OSError:
+                    continue
+            rescanned = True
+            prefix = f'{rel}/' if rel else ''
+            raw_files, raw_dirs = raw
+            entry = {
+                'mtime': mtime,
+                'gitignore': '.gitignore' in raw_files,
+                'rules': chain_key,
+                'files': sorted(
+                    name for name in raw_files
+                    if os.path.splitext(name)[1][1:] in extensions
+                    and not is_ignored(prefix + name, False, chain)
+                ),
+                'dirs': sorted(
+                    name for name in raw_dirs
+                    if name not in skip_dirs and name not in ALWAYS_SKIP
+                    and not is_ignored(prefix + name, True, chain)
+                ),
+            }
+
+        new[rel] = entry
+        prefix = f'{rel}/' if rel else ''
+        found.extend(prefix + name for name in entry['files'])
+        if rel or start:
+            stack.extend((prefix + name, chain, chain_key) for name in entry['dirs'])
+
+    return rescanned
+
+
+def _cache_path(root: Path, cache_name: str) -> Path:
+    return root / CACHE_DIR / f'files-{cache_name}.json'
+
+
+def _load_cache(root: Path, cache_name: str, options: Dict) -> Dict:
+    document = _MEMORY.get((str(root), cache_name))
+    if document is None:
+        try:
+            with open(_cache_path(root, cache_name), 'r') as f:
+                document = json.load(f)
+        except (OSError, json.JSONDecodeError):
+            document = None
+
+    if (not isinstance(document, dict)
+            or document.get('version') != CACHE_VERSION
+            or document.get('extensions') != sorted(options['extensions'])
+            or document.get('skip_dirs') != sorted(options['skip_dirs'])):
+        return {}
+    return document.get('dirs', {})
+
+
+def _save_cache(root: Path, cache_name: str, options: Dict, dirs: Dict):
+    document = {
+        'version': CACHE_VERSION,
+        'extensions': sorted(options['extensions']),
+        'skip_dirs': sorted(options['skip_dirs']),
+        'dirs': dirs,
+    }
+    if not (root / '.agent').is_dir():
+        _MEMORY[(str(root), cache_name)] = document
+        return
+
+    path = _cache_path(root, cache_name)
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=path.parent, prefix='.files-')
+        with os.fdopen(fd, 'w') as f:
+            json.dump(document, f, separators=(',', ':'))
+        os.replace(tmp_path, path)
+    except OSError:
+        # Cache is an optimization - never fail the caller over it
+        pass
+
+
+def find_files(project_root: str, extensions: Iterable[str],
+               skip_dirs: Iterable[str] = (), cache_name: str = 'default') -> List[str]:
+    """
+    Files with the given extensions, honoring .gitignore.
+
+    Args:
+        project_root: Directory to scan
+        extensions: Extensions without the dot (e.g. ['tsx', 'jsx'])
+        skip_dirs: Directory names never entered, even if not ignored
+        cache_name: Cache file name (one per caller/extension set)
+
+    Returns:
+        Sorted paths relative to project_root ("/" separated)
+    """
+    root = Path(project_root).resolve()
+    options = {'extensions': set(extensions), 'skip_dirs': set(skip_dirs)}
+    old = _load_cache(root, cache_name, options)
+
+    chain, chain_key = _extend_chain(root, '', (), '', root / '.git' / 'info' / 'exclude')
+
+    # Root level first (without descending), then top-level directories in parallel
+    new: Dict[str, Dict] = {}
+    found: List[str] = []
+    rescanned = _walk(root, '', chain, chain_key, options, old, new, found)
+    if '' not in new:
+        return []
+    root_chain, root_key = chain, chain_key
+    if new['']['gitignore']:
+        root_chain, root_key = _extend_chain(root, '', chain, chain_key, root / '.gitignore')
+
+    def scan(name: str):
+        subtree_new: Dict[str, Dict] = {}
+        subtree_found: List[str] = []
+        changed = _walk(root, name, root_chain, root_key, options, old, subtree_new, subtree_found)
+        return changed, subtree_new, subtree_found
+
+    with ThreadPoolExecutor(max_workers=min(32, (os.cpu_count() or 1) + 4)) as pool:
+        for changed, subtree_new, subtree_found in pool.map(scan, new['']['dirs']):
+            rescanned = rescanned or changed
+            new.update(subtree_new)
+            found.extend(subtree_found)
+
+    if rescanned or len(new) != len(old):
+        _save_cache(root, cache_name, options, new)
+
+    return sorted(found)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='List files honoring .gitignore')
+    parser.add_argument('project_root', nargs='?', default='.', help='Directory to scan')
+    parser.add_argument('--ext', action='append', required=True, help='Extension (repeatable)')
+    args = parser.parse_args()
+
+    for path in find_files(args.project_root, args.ext, cache_name='cli'):
+        print(path)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,171 @@
+#!/usr/bin/env python3
+"""
+Parsed-manifest cache shared by skill functions.
+
+package.json, pyproject.toml, Cargo.toml and friends are read by several
+skills (nav-init project detection, visual-regression setup validation,
+CI workflow generation). Parsing goes through this module so each file is
+parsed once per process; entries are keyed by (path, mtime, size), so an
+edited manifest is re-read on the next lookup.
+
+TOML uses tomllib (Python 3.11+), falling back to tomli, then to a
+minimal section-aware reader that understands the tables and string
+keys/arrays manifests actually use.
+
+Skill functions import it with:
+    sys.path.insert(0, str(Path(__file__).resolve().parents[2] / 'shared'))
+    from manifest_cache import load_json, load_toml
+"""
+
+import json
+import os
+import re
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+try:
+    import tomllib
+except ImportError:  # Python < 3.11
+    try:
+        import tomli as tomllib
+    except ImportError:
+        tomllib = None
+
+# (resolved path, parser) -> ((mtime_ns, size), parsed value)
+_CACHE: Dict[Tuple[str, str], Tuple[Tuple[int, int], object]] = {}
+_STATS = {"hits": 0, "misses": 0}
+
+
+def _file_key(path: Path) -> Optional[Tuple[int, int]]:
+    try:
+        stat = path.stat()
+    except OSError:
+        return None
+    return (stat.st_mtime_ns, stat.st_size)
+
+
+def _cached(path, parser_name: str, parse):
+    """Return parse(path) from cache, re-parsing if the file changed."""
+    path = Path(path)
+    file_key = _file_key(path)
+    if file_key is None:
+        return None
+
+    cache_key = (str(path.resolve()), parser_name)
+    entry = _CACHE.get(cache_key)
+    if entry and entry[0] == file_key:
+        _STATS["hits"] += 1
+        return entry[1]
+
+    _STATS["misses"] += 1
+    try:
+        value = parse(path)
+    except (OSError, ValueError, UnicodeDecodeError):
+        value = None
+    _CACHE[cache_key] = (file_key, value)
+    return value
+
+
+def load_json(path) -> Optional[Dict]:
+    """
+    Parsed JSON manifest (package.json, composer.json, ...).
+
+    Args:
+        path: File path
+
+    Returns:
+        Parsed data (shared - do not mutate; copy first), or None if the
+        file is missing or invalid
+    """
+    def parse(p: Path):
+        with open(p, 'r') as f:
+            return json.load(f)
+
+    return _cached(path, "json", parse)
+
+
+def load_toml(path) -> Optional[Dict]:
+    """
+    Parsed TOML manifest (pyproject.toml, Cargo.toml).
+
+    Args:
+        path: File path
+
+    Returns:
+        Parsed data (shared - do not mutate; copy first), or None if the
+        file is missing or invalid
+    """
+    def parse(p: Path):
+        if tomllib is not None:
+            with open(p, 'rb') as f:
+                return tomllib.load(f)
+        return _parse_toml_minimal(p.read_text())
+
+    return _cached(path, "toml", parse)
+
+
+def load_text(path) -> Optional[str]:
+    """File contents (go.mod, Gemfile, .nvmrc, ...), or None if missing."""
+    return _cached(path, "text", lambda p: p.read_text())
+
+
+def cache_stats() -> Dict[str, int]:
+    """Hit/miss counters for this process."""
+    return dict(_STATS, entries=len(_CACHE))
+
+
+def clear_cache():
+    _CACHE.clear()
+    _STATS.update(hits=0, misses=0)
+
+
+_TABLE = re.compile(r'^\[\[?\s*([^\]]+?)\s*\]\]?\s*(?:#.*)?$')
+_KEY_VALUE = re.compile(r'^([A-Za-z0-9_.\-"\']+)\s*=\s*(.*)$')
+_STRING = re.compile(r'"((?:[^"\\]|\\.)*)"|\'([^\']*)\'')
+
+
+def _parse_toml_minimal(text: str) -> Dict:
+    """
+    Very small TOML subset: [tables], key = "string", key = [strings],
+    key = { version = "..." } (kept as the raw string). Enough for
+    manifest names and dependency tables when tomllib is unavailable.
+    """
+    data: Dict = {}
+    table = data
+    pending_key = None
+    pending_value = ''
+
+    for raw_line in text.splitlines():
+        line = raw_line.strip()
+        if pending_key is not None:
+            pending_value += ' ' + line
+            if ']' in line:
+                table[pending_key] = [a or b for a, b in _STRING.findall(pending_value)]
+                pending_key = None
+            continue
+
+        if not line or line.startswith('#'):
+            continue
+
+        match = _TABLE.match(line)
+        if match:
+            table = data
+            for part in match.group(1).split('.'):
+                table = table.setdefault(part.strip().strip('"\''), {})
+            continue
+
+        match = _KEY_VALUE.match(line)
+        if not match:
+            continue
+        key = match.group(1).strip('"\'')
+        value = match.group(2).strip()
+
+        if value.startswith('[') and ']' not in value:
+            pending_key, pending_value = key, value
+        elif value.startswith('['):
+            table[key] = [a or b for a, b in _STRING.findall(value)]
+        else:
+            string = _STRING.match(value)
+            table[key] = (string.group(1) or string.group(2)) if string else value
+
+    return data
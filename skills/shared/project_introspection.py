@@ -0,0 +1,200 @@
+#!/usr/bin/env python3
+"""
+Project introspection shared by skill functions.
+
+Answers the questions several skills ask about a project - dependencies,
+scripts, package manager, Node version, detected packages - from one
+place, backed by an on-disk cache at .agent/.cache/project.json.
+
+Every cached value records the (mtime, size) of the files it was derived
+from; it's reused only while all of them are unchanged (and no source
+appeared or disappeared), so a multi-step workflow such as visual-regression
+setup reads package.json once instead of once per helper script.
+
+The cache file is only written in projects that already have .agent/
+(Navigator initialized); elsewhere results are cached in memory only.
+
+Usage:
+    sys.path.insert(0, str(Path(__file__).resolve().parents[2] / 'shared'))
+    from project_introspection import project_facts
+
+    python3 project_introspection.py [project_root]   # print facts
+"""
+
+import copy
+import json
+import os
+import re
+import sys
+import tempfile
+from pathlib import Path
+from typing import Callable, Dict, Iterable, Optional
+
+from manifest_cache import load_json, load_text
+
+CACHE_VERSION = 1
+CACHE_RELPATH = Path('.agent') / '.cache' / 'project.json'
+
+# Lock files in package-manager precedence order
+LOCKFILES = (
+    ('pnpm-lock.yaml', 'pnpm'),
+    ('yarn.lock', 'yarn'),
+    ('package-lock.json', 'npm'),
+)
+FACT_SOURCES = ('package.json', '.nvmrc') + tuple(name for name, _ in LOCKFILES)
+
+# project root -> loaded cache document
+_LOADED: Dict[str, Dict] = {}
+
+
+def _cache_file(root: Path) -> Path:
+    return root / CACHE_RELPATH
+
+
+def _load_cache(root: Path) -> Dict:
+    key = str(root)
+    if key not in _LOADED:
+        document = None
+        try:
+            with open(_cache_file(root), 'r') as f:
+                document = json.load(f)
+        except (OSError, json.JSONDecodeError):
+            pass
+        if not isinstance(document, dict) or document.get('version') != CACHE_VERSION:
+            document = {'version': CACHE_VERSION, 'entries': {}}
+        _LOADED[key] = document
+    return _LOADED[key]
+
+
+def _save_cache(root: Path, document: Dict):
+    """Persist the cache if Navigator is initialized in this project."""
+    if not (root / '.agent').is_dir():
+        return
+
+    path = _cache_file(root)
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=path.parent, prefix='.project-')
+        with os.fdopen(fd, 'w') as f:
+            json.dump(document, f, separators=(',', ':'))
+        os.replace(tmp_path, path)
+    except OSError:
+        # Cache is an optimization - never fail the caller over it
+        pass
+
+
+def _signature(root: Path, sources: Iterable[str]) -> Dict[str, Optional[list]]:
+    """Current (mtime_ns, size) of each source file, None if absent."""
+    signature = {}
+    for relpath in sources:
+        try:
+            stat = (root / relpath).stat()
+            signature[relpath] = [stat.st_mtime_ns, stat.st_size]
+        except OSError:
+            signature[relpath] = None
+    return signature
+
+
+def cached(project_root: str, name: str, sources: Iterable[str], compute: Callable[[], object]):
+    """
+    Value from the project cache, recomputed when any source changed.
+
+    Args:
+        project_root: Project root directory
+        name: Cache entry name
+        sources: Files (relative to project_root) the value is derived from
+        compute: Produces the value (must be JSON-serializable)
+
+    Returns:
+        Cached or freshly computed value
+    """
+    root = Path(project_root).resolve()
+    document = _load_cache(root)
+    signature = _signature(root, sources)
+
+    entry = document['entries'].get(name)
+    if entry and entry.get('sources') == signature:
+        return entry['value']
+
+    value = compute()
+    document['entries'][name] = {'sources': signature, 'value': value}
+    _save_cache(root, document)
+    return value
+
+
+def _compute_facts(root: Path) -> Dict:
+    package_data = load_json(root / 'package.json')
+    if not isinstance(package_data, dict):
+        package_data = None
+
+    package = None
+    engines_node = None
+    if package_data is not None:
+        engines_node = package_data.get('engines', {}).get('node')
+        package = {
+            'name': package_data.get('name'),
+            'dependencies': {
+                **package_data.get('dependencies', {}),
+                **package_data.get('devDependencies', {})
+            },
+            'scripts': package_data.get('scripts', {}),
+            'workspaces': package_data.get('workspaces'),
+        }
+
+    node_version = None
+    nvmrc = load_text(root / '.nvmrc')
+    if nvmrc is not None:
+        node_version = nvmrc.strip()
+    elif engines_node:
+        # Extract version number (handle ">=18.0.0" format)
+        match = re.search(r'\d+', engines_node)
+        if match:
+            node_version = match.group(0)
+
+    package_manager = None
+    for lockfile, manager in LOCKFILES:
+        if (root / lockfile).exists():
+            package_manager = manager
+            break
+
+    return {
+        'package_json': package,
+        'package_json_exists': (root / 'package.json').exists(),
+        'node_version': node_version,
+        'package_manager': package_manager,
+    }
+
+
+def project_facts(project_root: str) -> Dict:
+    """
+    Facts about a JavaScript/TypeScript project.
+
+    Args:
+        project_root: Project root directory
+
+    Returns:
+        Dict with keys:
+        - package_json: {name, dependencies (incl. dev), scripts, workspaces}
+          or None if package.json is missing/invalid
+        - package_json_exists: Whether package.json is present at all
+        - node_version: From .nvmrc or engines.node, or None
+        - package_manager: From lock files ('pnpm', 'yarn', 'npm') or None
+    """
+    root = Path(project_root).resolve()
+    return cached(str(root), 'facts', FACT_SOURCES, lambda: _compute_facts(root))
+
+
+def dependencies(project_root: str) -> Optional[Dict[str, str]]:
+    """Runtime + dev dependencies from package.json, or None without one."""
+    package = project_facts(project_root)['package_json']
+    return package['dependencies'] if package else None
+
+
+def read_package_json(project_root: str) -> Optional[Dict]:
+    """Full package.json as a private copy (safe to modify and write back)."""
+    package_data = load_json(Path(project_root) / 'package.json')
+    return copy.deepcopy(package_data) if isinstance(package_data, dict) else None
+
+
+if __name__ == "__main__":
+    print(json.dumps(project_facts(sys.argv[1] if len(sys.argv) > 1 else '.'), indent=2))
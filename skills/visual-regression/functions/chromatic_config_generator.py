@@ -16,6 +16,9 @@ import sys
 from pathlib import Path
 from typing import Dict, Optional
 
+sys.path.insert(0, str(Path(__file__).resolve().parents[2] / 'shared'))
+from project_introspection import read_package_json  # noqa: E402
+
 
 def generate_chromatic_config(project_info: Dict) -> str:
     """
@@ -205,8 +208,9 @@ def update_package_json_scripts(package_json_path: str, vr_tool: str = 'chromati
     Returns:
         Updated package.json data
     """
-    with open(package_json_path, 'r') as f:
-        package_data = json.load(f)
+    package_data = read_package_json(os.path.dirname(package_json_path) or '.')
+    if package_data is None:
+        raise ValueError(f"Cannot read {package_json_path}")
 
     scripts = package_data.get('scripts', {})
 
@@ -14,6 +14,9 @@ import sys
 from pathlib import Path
 from typing import Dict
 
+sys.path.insert(0, str(Path(__file__).resolve().parents[2] / 'shared'))
+from project_introspection import project_facts  # noqa: E402
+
 
 def detect_node_version(project_root: str) -> str:
     """
@@ -25,29 +28,8 @@ def detect_node_version(project_root: str) -> str:
     Returns:
         Node version string (default: '20')
     """
-    # Check .nvmrc
-    nvmrc = Path(project_root) / '.nvmrc'
-    if nvmrc.exists():
-        with open(nvmrc, 'r') as f:
-            return f.read().strip()
-
-    # Check package.json engines.node
-    package_json = Path(project_root) / 'package.json'
-    if package_json.exists():
-        with open(package_json, 'r') as f:
-            try:
-                data = json.load(f)
-                node_version = data.get('engines', {}).get('node')
-                if node_version:
-                    # Extract version number (handle ">=18.0.0" format)
-                    import re
-                    match = re.search(r'\d+', node_version)
-                    if match:
-                        return match.group(0)
-            except json.JSONDecodeError:
-                pass
-
-    return '20'  # Default
+    # .nvmrc first, then package.json engines.node (major version)
+    return project_facts(project_root)['node_version'] or '20'  # Default
 
 
 def detect_package_manager(project_root: str) -> str:
@@ -60,14 +42,7 @@ def detect_package_manager(project_root: str) -> str:
     Returns:
         Package manager name ('npm', 'yarn', 'pnpm')
     """
-    root = Path(project_root)
-
-    if (root / 'pnpm-lock.yaml').exists():
-        return 'pnpm'
-    elif (root / 'yarn.lock').exists():
-        return 'yarn'
-    else:
-        return 'npm'
+    return project_facts(project_root)['package_manager'] or 'npm'
 
 
 def get_install_command(package_manager: str) -> str:
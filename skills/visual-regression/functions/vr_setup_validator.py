@@ -15,6 +15,9 @@ import sys
 from pathlib import Path
 from typing import Dict, List, Optional
 
+sys.path.insert(0, str(Path(__file__).resolve().parents[2] / 'shared'))
+from project_introspection import dependencies as project_dependencies, project_facts  # noqa: E402
+
 
 def detect_framework(project_root: str) -> Optional[str]:
     """
@@ -26,30 +29,19 @@ def detect_framework(project_root: str) -> Optional[str]:
     Returns:
         Framework name ('react', 'vue', 'svelte') or None
     """
-    package_json_path = Path(project_root) / 'package.json'
+    dependencies = project_dependencies(project_root)
 
-    if not package_json_path.exists():
+    if dependencies is None:
         return None
 
-    try:
-        with open(package_json_path, 'r') as f:
-            package_data = json.load(f)
-
-        dependencies = {
-            **package_data.get('dependencies', {}),
-            **package_data.get('devDependencies', {})
-        }
-
-        if 'react' in dependencies:
-            return 'react'
-        elif 'vue' in dependencies:
-            return 'vue'
-        elif 'svelte' in dependencies:
-            return 'svelte'
+    if 'react' in dependencies:
+        return 'react'
+    elif 'vue' in dependencies:
+        return 'vue'
+    elif 'svelte' in dependencies:
+        return 'svelte'
 
-        return None
-    except (json.JSONDecodeError, FileNotFoundError):
-        return None
+    return None
 
 
 def detect_storybook_config(project_root: str) -> Dict:
@@ -63,7 +55,6 @@ def detect_storybook_config(project_root: str) -> Dict:
         Dict with version, addons, framework, and config path
     """
     storybook_dir = Path(project_root) / '.storybook'
-    package_json_path = Path(project_root) / 'package.json'
 
     result = {
         'installed': False,
@@ -91,29 +82,19 @@ def detect_storybook_config(project_root: str) -> Dict:
         result['main_js_path'] = str(main_ts)
 
     # Extract version from package.json
-    if package_json_path.exists():
-        try:
-            with open(package_json_path, 'r') as f:
-                package_data = json.load(f)
-
-            dependencies = {
-                **package_data.get('dependencies', {}),
-                **package_data.get('devDependencies', {})
-            }
-
-            # Find Storybook version
-            for dep in dependencies:
-                if dep.startswith('@storybook/'):
-                    result['version'] = dependencies[dep].replace('^', '').replace('~', '')
-                    break
-
-            # Extract addons from dependencies
-            result['addons'] = [
-                dep for dep in dependencies.keys()
-                if dep.startswith('@storybook/addon-') or dep == '@chromatic-com/storybook'
-            ]
-        except (json.JSONDecodeError, FileNotFoundError):
-            pass
+    dependencies = project_dependencies(project_root)
+    if dependencies is not None:
+        # Find Storybook version
+        for dep in dependencies:
+            if dep.startswith('@storybook/'):
+                result['version'] = dependencies[dep].replace('^', '').replace('~', '')
+                break
+
+        # Extract addons from dependencies
+        result['addons'] = [
+            dep for dep in dependencies.keys()
+            if dep.startswith('@storybook/addon-') or dep == '@chromatic-com/storybook'
+        ]
 
     # Try to parse main.js for framework
     if result['main_js_path']:
@@ -142,30 +123,19 @@ def detect_vr_tool(project_root: str) -> Optional[str]:
     Returns:
         Tool name ('chromatic', 'percy', 'backstopjs') or None
     """
-    package_json_path = Path(project_root) / 'package.json'
+    dependencies = project_dependencies(project_root)
 
-    if not package_json_path.exists():
+    if dependencies is None:
         return None
 
-    try:
-        with open(package_json_path, 'r') as f:
-            package_data = json.load(f)
-
-        dependencies = {
-            **package_data.get('dependencies', {}),
-            **package_data.get('devDependencies', {})
-        }
-
-        if 'chromatic' in dependencies or '@chromatic-com/storybook' in dependencies:
-            return 'chromatic'
-        elif '@percy/cli' in dependencies or '@percy/storybook' in dependencies:
-            return 'percy'
-        elif 'backstopjs' in dependencies:
-            return 'backstopjs'
+    if 'chromatic' in dependencies or '@chromatic-com/storybook' in dependencies:
+        return 'chromatic'
+    elif '@percy/cli' in dependencies or '@percy/storybook' in dependencies:
+        return 'percy'
+    elif 'backstopjs' in dependencies:
+        return 'backstopjs'
 
-        return None
-    except (json.JSONDecodeError, FileNotFoundError):
-        return None
+    return None
 
 
 def detect_ci_platform(project_root: str) -> Optional[str]:
@@ -261,49 +231,43 @@ def check_dependencies(project_root: str, vr_tool: Optional[str] = 'chromatic')
     Returns:
         Dict with installed and missing dependencies
     """
-    package_json_path = Path(project_root) / 'package.json'
+    facts = project_facts(project_root)
 
     result = {
         'installed': [],
         'missing': []
     }
 
-    if not package_json_path.exists():
+    if not facts['package_json_exists']:
         result['missing'] = ['package.json not found']
         return result
 
-    try:
-        with open(package_json_path, 'r') as f:
-            package_data = json.load(f)
-
-        dependencies = {
-            **package_data.get('dependencies', {}),
-            **package_data.get('devDependencies', {})
-        }
-
-        # Core Storybook dependencies
-        required_deps = [
-            '@storybook/addon-essentials',
-            '@storybook/addon-interactions',
-        ]
-
-        # Add VR tool specific dependencies
-        if vr_tool == 'chromatic':
-            required_deps.extend(['chromatic', '@chromatic-com/storybook'])
-        elif vr_tool == 'percy':
-            required_deps.extend(['@percy/cli', '@percy/storybook'])
-        elif vr_tool == 'backstopjs':
-            required_deps.append('backstopjs')
-
-        # Check each dependency
-        for dep in required_deps:
-            if dep in dependencies:
-                result['installed'].append(dep)
-            else:
-                result['missing'].append(dep)
-
-    except (json.JSONDecodeError, FileNotFoundError):
+    if facts['package_json'] is None:
         result['missing'] = ['Error reading package.json']
+        return result
+
+    dependencies = facts['package_json']['dependencies']
+
+    # Core Storybook dependencies
+    required_deps = [
+        '@storybook/addon-essentials',
+        '@storybook/addon-interactions',
+    ]
+
+    # Add VR tool specific dependencies
+    if vr_tool == 'chromatic':
+        required_deps.extend(['chromatic', '@chromatic-com/storybook'])
+    elif vr_tool == 'percy':
+        required_deps.extend(['@percy/cli', '@percy/storybook'])
+    elif vr_tool == 'backstopjs':
+        required_deps.append('backstopjs')
+
+    # Check each dependency
+    for dep in required_deps:
+        if dep in dependencies:
+            result['installed'].append(dep)
+        else:
+            result['missing'].append(dep)
 
     return result
 
@@ -318,14 +282,7 @@ def get_package_manager(project_root: str) -> str:
     Returns:
         Package manager name ('npm', 'yarn', 'pnpm')
     """
-    root = Path(project_root)
-
-    if (root / 'pnpm-lock.yaml').exists():
-        return 'pnpm'
-    elif (root / 'yarn.lock').exists():
-        return 'yarn'
-    else:
-        return 'npm'  # Default to npm
+    return project_facts(project_root)['package_manager'] or 'npm'  # Default to npm
 
 
 def validate_setup(project_root: str, component_path: Optional[str] = None) -> Dict:
@@ -0,0 +1,102 @@
+#!/bin/bash
+# Test Marker Store
+# Verifies that stored markers are reconstructed byte for byte
+
+set -euo pipefail
+
+# Colors
+GREEN='\033[0;32m'
+RED='\033[0;31m'
+YELLOW='\033[1;33m'
+NC='\033[0m'
+
+REPO_ROOT="$(pwd)"
+FUNCTIONS_DIR="$REPO_ROOT/skills/nav-marker/functions"
+STORE="$FUNCTIONS_DIR/marker_store.py"
+TEST_DIR="$(mktemp -d)"
+MARKERS_DIR="$TEST_DIR/markers"
+mkdir -p "$MARKERS_DIR"
+
+log_test() {
+  echo -e "${YELLOW}[TEST]${NC} $1"
+}
+
+log_pass() {
+  echo -e "${GREEN}[PASS]${NC} $1"
+}
+
+log_fail() {
+  echo -e "${RED}[FAIL]${NC} $1"
+  exit 1
+}
+
+cleanup() {
+  rm -rf "$TEST_DIR"
+}
+
+trap cleanup EXIT
+
+# Test 1: Chunks join back into the original text
+test_split_round_trip() {
+  log_test "Test 1: Chunk round trip"
+
+  local failed
+  failed=$(cd "$FUNCTIONS_DIR" && python3 - <<'PY_EOF'
+from marker_store import split_chunks
+
+cases = [
+    '\n\n' + 'a' * 2500 + '\n\n' + 'b' * 10,        # leading blank paragraph
+    'x' * 1999 + '\n\n\n\n\n' + 'y' * 1999,         # 3+ newlines at a flush boundary
+    '## Summary\n\n' + ('word ' * 100 + '\n\n') * 10 + '## Files\n- a.py\n',
+    '\n\n\n',
+    'z' * 5000,
+    '',
+]
+print(sum(1 for text in cases if ''.join(split_chunks(text)) != text))
+PY_EOF
+)
+  if [ "$failed" = "0" ]; then
+    log_pass "split_chunks is lossless"
+  else
+    log_fail "$failed inputs don't survive split_chunks"
+  fi
+}
+
+# Test 2: A marker whose body was compacted away loads identically
+test_store_load() {
+  log_test "Test 2: Store, compact, load"
+
+  local marker="$MARKERS_DIR/test-marker.md"
+  python3 - "$marker" <<'PY_EOF'
+import sys
+body = '# Marker\n\n\n' + 'p' * 1990 + '\n\n\n\n' + ('q' * 300 + '\n\n') * 10 + '## Next\n\nDone\n'
+open(sys.argv[1], 'w').write(body)
+PY_EOF
+  cp "$marker" "$TEST_DIR/original.md"
+
+  python3 "$STORE" --markers-dir "$MARKERS_DIR" store "$marker" >/dev/null
+  python3 "$STORE" --markers-dir "$MARKERS_DIR" compact --keep 0 >/dev/null
+  if [ -f "$marker" ]; then
+    log_fail "Body should have been compacted away"
+  fi
+
+  if python3 "$STORE" --markers-dir "$MARKERS_DIR" load test-marker | cmp -s - "$TEST_DIR/original.md"; then
+    log_pass "Marker reconstructed byte for byte"
+  else
+    log_fail "Reconstructed marker differs from the original"
+  fi
+}
+
+# Run all tests
+echo ""
+echo "======================================"
+echo "  Marker Store Tests"
+echo "======================================"
+echo ""
+
+test_split_round_trip
+test_store_load
+
+echo ""
+echo -e "${GREEN}All tests passed! ✅${NC}"
+echo ""
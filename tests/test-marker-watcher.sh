@@ -0,0 +1,135 @@
+#!/bin/bash
+# Test Marker Watcher
+# Verifies event-driven marker detection, failure markers and process exit
+
+set -euo pipefail
+
+# Colors
+GREEN='\033[0;32m'
+RED='\033[0;31m'
+YELLOW='\033[1;33m'
+NC='\033[0m'
+
+WATCHER="./scripts/marker_watcher.py"
+TEST_DIR=".agent/tasks/test-watcher-$$"
+mkdir -p "$TEST_DIR"
+
+log_test() {
+  echo -e "${YELLOW}[TEST]${NC} $1"
+}
+
+log_pass() {
+  echo -e "${GREEN}[PASS]${NC} $1"
+}
+
+log_fail() {
+  echo -e "${RED}[FAIL]${NC} $1"
+  exit 1
+}
+
+cleanup() {
+  rm -rf "$TEST_DIR"
+  # Kill any background processes
+  jobs -p | xargs kill 2>/dev/null || true
+}
+
+trap cleanup EXIT
+
+# Run the watcher, echoing its exit code
+watch_status() {
+  local status=0
+  python3 "$WATCHER" wait "$@" >/dev/null 2>&1 || status=$?
+  echo "$status"
+}
+
+# Test 1: Wakes as soon as the marker is created (inotify and polling)
+test_marker_detection() {
+  for mode in "" "--poll"; do
+    log_test "Test 1: Marker detection ${mode:-(inotify)}"
+
+    local marker_file="$TEST_DIR/test1-marker"
+    rm -f "$marker_file"
+    (sleep 1 && touch "$marker_file") &
+
+    local started=$SECONDS
+    local status
+    status=$(watch_status --timeout 10 $mode "$marker_file")
+
+    if [ "$status" = "0" ] && [ $((SECONDS - started)) -lt 5 ]; then
+      log_pass "Marker detected promptly"
+    else
+      log_fail "Expected exit 0 within 5s (got $status after $((SECONDS - started))s)"
+    fi
+  done
+}
+
+# Test 2: Failure marker ends the wait
+test_failure_marker() {
+  log_test "Test 2: Failure marker detection"
+
+  local marker_file="$TEST_DIR/test2-marker"
+  (sleep 1 && echo "boom" > "${marker_file}.failed") &
+
+  if [ "$(watch_status --timeout 10 "$marker_file")" = "1" ]; then
+    log_pass "Failure marker reported"
+  else
+    log_fail "Failure marker should exit 1"
+  fi
+}
+
+# Test 3: Timeout
+test_timeout() {
+  log_test "Test 3: Timeout without marker"
+
+  if [ "$(watch_status --timeout 1 "$TEST_DIR/test3-marker")" = "2" ]; then
+    log_pass "Timeout reported"
+  else
+    log_fail "Missing marker should exit 2"
+  fi
+}
+
+# Test 4: Several markers from one watcher
+test_many_markers() {
+  log_test "Test 4: Several markers, one watcher"
+
+  local first="$TEST_DIR/test4-tests-done"
+  local second="$TEST_DIR/test4-docs-done"
+  (sleep 1 && touch "$first" && sleep 1 && touch "$second") &
+
+  if [ "$(watch_status --timeout 10 "$first" "$second")" = "0" ] && [ -f "$second" ]; then
+    log_pass "Waited for all markers"
+  else
+    log_fail "Should wait for both markers"
+  fi
+}
+
+# Test 5: Process exit ends the wait
+test_process_exit() {
+  log_test "Test 5: Watched process exits without marker"
+
+  sleep 1 &
+  local test_pid=$!
+
+  if [ "$(watch_status --timeout 10 --pid "$test_pid" "$TEST_DIR/test5-marker")" = "3" ]; then
+    log_pass "Process exit reported"
+  else
+    log_fail "Process exit should exit 3"
+  fi
+}
+
+# Run all tests
+echo ""
+echo "======================================"
+echo "  Marker Watcher Tests"
+echo "======================================"
+echo ""
+
+test_marker_detection
+test_failure_marker
+test_timeout
+test_many_markers
+test_process_exit
+
+echo ""
+echo -e "${GREEN}All tests passed! ✅${NC}"
+echo ""
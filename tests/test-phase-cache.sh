@@ -0,0 +1,196 @@
+#!/bin/bash
+# Test Phase Cache
+# Verifies that re-runs restore unchanged phases instead of re-running them
+
+set -euo pipefail
+
+# Colors
+GREEN='\033[0;32m'
+RED='\033[0;31m'
+YELLOW='\033[1;33m'
+NC='\033[0m'
+
+REPO_ROOT="$(pwd)"
+ORCHESTRATOR="$REPO_ROOT/scripts/multi_claude_orchestrator.py"
+# Outside this repository: the cache lives in the test repo's main checkout
+TEST_DIR="$(mktemp -d)"
+PROJECT="$TEST_DIR/project"
+
+log_test() {
+  echo -e "${YELLOW}[TEST]${NC} $1"
+}
+
+log_pass() {
+  echo -e "${GREEN}[PASS]${NC} $1"
+}
+
+log_fail() {
+  echo -e "${RED}[FAIL]${NC} $1"
+  exit 1
+}
+
+cleanup() {
+  rm -rf "$TEST_DIR"
+}
+
+trap cleanup EXIT
+
+# Stub sub-Claude: each role changes the working tree, then creates its marker.
+#   STUB_FAIL=<Role>  write the failure marker instead
+STUB="$TEST_DIR/claude"
+cat > "$STUB" <<'STUB_EOF'
+#!/bin/bash
+prompt="$2"
+role=$(printf '%s\n' "$prompt" | sed -n 's/^You are the \([A-Za-z]*\) Claude.*/\1/p' | head -1)
+marker=$(printf '%s\n' "$prompt" | sed -n 's/^   touch \(.*\)$/\1/p' | head -1)
+if [ -z "$marker" ]; then
+  marker=$(printf '%s\n' "$prompt" | sed -n 's/.*Create implementation plan and save to \(.*\)\.$/\1/p' | head -1)
+fi
+echo "$role" >> "$STUB_CALLS"
+
+if [ "${STUB_FAIL:-}" = "$role" ]; then
+  echo "stub failure" > "${marker}.failed"
+  exit 0
+fi
+
+mkdir -p src docs
+case "$role" in
+  Implementation) echo "implemented" > src/feature.txt; echo "impl" >> README ;;
+  Testing) echo "tested" > src/feature.test.txt ;;
+  Documentation) echo "documented" > docs/feature.md; echo "docs" >> README ;;
+  Review)
+    report=$(printf '%s\n' "$prompt" | sed -n 's/^Include in \(.*\):$/\1/p' | head -1)
+    echo "APPROVED" > "$report" ;;
+esac
+echo "plan for $marker" > "$marker"
+echo '{"type":"result","usage":{"input_tokens":100,"output_tokens":50}}'
+STUB_EOF
+chmod +x "$STUB"
+
+export STUB_CALLS="$TEST_DIR/calls"
+
+mkdir -p "$PROJECT/.agent/tasks"
+(
+  cd "$PROJECT"
+  git init -q
+  printf '# TEST-1: Cache test\n\n**Status**: 📋 Todo\n' > .agent/tasks/TEST-1.md
+  echo "base" > README
+  echo ".agent/.cache/" > .gitignore
+  git add -A
+  git -c user.name=test -c user.email=test@example.com commit -q -m "initial"
+)
+
+# Run the orchestrator in a checkout, echoing the roles that were called
+run_pipeline() {
+  local dir="$1"
+  shift
+  rm -f "$STUB_CALLS"
+  touch "$STUB_CALLS"
+  (cd "$dir" && python3 "$ORCHESTRATOR" run TEST-1 "$@" --claude "$STUB" --timeout 10 --retries 0 \
+    >/dev/null 2>&1) || true
+  tr '\n' ' ' < "$STUB_CALLS" | sed 's/ $//'
+}
+
+# Test 1: Re-run after a failure only pays for the failed phase
+test_rerun_after_failure() {
+  log_test "Test 1: Re-run after failure"
+
+  local calls
+  calls=$(STUB_FAIL=Review run_pipeline "$PROJECT" --session-id test-1-100)
+  if [ "$calls" != "Planning Implementation Testing Documentation Review" ] \
+    && [ "$calls" != "Planning Implementation Documentation Testing Review" ]; then
+    log_fail "First run should call every phase (got: $calls)"
+  fi
+
+  # Testing and Documentation run side by side: one entry holds both
+  local group_files
+  group_files=$(python3 -c "import json,glob,sys; print(' '.join(sorted(f for p in glob.glob(sys.argv[1] + '/*.json') for e in [json.load(open(p))] if e['phase'] == 'testing+documentation' for f in e['files'])))" \
+    "$PROJECT/.agent/.cache/phases")
+  if [ "$group_files" = "README docs/feature.md src/feature.test.txt" ]; then
+    log_pass "Parallel phases cached as one group"
+  else
+    log_fail "Expected one testing+documentation entry with both phases' changes (got: $group_files)"
+  fi
+
+  calls=$(run_pipeline "$PROJECT" --session-id test-1-200)
+  if [ "$calls" = "Review" ]; then
+    log_pass "Only the failed phase re-ran"
+  else
+    log_fail "Expected only Review to run (got: $calls)"
+  fi
+
+  if [ -f "$PROJECT/.agent/tasks/test-1-200-plan.md" ] && [ "$(grep -c impl "$PROJECT/README")" = "1" ]; then
+    log_pass "Plan restored for the new session, changes not duplicated"
+  else
+    log_fail "Restored results are wrong"
+  fi
+}
+
+# Test 2: A fresh worktree gets every phase from the cache
+test_fresh_worktree() {
+  log_test "Test 2: Fresh worktree"
+
+  git -C "$PROJECT" worktree add -q "$TEST_DIR/worktree" -b feature/test-1
+  mkdir -p "$TEST_DIR/worktree/.agent/tasks"
+  cp "$PROJECT/.agent/tasks/TEST-1.md" "$TEST_DIR/worktree/.agent/tasks/"
+
+  local calls
+  calls=$(run_pipeline "$TEST_DIR/worktree" --session-id test-1-300)
+  if [ -z "$calls" ]; then
+    log_pass "No sub-Claude was started"
+  else
+    log_fail "Expected no calls (got: $calls)"
+  fi
+
+  if diff -r "$PROJECT/src" "$TEST_DIR/worktree/src" >/dev/null \
+    && diff "$PROJECT/README" "$TEST_DIR/worktree/README" >/dev/null \
+    && grep -q APPROVED "$TEST_DIR/worktree/.agent/tasks/test-1-300-review-report.md"; then
+    log_pass "Working tree and review report restored"
+  else
+    log_fail "Worktree doesn't match the original run"
+  fi
+}
+
+# Test 3: Changing the task spec invalidates the cache
+test_spec_change() {
+  log_test "Test 3: Task spec change"
+
+  echo "New requirement" >> "$TEST_DIR/worktree/.agent/tasks/TEST-1.md"
+  local calls
+  calls=$(run_pipeline "$TEST_DIR/worktree" --session-id test-1-400)
+  if [ "$calls" = "Planning Implementation Testing Documentation Review" ] \
+    || [ "$calls" = "Planning Implementation Documentation Testing Review" ]; then
+    log_pass "Every phase re-ran"
+  else
+    log_fail "Expected every phase to run (got: $calls)"
+  fi
+}
+
+# Test 4: --no-cache neither restores nor stores
+test_no_cache() {
+  log_test "Test 4: --no-cache"
+
+  local calls
+  calls=$(run_pipeline "$PROJECT" --session-id test-1-500 --no-cache)
+  if [ "$(echo "$calls" | wc -w)" = "5" ]; then
+    log_pass "Cache bypassed"
+  else
+    log_fail "Expected every phase to run (got: $calls)"
+  fi
+}
+
+# Run all tests
+echo ""
+echo "======================================"
+echo "  Phase Cache Tests"
+echo "======================================"
+echo ""
+
+test_rerun_after_failure
+test_fresh_worktree
+test_spec_change
+test_no_cache
+
+echo ""
+echo -e "${GREEN}All tests passed! ✅${NC}"
+echo ""
@@ -1,6 +1,6 @@
 #!/bin/bash
 # Test Retry Logic
-# Simulates marker creation failures and verifies retry mechanism
+# Simulates marker creation failures and verifies the orchestrator's retry mechanism
 
 set -euo pipefail
 
@@ -10,8 +10,10 @@ RED='\033[0;31m'
 YELLOW='\033[1;33m'
 NC='\033[0m'
 
-TEST_DIR=".agent/tasks/test-retry-$$"
-mkdir -p "$TEST_DIR"
+REPO_ROOT="$(pwd)"
+ORCHESTRATOR="$REPO_ROOT/scripts/multi_claude_orchestrator.py"
+TEST_DIR="$REPO_ROOT/.agent/tasks/test-retry-$$"
+mkdir -p "$TEST_DIR/.agent/tasks"
 
 log_test() {
   echo -e "${YELLOW}[TEST]${NC} $1"
@@ -32,107 +34,133 @@ cleanup() {
 
 trap cleanup EXIT
 
-# Source the retry functions
-source scripts/navigator-multi-claude.sh
-
-# Test 1: Marker created on first attempt
-test_first_attempt_success() {
-  log_test "Test 1: Marker created on first attempt"
+# Stub sub-Claude: creates the phase's marker unless told otherwise.
+#   STUB_SKIP=<Role>       never create the marker for that role
+#   STUB_SKIP_ONCE=<Role>  skip only the first invocation for that role
+#   STUB_FAIL=<Role>       write the failure marker instead
+STUB="$TEST_DIR/claude"
+cat > "$STUB" <<'STUB_EOF'
+#!/bin/bash
+prompt="$2"
+role=$(printf '%s\n' "$prompt" | sed -n 's/^You are the \([A-Za-z]*\) Claude.*/\1/p' | head -1)
+marker=$(printf '%s\n' "$prompt" | sed -n 's/^   touch \(.*\)$/\1/p' | head -1)
+if [ -z "$marker" ]; then
+  marker=$(printf '%s\n' "$prompt" | sed -n 's/.*Create implementation plan and save to \(.*\)\.$/\1/p' | head -1)
+fi
+echo "$role" >> .agent/stub-calls
+
+if [ "${STUB_FAIL:-}" = "$role" ]; then
+  echo "stub failure" > "${marker}.failed"
+  exit 0
+fi
+if [ "${STUB_SKIP:-}" = "$role" ]; then
+  exit 0
+fi
+if [ "${STUB_SKIP_ONCE:-}" = "$role" ] && [ "$(grep -c "^$role\$" .agent/stub-calls)" -eq 1 ]; then
+  exit 0
+fi
+touch "$marker"
+echo '{"type":"result"}'
+STUB_EOF
+chmod +x "$STUB"
+
+printf '# TEST-1: Retry test\n\n**Status**: 📋 Todo\n' > "$TEST_DIR/.agent/tasks/TEST-1.md"
+
+# Run the orchestrator inside TEST_DIR
+run_pipeline() {
+  (cd "$TEST_DIR" && rm -f .agent/stub-calls && \
+    python3 "$ORCHESTRATOR" "$@" --claude "$STUB" --timeout 10 --retries 1 --no-cache >/dev/null 2>&1)
+}
 
-  local marker_file="$TEST_DIR/test1-marker"
+# Read a field from a session's state file
+state_field() {
+  python3 -c "import json,sys; d=json.load(open(sys.argv[1])); print(eval(sys.argv[2], {}, {'d': d}))" \
+    "$TEST_DIR/.agent/tasks/$1-state.json" "$2"
+}
 
-  # Create marker immediately
-  touch "$marker_file"
+# Test 1: Markers created on first attempt
+test_first_attempt_success() {
+  log_test "Test 1: Markers created on first attempt"
 
-  if wait_for_marker_with_retry "$marker_file" "test1" 1 5; then
+  if run_pipeline run TEST-1 --session-id s1; then
     log_pass "First attempt success verified"
   else
     log_fail "Should succeed on first attempt"
   fi
 
-  rm -f "$marker_file"
+  if [ "$(state_field s1 "d['status']")" = "complete" ] && \
+     [ "$(state_field s1 "d['phase_attempts']['implementation']")" = "1" ]; then
+    log_pass "State records completion without retries"
+  else
+    log_fail "State should be complete with one attempt per phase"
+  fi
 }
 
 # Test 2: Marker created on second attempt (retry)
 test_second_attempt_success() {
   log_test "Test 2: Marker created on second attempt (retry)"
 
-  local marker_file="$TEST_DIR/test2-marker"
-
-  # Create marker after 3 seconds (simulating delay)
-  (sleep 3 && touch "$marker_file") &
-  local bg_pid=$!
-
-  if wait_for_marker_with_retry "$marker_file" "test2" 1 2; then
+  if STUB_SKIP_ONCE=Implementation run_pipeline run TEST-1 --session-id s2; then
     log_pass "Retry mechanism worked correctly"
   else
     log_fail "Should succeed on retry"
   fi
 
-  wait $bg_pid 2>/dev/null || true
-  rm -f "$marker_file"
+  if [ "$(state_field s2 "d['phase_attempts']['implementation']")" = "2" ]; then
+    log_pass "Retry recorded in state"
+  else
+    log_fail "Implementation should have taken 2 attempts"
+  fi
 }
 
 # Test 3: Marker never created (both attempts fail)
 test_both_attempts_fail() {
   log_test "Test 3: Both attempts fail (no marker created)"
 
-  local marker_file="$TEST_DIR/test3-marker"
-
-  # Don't create marker at all
-  if wait_for_marker_with_retry "$marker_file" "test3" 1 2; then
+  if STUB_SKIP=Testing run_pipeline run TEST-1 --session-id s3; then
     log_fail "Should fail when marker never created"
   else
     log_pass "Correctly failed after retry attempts"
   fi
-}
-
-# Test 4: Empty marker file detection
-test_empty_marker_detection() {
-  log_test "Test 4: Empty marker file detection"
 
-  local marker_file="$TEST_DIR/test4-marker"
-
-  # Create empty marker (invalid)
-  touch "$marker_file"
-
-  # Should be accepted (empty markers are valid per implementation)
-  if wait_for_marker_with_retry "$marker_file" "test4" 0 2; then
-    log_pass "Empty marker accepted (as designed)"
+  if [ "$(state_field s3 "d['status']")" = "failed" ] && \
+     [ "$(state_field s3 "d['phases']['testing']['attempts']")" = "2" ]; then
+    log_pass "Failure recorded in state"
   else
-    log_fail "Empty marker should be accepted"
+    log_fail "State should record failed testing phase after 2 attempts"
   fi
-
-  rm -f "$marker_file"
 }
 
-# Test 5: State file creation
-test_state_file_creation() {
-  log_test "Test 5: State file creation on retry"
+# Test 4: Failure marker stops without retry
+test_failure_marker() {
+  log_test "Test 4: Failure marker fails the phase without retry"
 
-  export STATE_FILE="$TEST_DIR/test5-state.json"
-  export session_id="test5-session"
-  export task_id="TEST-5"
-  export PHASES_COMPLETED='"phase0"'
+  if STUB_FAIL=Planning run_pipeline run TEST-1 --session-id s4; then
+    log_fail "Should fail when sub-Claude reports failure"
+  fi
 
-  save_phase_state "test-phase" 1 "retry"
+  if [ "$(grep -c '^Planning$' "$TEST_DIR/.agent/stub-calls")" = "1" ]; then
+    log_pass "Failure marker not retried"
+  else
+    log_fail "Planning should run exactly once"
+  fi
+}
 
-  if [ -f "$STATE_FILE" ]; then
-    log_pass "State file created successfully"
+# Test 5: Resume skips completed phases
+test_resume() {
+  log_test "Test 5: Resume re-runs only incomplete phases"
 
-    # Verify JSON structure
-    if command -v jq &> /dev/null; then
-      if jq empty "$STATE_FILE" 2>/dev/null; then
-        log_pass "State file has valid JSON"
-      else
-        log_fail "State file has invalid JSON"
-      fi
-    fi
+  if run_pipeline resume s3; then
+    log_pass "Resumed session completed"
   else
-    log_fail "State file not created"
+    log_fail "Resume should complete the pipeline"
   fi
 
-  rm -f "$STATE_FILE"
+  if grep -q -e '^Planning$' -e '^Implementation$' "$TEST_DIR/.agent/stub-calls"; then
+    log_fail "Completed phases should not run again"
+  else
+    log_pass "Completed phases skipped"
+  fi
 }
 
 # Run all tests
@@ -145,8 +173,8 @@ echo ""
 test_first_attempt_success
 test_second_attempt_success
 test_both_attempts_fail
-test_empty_marker_detection
-test_state_file_creation
+test_failure_marker
+test_resume
 
 echo ""
 echo -e "${GREEN}All tests passed! ✅${NC}"